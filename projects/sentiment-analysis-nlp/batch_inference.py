@@ -0,0 +1,149 @@
+import asyncio
+
+
+class MicroBatcher:
+    """
+    Asyncio front end that coalesces concurrent predictions into batches.
+
+    Requests arriving within ``max_delay`` seconds of the first one in a batch
+    are scored together with a single ``predict_batch`` call, which runs in a
+    worker thread (or the given executor) so the event loop keeps accepting
+    requests meanwhile. Up to ``max_in_flight`` batches are scored at once.
+
+    Usage:
+        async with MicroBatcher(analyzer) as batcher:
+            sentiment, confidence = await batcher.predict(text)
+    """
+
+    def __init__(self, analyzer, max_batch_size=256, max_delay=0.005, executor=None, max_in_flight=1):
+        """
+        Args:
+            analyzer: Trained object with a ``predict_batch(texts)`` method
+            max_batch_size (int): Largest number of texts scored in one call
+            max_delay (float): Seconds to wait for more requests after the first
+            executor: Executor for ``predict_batch`` calls (default: the loop's
+                thread pool); with a process pool, ``analyzer`` is pickled
+                for every batch, so it should be a lightweight handle
+            max_in_flight (int): Batches scored concurrently, e.g. one per
+                process in ``executor``
+        """
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.batches = 0
+        self.requests = 0
+        self._queue = None
+        self._worker = None
+        # Requests taken off the queue: the batch being collected and the
+        # batch of every scoring task, so stop() can resolve them
+        self._collecting = []
+        self._scoring = {}
+
+    async def start(self):
+        """Start the background batching task on the running loop."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task; queued and in-flight requests are cancelled."""
+        if self._worker is None:
+            return
+        tasks = [self._worker] + list(self._scoring)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        pending = list(self._collecting)
+        for batch in self._scoring.values():
+            pending.extend(batch)
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.cancel()
+
+        self._collecting = []
+        self._scoring.clear()
+        self._worker = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.stop()
+
+    async def predict(self, text):
+        """Queue one text and wait for its ``(sentiment, confidence)``."""
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self):
+        """Wait for one request, then gather more until the batch is full or the delay expires."""
+        loop = asyncio.get_running_loop()
+        batch = self._collecting = [await self._queue.get()]
+        deadline = loop.time() + self.max_delay
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        self._collecting = []
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        while True:
+            # Wait for a free slot first, so requests keep joining the next
+            # batch while every slot is busy
+            await slots.acquire()
+            batch = await self._collect()
+            task = loop.create_task(self._score(batch))
+            self._scoring[task] = batch
+            task.add_done_callback(lambda task: self._scoring.pop(task, None))
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _score(self, batch):
+        loop = asyncio.get_running_loop()
+        texts = [text for text, _ in batch]
+
+        try:
+            results = await loop.run_in_executor(self.executor, self.analyzer.predict_batch, texts)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.requests += len(batch)
+        for (_, future), result in zip(batch, results):
+            # The caller may have given up waiting
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        """Return the number of batches run and the average batch size."""
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'average_batch_size': self.requests / self.batches if self.batches else 0.0
+        }
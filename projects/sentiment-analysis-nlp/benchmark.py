@@ -0,0 +1,262 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Never try to download NLTK data while benchmarking
+os.environ.setdefault('SENTIMENT_NLTK_DOWNLOAD', '0')
+
+LABELS = ('negative', 'neutral', 'positive')
+ML_MODELS = ('logistic_regression', 'naive_bayes', 'linear_svm', 'sgd_svm', 'sgd_logistic', 'kernel_svm')
+ANALYZERS = ('rule', 'lexicon', 'ml') + ML_MODELS
+
+
+def synthetic_reviews(n_reviews, seed=0, vocabulary_size=5000, min_words=8, max_words=60, vocabulary_seed=0):
+    """
+    Generate labelled reviews from the rule-based lexicon plus filler words.
+
+    Filler words are random letter strings drawn with Zipf-like frequencies
+    from a vocabulary fixed by ``vocabulary_seed``, so corpora generated with
+    different seeds share their words.
+    Each review mixes in sentiment words matching its label, with some
+    opposite-polarity noise, so the ML models have something to learn that
+    is not a pure lexicon lookup.
+
+    Returns:
+        tuple: ``(texts, labels)`` lists
+    """
+    from sentiment_analysis import RuleBasedSentimentAnalyzer
+
+    lexicon = RuleBasedSentimentAnalyzer(stop_words=())
+    positive_words = sorted(lexicon.positive_words)
+    negative_words = sorted(lexicon.negative_words)
+
+    vocabulary_rng = np.random.default_rng(vocabulary_seed)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    filler = [''.join(vocabulary_rng.choice(letters, size=vocabulary_rng.integers(3, 10)))
+              for _ in range(vocabulary_size)]
+    frequencies = 1 / np.arange(1, vocabulary_size + 1)
+    frequencies /= frequencies.sum()
+
+    rng = np.random.default_rng(seed)
+    texts, labels = [], []
+    for _ in range(n_reviews):
+        label = LABELS[rng.integers(len(LABELS))]
+        words = [filler[i] for i in rng.choice(vocabulary_size, size=rng.integers(min_words, max_words + 1), p=frequencies)]
+
+        n_positive = rng.poisson(2.0 if label == 'positive' else 0.5)
+        n_negative = rng.poisson(2.0 if label == 'negative' else 0.5)
+        sentiment = list(rng.choice(positive_words, size=n_positive)) + list(rng.choice(negative_words, size=n_negative))
+        for word in sentiment:
+            words.insert(rng.integers(len(words) + 1), word)
+
+        texts.append(' '.join(words).capitalize() + rng.choice(['.', '!', '!!', '?']))
+        labels.append(label)
+    return texts, labels
+
+
+def _peak_rss_bytes():
+    """Peak resident set size of the current process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if platform.system() == 'Darwin' else peak * 1024
+
+
+def _build_analyzer(name, texts, labels):
+    """
+    Train one analyzer offline.
+
+    Returns:
+        tuple: ``(predict_batch, train_seconds)``; predict_batch returns one
+            ``(sentiment, confidence)`` pair per text. Single-review latency
+            and batch throughput are both measured through it, so the two
+            numbers come from the same code path.
+    """
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    if name in ('rule', 'lexicon'):
+        from lexicon_scoring import LexiconScorer
+        from sentiment_analysis import RuleBasedSentimentAnalyzer
+
+        # scikit-learn's English stop words stand in for the NLTK download
+        analyzer = RuleBasedSentimentAnalyzer(stop_words=ENGLISH_STOP_WORDS)
+        if name == 'lexicon':
+            return LexiconScorer.from_analyzer(analyzer).analyze_batch, None
+        return lambda batch: [analyzer.analyze_sentiment(text) for text in batch], None
+
+    if name == 'ml':
+        from sentiment_analysis import MLBasedSentimentAnalyzer
+
+        analyzer = MLBasedSentimentAnalyzer()
+        start = time.perf_counter()
+        analyzer.train(texts, labels)
+        train_seconds = time.perf_counter() - start
+        return analyzer.predict_batch, train_seconds
+
+    # The train_models.py pipeline: preprocess, TF-IDF, then one of its models
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from train_models import get_models, preprocess_text
+
+    models = {model_name.lower().replace(' ', '_'): model
+              for model_name, model in get_models(include_kernel_svm=True).items()}
+    model = models[name]
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+
+    start = time.perf_counter()
+    X = vectorizer.fit_transform([preprocess_text(text) for text in texts])
+    model.fit(X, np.asarray(labels))
+    train_seconds = time.perf_counter() - start
+
+    def predict_batch(batch):
+        # Like MLBasedSentimentAnalyzer.predict_batch: one predict_proba call
+        # gives both the label and the confidence
+        probabilities = model.predict_proba(vectorizer.transform([preprocess_text(text) for text in batch]))
+        best = probabilities.argmax(axis=1)
+        return list(zip(model.classes_[best], probabilities[np.arange(len(best)), best]))
+
+    return predict_batch, train_seconds
+
+
+def run_case(case):
+    """Train and measure one analyzer in a fresh process."""
+    texts, labels = synthetic_reviews(case['n_reviews'], seed=case['seed'])
+    eval_texts, eval_labels = synthetic_reviews(case['n_eval'], seed=case['seed'] + 1)
+
+    predict_batch, train_seconds = _build_analyzer(case['analyzer'], texts, labels)
+
+    # Single-request latency (batches of one), after a few warm-up calls
+    for text in eval_texts[:10]:
+        predict_batch([text])
+    latencies = []
+    for i in range(case['latency_requests']):
+        text = eval_texts[i % len(eval_texts)]
+        start = time.perf_counter()
+        predict_batch([text])
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+
+    # Batch throughput over the whole evaluation set
+    predictions = []
+    start = time.perf_counter()
+    for i in range(0, len(eval_texts), case['batch_size']):
+        predictions.extend(sentiment for sentiment, _ in predict_batch(eval_texts[i:i + case['batch_size']]))
+    batch_seconds = time.perf_counter() - start
+
+    result = dict(case)
+    result.update({
+        'train_seconds': train_seconds,
+        'train_reviews_per_sec': case['n_reviews'] / train_seconds if train_seconds else None,
+        'latency_p50_ms': float(np.percentile(latencies, 50)),
+        'latency_p99_ms': float(np.percentile(latencies, 99)),
+        'batch_reviews_per_sec': len(eval_texts) / batch_seconds,
+        'accuracy': float(np.mean(np.asarray(predictions) == np.asarray(eval_labels))),
+        'peak_rss_mb': _peak_rss_bytes() / 2 ** 20
+    })
+    return result
+
+
+def _git_commit():
+    """Return the current git commit hash, if available."""
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(cases, output_path='benchmarks/results.json'):
+    """
+    Run benchmark cases one at a time, each in its own process.
+
+    A fresh process per case keeps peak RSS and timings independent of the
+    cases that ran before it. Results are written as JSON.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for i, case in enumerate(cases):
+        print(f"Benchmark {i + 1}/{len(cases)}: {case}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, case).result()
+        results.append(result)
+        train = f"train={result['train_seconds']:.2f}s " if result['train_seconds'] is not None else ''
+        print(f"  {train}p50={result['latency_p50_ms']:.3f}ms p99={result['latency_p99_ms']:.3f}ms "
+              f"batch={result['batch_reviews_per_sec']:.0f} reviews/s "
+              f"acc={result['accuracy']:.3f} rss={result['peak_rss_mb']:.0f}MB")
+
+    import sklearn
+    report = {
+        'metadata': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': _git_commit(),
+            'python_version': platform.python_version(),
+            'numpy_version': np.__version__,
+            'sklearn_version': sklearn.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'results': results
+    }
+
+    directory = os.path.dirname(output_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to {output_path}")
+
+    return report
+
+
+def compare_reports(baseline_path, report):
+    """Print per-case changes against a previous benchmark report."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    keys = ('analyzer', 'n_reviews', 'batch_size')
+    baseline_results = {tuple(r[k] for k in keys): r for r in baseline['results']}
+    metrics = ('train_seconds', 'latency_p50_ms', 'latency_p99_ms', 'batch_reviews_per_sec',
+               'accuracy', 'peak_rss_mb')
+
+    print(f"\nComparison with {baseline_path}:")
+    for result in report['results']:
+        previous = baseline_results.get(tuple(result[k] for k in keys))
+        if previous is None:
+            continue
+        changes = ', '.join(f"{metric} {result[metric] / previous[metric] - 1:+.1%}"
+                            for metric in metrics if previous.get(metric) and result.get(metric) is not None)
+        print(f"  {dict(zip(keys, (result[k] for k in keys)))}: {changes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sentiment analyzer latency, throughput and training time")
+    parser.add_argument('--analyzers', nargs='+', default=['rule', 'lexicon', 'ml', 'logistic_regression', 'naive_bayes',
+                                                           'linear_svm', 'sgd_logistic'], choices=ANALYZERS)
+    parser.add_argument('--reviews', nargs='+', type=int, default=[10000], help="Training corpus sizes")
+    parser.add_argument('--eval-reviews', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--latency-requests', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmarks/results.json')
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    cases = [
+        {'analyzer': analyzer, 'n_reviews': n_reviews, 'n_eval': args.eval_reviews, 'batch_size': args.batch_size,
+         'latency_requests': args.latency_requests, 'seed': args.seed}
+        for n_reviews in args.reviews for analyzer in args.analyzers
+    ]
+    report = run_benchmarks(cases, args.output)
+
+    if args.compare:
+        compare_reports(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from model_evaluation import load_csr, save_csr
+
+
+def corpus_hash(texts):
+    """SHA-256 of a sequence of texts; each text is length-prefixed so boundaries matter."""
+    digest = hashlib.sha256()
+    for text in texts:
+        encoded = text.encode('utf-8')
+        digest.update(len(encoded).to_bytes(8, 'little'))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    # Stop word sets are sorted so equal parameters always hash the same
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def _params_json(params):
+    """Canonical JSON for vectorizer parameters (e.g. dtype is a type)."""
+    return json.dumps(params, sort_keys=True, default=_json_default)
+
+
+def _directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+class FeatureStore:
+    """
+    On-disk cache of TF-IDF feature matrices.
+
+    ``fit_transform`` is keyed by a hash of the texts and the vectorizer
+    parameters. Each entry holds the CSR matrix as memory-mappable .npy
+    arrays (see ``save_csr``), plus the vocabulary and IDF weights needed
+    to rebuild the fitted vectorizer without pickling it. ``transform`` is
+    keyed by the texts and a fingerprint of the fitted vectorizer. Loading
+    an entry maps the arrays instead of reading them.
+
+    When the store grows beyond ``max_bytes``, the least recently used
+    entries are deleted.
+    """
+
+    def __init__(self, directory='features', max_bytes=2 * 2 ** 30):
+        """
+        Args:
+            directory (str): Where entries are stored
+            max_bytes (int): Size budget; least recently used entries beyond it are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _key(self, *parts):
+        import sklearn
+
+        # Vectorizer behaviour can change between scikit-learn releases
+        digest = hashlib.sha256(sklearn.__version__.encode('utf-8'))
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()[:32]
+
+    def fit_transform(self, texts, **params):
+        """
+        Fit a TfidfVectorizer on texts, or load the cached result.
+
+        Args:
+            texts (list): Preprocessed texts
+            **params: TfidfVectorizer parameters
+
+        Returns:
+            tuple: ``(X, vectorizer)``; the fitted vectorizer can transform new texts
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(**params)
+        if not vectorizer.use_idf:
+            raise ValueError("FeatureStore only caches TfidfVectorizer with use_idf=True")
+        params = vectorizer.get_params()
+
+        key = self._key('fit', _params_json(params), corpus_hash(texts))
+        entry = self._load(key)
+        if entry is not None:
+            X = entry[0]
+            vocabulary = np.load(os.path.join(self._path(key), 'vocabulary.npy'), allow_pickle=False)
+            idf = np.load(os.path.join(self._path(key), 'idf.npy'), allow_pickle=False)
+            # Setting the fitted attributes gives a fitted vectorizer without calling
+            # fit. Passing vocabulary= instead would make it a parameter, and a
+            # vectorizer rebuilt from get_params() would never learn new words
+            vectorizer.vocabulary_ = {term.decode('utf-8'): i for i, term in enumerate(vocabulary.tolist())}
+            vectorizer.idf_ = idf
+            return X, vectorizer
+
+        X = vectorizer.fit_transform(texts)
+        # Terms in column order, as a fixed-width UTF-8 byte array
+        vocabulary = np.array([term.encode('utf-8') for term in vectorizer.get_feature_names_out()])
+        self._save(key, X, {'vocabulary': vocabulary, 'idf': vectorizer.idf_}, {'params': _params_json(params)})
+        return X, vectorizer
+
+    def transform(self, vectorizer, texts):
+        """Transform texts with a fitted TfidfVectorizer, or load the cached result."""
+        # The vocabulary parameter is left out: the fitted terms are hashed anyway
+        params = {name: value for name, value in vectorizer.get_params().items() if name != 'vocabulary'}
+        fingerprint = hashlib.sha256(_params_json(params).encode('utf-8'))
+        fingerprint.update('\x00'.join(vectorizer.get_feature_names_out()).encode('utf-8'))
+        fingerprint.update(np.ascontiguousarray(vectorizer.idf_).tobytes())
+
+        key = self._key('transform', fingerprint.hexdigest(), corpus_hash(texts))
+        entry = self._load(key)
+        if entry is not None:
+            return entry[0]
+
+        X = vectorizer.transform(texts)
+        self._save(key, X)
+        return X
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            self.misses += 1
+            return None
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        # The modification time of meta.json records the last use, for eviction
+        os.utime(os.path.join(path, 'meta.json'))
+        self.hits += 1
+        return load_csr(path), meta
+
+    def _save(self, key, X, arrays=None, meta=None):
+        """Write an entry to a temporary directory and rename it into place."""
+        path = self._path(key)
+        tmp_path = f'{path}.tmp-{os.getpid()}'
+        save_csr(X, tmp_path)
+        for name, array in (arrays or {}).items():
+            np.save(os.path.join(tmp_path, f'{name}.npy'), array, allow_pickle=False)
+
+        meta = dict(meta or {}, key=key, shape=list(X.shape), nnz=int(X.nnz), created=time.time())
+        meta['bytes'] = _directory_size(tmp_path)
+        # meta.json is written last; an entry without it is incomplete
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """Return ``(key, bytes, last_used)`` for every complete entry, oldest first."""
+        entries = []
+        for key in os.listdir(self.directory):
+            meta_path = os.path.join(self._path(key), 'meta.json')
+            if '.tmp-' in key or not os.path.exists(meta_path):
+                continue
+            with open(meta_path) as f:
+                size = json.load(f)['bytes']
+            entries.append((key, size, os.path.getmtime(meta_path)))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries until the store fits in max_bytes."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for key, size, _ in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(self._path(key), ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self):
+        """Delete every entry."""
+        return self.evict(0)
+
+    def stats(self):
+        return {'entries': len(self.entries()), 'bytes': self.size(), 'hits': self.hits, 'misses': self.misses}
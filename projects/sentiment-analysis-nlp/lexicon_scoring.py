@@ -0,0 +1,170 @@
+import re
+from itertools import repeat
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from sentiment_analysis import TOKENIZER_SPLITS
+
+# Cleaned forms: apostrophes are stripped before tokenizing, so "don't" is "dont"
+NEGATION_WORDS = frozenset({
+    'not', 'no', 'never', 'nor', 'none', 'nothing', 'neither', 'nobody', 'without',
+    'hardly', 'barely', 'cant', 'dont', 'doesnt', 'didnt', 'isnt', 'wasnt', 'arent',
+    'werent', 'wont', 'wouldnt', 'shouldnt', 'couldnt', 'havent', 'hasnt', 'aint'
+})
+
+NEGATED_PREFIX = 'NOT_'
+
+# Joins documents into one string; survives cleaning and is never a word
+DOCUMENT_SEPARATOR = '\x00'
+CLEAN_KEEPING_SEPARATOR = re.compile(r'[^a-zA-Z\s\x00]')
+
+# Byte-level equivalent of CLEAN_KEEPING_SEPARATOR plus lower() for ASCII text.
+# bytes.split() does not split on \x1c-\x1f like str.split(), so map them to spaces
+ASCII_TABLE = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ\x1c\x1d\x1e\x1f',
+                              b'abcdefghijklmnopqrstuvwxyz    ')
+ASCII_DELETE = bytes(c for c in range(128)
+                     if not (chr(c).isalpha() or chr(c).isspace() or chr(c) == DOCUMENT_SEPARATOR))
+
+# Codes of tokens that are not lexicon words
+OTHER = -1
+NEGATION = -2
+BOUNDARY = -3
+# Words the tokenizer splits in two are coded SPLIT - i for TOKENIZER_SPLITS entry i
+SPLIT = -10
+
+
+class LexiconScorer:
+    """
+    Vectorized lexicon-based sentiment scoring.
+
+    The whole corpus is cleaned and tokenized as one string and mapped to a
+    sparse matrix of lexicon term counts, with separate columns for negated
+    occurrences. Positive and negative scores are then two sparse
+    matrix-vector products against the lexicon weight vectors. Tokens match
+    RuleBasedSentimentAnalyzer.preprocess_text.
+    """
+
+    def __init__(self, weights, negation_window=0, negation_words=NEGATION_WORDS):
+        """
+        Args:
+            weights (dict): Word to weight; positive words > 0, negative words < 0
+            negation_window (int): Number of words after a negation word whose
+                polarity is flipped (0 disables negation handling)
+            negation_words (iterable): Words that start a negation window
+        """
+        self.weights = dict(weights)
+        self.negation_window = negation_window
+        self.negation_words = frozenset(negation_words)
+
+        terms = sorted(self.weights)
+        term_weights = np.array([self.weights[term] for term in terms], dtype=np.float64)
+        # Negated occurrences get their own columns with the opposite weight
+        self.vocabulary = terms + [NEGATED_PREFIX + term for term in terms]
+        all_weights = np.concatenate([term_weights, -term_weights])
+        self.positive_weights = np.maximum(all_weights, 0)
+        self.negative_weights = np.maximum(-all_weights, 0)
+
+        # Token codes: lexicon words map to their column, the rest are negative
+        codes = {term: i for i, term in enumerate(terms)}
+        if negation_window:
+            codes.update({word: NEGATION for word in self.negation_words})
+        codes[DOCUMENT_SEPARATOR] = BOUNDARY
+        self._split_codes = np.array([[codes.get(part, OTHER) for part in parts]
+                                      for parts in TOKENIZER_SPLITS.values()], dtype=np.int64)
+        codes.update({word: SPLIT - i for i, word in enumerate(TOKENIZER_SPLITS)})
+        self._codes = codes
+        self._byte_codes = {word.encode('ascii'): code for word, code in codes.items() if word.isascii()}
+
+    @classmethod
+    def from_word_lists(cls, positive_words, negative_words, **kwargs):
+        """Build an unweighted lexicon scoring +1 and -1 per word."""
+        weights = {word: 1.0 for word in positive_words}
+        weights.update({word: -1.0 for word in negative_words})
+        return cls(weights, **kwargs)
+
+    @classmethod
+    def from_analyzer(cls, analyzer, **kwargs):
+        """Use the word lists of a RuleBasedSentimentAnalyzer."""
+        return cls.from_word_lists(analyzer.positive_words, analyzer.negative_words, **kwargs)
+
+    def _token_codes(self, texts):
+        """Clean and tokenize a whole batch at once into an array of token codes"""
+        corpus = f' {DOCUMENT_SEPARATOR} '.join(texts)
+        if corpus.count(DOCUMENT_SEPARATOR) != max(len(texts) - 1, 0):
+            # The separator is dropped by cleaning anyway, so remove it from the texts
+            corpus = f' {DOCUMENT_SEPARATOR} '.join(text.replace(DOCUMENT_SEPARATOR, '') for text in texts)
+
+        if corpus.isascii():
+            tokens = corpus.encode('ascii').translate(ASCII_TABLE, ASCII_DELETE).split()
+            codes = self._byte_codes
+        else:
+            tokens = CLEAN_KEEPING_SEPARATOR.sub('', corpus.lower()).split()
+            codes = self._codes
+
+        # map() with a bound dict.get keeps the per-token lookup in C
+        token_codes = np.fromiter(map(codes.get, tokens, repeat(OTHER)), dtype=np.int64, count=len(tokens))
+
+        # Expand words such as "cannot" into the two tokens word_tokenize produces
+        is_split = token_codes <= SPLIT
+        if is_split.any():
+            counts = is_split + 1
+            starts = np.cumsum(counts)[is_split] - 2
+            parts = self._split_codes[SPLIT - token_codes[is_split]]
+            token_codes = np.repeat(token_codes, counts)
+            token_codes[starts] = parts[:, 0]
+            token_codes[starts + 1] = parts[:, 1]
+        return token_codes
+
+    def transform(self, texts):
+        """Map texts to a sparse (documents x lexicon terms) count matrix."""
+        n_terms = len(self.weights)
+        codes = self._token_codes(texts)
+        boundaries = codes == BOUNDARY
+        rows = np.cumsum(boundaries)
+        columns = codes.copy()
+
+        if self.negation_window:
+            # A word is negated when the last negation word before it is in the
+            # same document and at most negation_window tokens back
+            positions = np.arange(len(codes))
+            last_negation = np.maximum.accumulate(np.where(codes == NEGATION, positions, -1))
+            last_boundary = np.maximum.accumulate(np.where(boundaries, positions, -1))
+            negated = (last_negation > last_boundary) & (positions - last_negation <= self.negation_window)
+            columns[negated] += n_terms
+
+        is_term = codes >= 0
+        X = csr_matrix((np.ones(is_term.sum()), (rows[is_term], columns[is_term])),
+                       shape=(len(texts), 2 * n_terms))
+        X.sum_duplicates()
+        return X
+
+    def score(self, texts):
+        """
+        Compute positive and negative scores for every text.
+
+        Returns:
+            tuple: Arrays ``(positive, negative)`` of shape (len(texts),)
+        """
+        X = self.transform(texts)
+        return X @ self.positive_weights, X @ self.negative_weights
+
+    def analyze_batch(self, texts):
+        """
+        Classify many texts at once.
+
+        Uses the same decision rule as RuleBasedSentimentAnalyzer.analyze_sentiment,
+        so with an unweighted lexicon and no negation the results are identical.
+
+        Returns:
+            list: ``(sentiment, confidence)`` per text
+        """
+        positive, negative = self.score(texts)
+        confidence = np.maximum(positive, negative) / (positive + negative + 1)
+
+        labels = np.full(len(positive), 'neutral', dtype=object)
+        labels[positive > negative] = 'positive'
+        labels[negative > positive] = 'negative'
+        confidence[positive == negative] = 0.5
+
+        return list(zip(labels.tolist(), confidence.tolist()))
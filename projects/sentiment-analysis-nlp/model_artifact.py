@@ -0,0 +1,276 @@
+"""
+Single-file, pickle-free model artifact for TF-IDF + linear classifiers.
+
+Layout: an 8-byte magic string, the length of a JSON header as a
+little-endian uint64, the UTF-8 JSON header, then raw NumPy arrays each
+starting on a 64-byte boundary. The header records the format version,
+vectorizer settings, class labels and the dtype, shape and offset of every
+array. The vocabulary is stored as a sorted fixed-width byte array, and the
+IDF and coefficient columns are permuted to match it. Lookups are then
+binary searches, with no Python dict to rebuild.
+
+Arrays are memory-mapped on load, so worker processes loading the same file
+share one copy of the weights through the OS page cache.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from sentiment_analysis import clean_text
+
+MAGIC = b'SENTART\x00'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# TfidfVectorizer settings needed to rebuild its analyzer and weighting
+VECTORIZER_PARAMS = ('lowercase', 'strip_accents', 'token_pattern', 'ngram_range', 'stop_words',
+                     'binary', 'norm', 'use_idf', 'smooth_idf', 'sublinear_tf')
+
+
+def _linear_parameters(model):
+    """
+    Return ``(coef, intercept, probability, calibration)`` for a supported classifier.
+
+    ``calibration`` holds the ``(a, b)`` sigmoid parameters of a calibrated
+    linear model, or None.
+    """
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.naive_bayes import MultinomialNB
+
+    if isinstance(model, MultinomialNB):
+        # predict_proba is a softmax over the joint log likelihood
+        return model.feature_log_prob_, model.class_log_prior_, 'softmax', None
+
+    if isinstance(model, CalibratedClassifierCV):
+        # One linear model followed by a per-class sigmoid on its decision values
+        if model.method != 'sigmoid' or len(model.calibrated_classifiers_) != 1:
+            raise ValueError("Only CalibratedClassifierCV(method='sigmoid', ensemble=False) can be exported")
+        calibrated = model.calibrated_classifiers_[0]
+        if not hasattr(calibrated.estimator, 'coef_'):
+            raise ValueError(f"Cannot export calibrated {type(calibrated.estimator).__name__}: "
+                             f"only linear models are supported")
+        calibration = (np.array([calibrator.a_ for calibrator in calibrated.calibrators], dtype=np.float64),
+                       np.array([calibrator.b_ for calibrator in calibrated.calibrators], dtype=np.float64))
+        return calibrated.estimator.coef_, calibrated.estimator.intercept_, 'sigmoid', calibration
+
+    if isinstance(model, LogisticRegression):
+        # Newer scikit-learn releases removed multi_class and always behave like 'auto'
+        multi_class = getattr(model, 'multi_class', 'auto')
+        multinomial = multi_class == 'multinomial' or (multi_class == 'auto' and model.solver != 'liblinear')
+    elif isinstance(model, SGDClassifier) and model.loss == 'log_loss':
+        multinomial = False
+    else:
+        raise ValueError(f"Cannot export {type(model).__name__}: only LogisticRegression, "
+                         f"SGDClassifier(loss='log_loss'), MultinomialNB and sigmoid-calibrated "
+                         f"linear models are supported")
+
+    if len(model.classes_) == 2:
+        probability = 'binary'
+    else:
+        probability = 'softmax' if multinomial else 'ovr'
+    return model.coef_, model.intercept_, probability, None
+
+
+def save_artifact(vectorizer, model, path):
+    """
+    Write a fitted TfidfVectorizer and linear classifier to one artifact file.
+
+    Args:
+        vectorizer: Fitted TfidfVectorizer with the default word analyzer
+        model: Fitted LogisticRegression, SGDClassifier(loss='log_loss'), MultinomialNB,
+            or CalibratedClassifierCV(method='sigmoid', ensemble=False) around a linear model
+        path (str): Output file
+    """
+    if not hasattr(vectorizer, 'vocabulary_'):
+        raise ValueError("Only a fitted TfidfVectorizer can be exported")
+    if vectorizer.analyzer != 'word' or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("Only the default word analyzer can be exported")
+
+    coef, intercept, probability, calibration = _linear_parameters(model)
+
+    # Sort the vocabulary bytewise and reorder feature columns to match
+    terms = sorted(vectorizer.vocabulary_, key=lambda term: term.encode('utf-8'))
+    columns = np.array([vectorizer.vocabulary_[term] for term in terms], dtype=np.int64)
+    width = max(len(term.encode('utf-8')) for term in terms)
+
+    arrays = {
+        'vocabulary': np.array([term.encode('utf-8') for term in terms], dtype=f'S{width}'),
+        'idf': np.asarray(vectorizer.idf_, dtype=np.float64)[columns] if vectorizer.use_idf else np.ones(len(terms)),
+        'coef': np.ascontiguousarray(np.asarray(coef, dtype=np.float64)[:, columns]),
+        'intercept': np.asarray(intercept, dtype=np.float64)
+    }
+    if calibration is not None:
+        arrays['sigmoid_a'], arrays['sigmoid_b'] = calibration
+
+    params = {name: getattr(vectorizer, name) for name in VECTORIZER_PARAMS}
+    if isinstance(params['stop_words'], (set, frozenset)):
+        params['stop_words'] = sorted(params['stop_words'])
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'model_type': type(model).__name__,
+        'classes': np.asarray(model.classes_).tolist(),
+        'probability': probability,
+        'preprocess': 'clean_text',
+        'vectorizer': params,
+        'arrays': {}
+    }
+
+    # Offsets depend on the header size, so lay out the arrays after encoding it
+    # with placeholder offsets; the final header may only grow by a few digits
+    for name, array in arrays.items():
+        header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': 0}
+    header_size = len(json.dumps(header).encode('utf-8')) + 32 * len(arrays)
+    offset = -(-(len(MAGIC) + 8 + header_size) // ALIGNMENT) * ALIGNMENT
+    for name, array in arrays.items():
+        header['arrays'][name]['offset'] = offset
+        offset = -(-(offset + array.nbytes) // ALIGNMENT) * ALIGNMENT
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b' ' * (header_size - len(header_bytes))
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.write(b'\x00' * (header['arrays'][name]['offset'] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+    print(f"Model artifact saved to {path}")
+
+
+def read_header(path):
+    """
+    Read and validate the JSON header of an artifact.
+
+    Only the header is read and scikit-learn is not imported, so this is
+    cheap enough for a parent process that only needs model information.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a sentiment model artifact")
+        header_length, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+
+    if header['format_version'] > FORMAT_VERSION:
+        raise ValueError(f"Artifact format version {header['format_version']} is newer than "
+                         f"supported version {FORMAT_VERSION}")
+    return header
+
+
+class ArtifactPredictor:
+    """
+    Sentiment predictor backed by a memory-mapped model artifact.
+
+    Provides the same ``predict``/``predict_batch`` interface as
+    MLBasedSentimentAnalyzer without unpickling any Python objects.
+    """
+
+    def __init__(self, path):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        header = read_header(path)
+        data = np.memmap(path, dtype=np.uint8, mode='r')
+        self.arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            start = spec['offset']
+            self.arrays[name] = data[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+
+        self.header = header
+        self.classes = np.array(header['classes'])
+        self.is_trained = True
+
+        params = dict(header['vectorizer'])
+        params['ngram_range'] = tuple(params['ngram_range'])
+        self.params = params
+        self._analyze = TfidfVectorizer(**params).build_analyzer()
+
+        vocabulary = self.arrays['vocabulary']
+        self._width = vocabulary.dtype.itemsize
+
+    def preprocess_text(self, text):
+        return clean_text(text)
+
+    def transform(self, texts):
+        """Vectorize texts exactly like the exported TfidfVectorizer."""
+        from scipy.sparse import csr_matrix
+        from sklearn.preprocessing import normalize
+
+        vocabulary = self.arrays['vocabulary']
+        tokens = []
+        indptr = [0]
+        for text in texts:
+            # Terms longer than the widest vocabulary entry cannot match, and
+            # would be truncated by the fixed-width array
+            encoded = [term.encode('utf-8') for term in self._analyze(self.preprocess_text(text))]
+            tokens.extend(term for term in encoded if len(term) <= self._width)
+            indptr.append(len(tokens))
+
+        tokens = np.array(tokens, dtype=vocabulary.dtype)
+        positions = np.searchsorted(vocabulary, tokens)
+        np.minimum(positions, len(vocabulary) - 1, out=positions)
+        found = vocabulary[positions] == tokens
+
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        X = csr_matrix((np.ones(found.sum()), (rows[found], positions[found])),
+                       shape=(len(texts), len(vocabulary)))
+        X.sum_duplicates()
+
+        if self.params['binary']:
+            X.data[:] = 1
+        if self.params['sublinear_tf']:
+            np.log(X.data, out=X.data)
+            X.data += 1
+        X.data *= self.arrays['idf'][X.indices]
+        if self.params['norm']:
+            X = normalize(X, norm=self.params['norm'], copy=False)
+        return X
+
+    def predict_proba(self, texts):
+        """Class probabilities of shape (len(texts), n_classes)."""
+        scores = self.transform(texts) @ self.arrays['coef'].T + self.arrays['intercept']
+        probability = self.header['probability']
+
+        if probability == 'sigmoid':
+            scores = 1 / (1 + np.exp(scores * self.arrays['sigmoid_a'] + self.arrays['sigmoid_b']))
+            if scores.shape[1] == 1:
+                return np.column_stack([1 - scores[:, 0], scores[:, 0]])
+            total = scores.sum(axis=1, keepdims=True)
+            uniform = np.full_like(scores, 1 / scores.shape[1])
+            return np.divide(scores, total, out=uniform, where=total != 0)
+        if probability == 'binary':
+            positive = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        if probability == 'ovr':
+            scores = 1 / (1 + np.exp(-scores))
+            return scores / scores.sum(axis=1, keepdims=True)
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict_batch(self, texts):
+        """Predict ``(sentiment, confidence)`` for many texts."""
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return list(zip(self.classes[best], probabilities[np.arange(len(best)), best]))
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+
+def load_artifact(path):
+    """Load a model artifact as a memory-mapped ArtifactPredictor."""
+    return ArtifactPredictor(path)
@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def save_csr(X, directory):
+    """Write a CSR matrix as raw .npy arrays that can be memory-mapped."""
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    X = X.tocsr()
+    np.save(os.path.join(directory, 'data.npy'), X.data)
+    np.save(os.path.join(directory, 'indices.npy'), X.indices)
+    np.save(os.path.join(directory, 'indptr.npy'), X.indptr)
+    np.save(os.path.join(directory, 'shape.npy'), np.array(X.shape, dtype=np.int64))
+
+
+def load_csr(directory, mmap_mode='r'):
+    """Load a matrix written by save_csr without copying its arrays into memory."""
+    from scipy.sparse import csr_matrix
+
+    arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+              for name in ('data', 'indices', 'indptr')]
+    shape = tuple(np.load(os.path.join(directory, 'shape.npy')))
+    return csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+def _evaluate_fold(directory, matrix_dir, name, model, fold, train_index, test_index):
+    """Run in a worker: fit one model on one fold of the memory-mapped data."""
+    X = load_csr(matrix_dir)
+    y = np.load(os.path.join(directory, 'labels.npy'), mmap_mode='r')
+
+    # Row slicing copies only this fold's rows out of the shared pages
+    X_train, y_train = X[train_index], np.asarray(y[train_index])
+    X_test, y_test = X[test_index], np.asarray(y[test_index])
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+
+    return {
+        'name': name,
+        'fold': fold,
+        'accuracy': float(np.mean(y_pred == y_test)),
+        'fit_time': fit_time,
+        'predict_time': predict_time,
+        'n_test': len(test_index)
+    }
+
+
+def cross_validate_models(X, y, models, n_splits=5, n_workers=None, random_state=42, work_dir=None,
+                          vectorizer=None):
+    """
+    Stratified k-fold cross-validation of several models in parallel.
+
+    Every (model, fold) pair is an independent task on a process pool. The
+    feature matrix and labels are written once to ``work_dir`` (a temporary
+    directory by default) and memory-mapped by every worker, so the matrix
+    is never pickled or copied per task.
+
+    With a ``vectorizer``, X holds texts and a clone of the vectorizer is
+    fitted on the training rows of each fold, so vocabulary and IDF never
+    see the held-out fold. Each fold's matrix is written once and shared by
+    all models. Without one, X is already vectorized; if its vectorizer saw
+    every fold, scores are slightly optimistic.
+
+    Args:
+        X: Sparse feature matrix, or texts when ``vectorizer`` is given
+        y (array-like): Labels
+        models (dict): Name to unfitted estimator; each task fits a clone
+        n_splits (int): Number of folds
+        n_workers (int): Worker processes (default: one per core)
+        random_state (int): Seed for shuffling the folds
+        work_dir (str): Directory for the memory-mapped arrays
+        vectorizer: Unfitted vectorizer to fit per fold (e.g. TfidfVectorizer)
+
+    Returns:
+        dict: Per model, the per-fold and mean/std accuracy, fit time,
+            predict time and per-sample predict latency
+    """
+    from sklearn.base import clone
+    from sklearn.model_selection import StratifiedKFold
+
+    y = np.asarray(y)
+    n_workers = n_workers or os.cpu_count() or 1
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(np.zeros(len(y)), y))
+
+    directory = work_dir or tempfile.mkdtemp(prefix='sentiment_cv_')
+    try:
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        np.save(os.path.join(directory, 'labels.npy'), y)
+        if vectorizer is None:
+            save_csr(X, directory)
+            matrix_dirs = [directory] * n_splits
+        else:
+            matrix_dirs = []
+            for fold, (train_index, _) in enumerate(folds):
+                fold_vectorizer = clone(vectorizer).fit([X[i] for i in train_index])
+                matrix_dirs.append(os.path.join(directory, f'fold_{fold}'))
+                save_csr(fold_vectorizer.transform(X), matrix_dirs[-1])
+
+        tasks = [(matrix_dirs[fold], name, clone(model), fold, train_index, test_index)
+                 for name, model in models.items()
+                 for fold, (train_index, test_index) in enumerate(folds)]
+
+        if n_workers == 1:
+            fold_results = [_evaluate_fold(directory, *task) for task in tasks]
+        else:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     mp_context=multiprocessing.get_context(start_method)) as executor:
+                futures = [executor.submit(_evaluate_fold, directory, *task) for task in tasks]
+                fold_results = [future.result() for future in futures]
+    finally:
+        if work_dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    results = {}
+    for name in models:
+        runs = [run for run in fold_results if run['name'] == name]
+        accuracies = np.array([run['accuracy'] for run in runs])
+        fit_times = np.array([run['fit_time'] for run in runs])
+        predict_times = np.array([run['predict_time'] for run in runs])
+        latencies = predict_times / np.array([run['n_test'] for run in runs])
+        results[name] = {
+            'accuracies': accuracies,
+            'mean_accuracy': accuracies.mean(),
+            'std_accuracy': accuracies.std(),
+            'mean_fit_time': fit_times.mean(),
+            'std_fit_time': fit_times.std(),
+            'mean_predict_time': predict_times.mean(),
+            'std_predict_time': predict_times.std(),
+            'predict_latency': latencies.mean()
+        }
+    return results
+
+
+def print_cv_summary(results):
+    """Print mean ± std accuracy and timings for each model"""
+    print(f"\n{'Model':<22}{'Accuracy':>18}{'Fit (s)':>16}{'Predict (s)':>18}{'Latency (us)':>14}")
+    for name, result in results.items():
+        accuracy = f"{result['mean_accuracy']:.4f} ± {result['std_accuracy']:.4f}"
+        fit = f"{result['mean_fit_time']:.2f} ± {result['std_fit_time']:.2f}"
+        predict = f"{result['mean_predict_time']:.3f} ± {result['std_predict_time']:.3f}"
+        print(f"{name:<22}{accuracy:>18}{fit:>16}{predict:>18}{result['predict_latency'] * 1e6:>14.1f}")
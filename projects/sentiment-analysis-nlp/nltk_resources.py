@@ -0,0 +1,55 @@
+"""
+Lazy access to the NLTK data used by this project.
+
+NLTK is only imported, and its corpora only located or downloaded, the first
+time a resource is requested. Set ``SENTIMENT_NLTK_DATA`` to a directory to
+search it first and download missing resources into it, and set
+``SENTIMENT_NLTK_DOWNLOAD=0`` to fail fast instead of downloading (e.g. on
+machines without network access).
+"""
+import os
+from functools import lru_cache
+
+NLTK_DATA_ENV = 'SENTIMENT_NLTK_DATA'
+NLTK_DOWNLOAD_ENV = 'SENTIMENT_NLTK_DOWNLOAD'
+
+# Resource name -> path checked with nltk.data.find
+RESOURCES = {
+    'stopwords': 'corpora/stopwords'
+}
+
+
+def _import_nltk():
+    """Import NLTK and register the local data directory, if configured."""
+    import nltk
+
+    data_dir = os.environ.get(NLTK_DATA_ENV)
+    if data_dir and data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    return nltk
+
+
+@lru_cache(maxsize=None)
+def ensure_resource(name):
+    """Make sure an NLTK resource is available, downloading it if allowed."""
+    nltk = _import_nltk()
+    try:
+        nltk.data.find(RESOURCES[name])
+        return
+    except LookupError:
+        pass
+
+    downloaded = False
+    if os.environ.get(NLTK_DOWNLOAD_ENV, '1') != '0':
+        downloaded = nltk.download(name, download_dir=os.environ.get(NLTK_DATA_ENV), quiet=True)
+    if not downloaded:
+        raise LookupError(f"NLTK resource '{name}' is not installed. Download it with "
+                          f"nltk.download('{name}') or set {NLTK_DATA_ENV} to a directory containing it.")
+
+
+@lru_cache(maxsize=None)
+def english_stopwords():
+    """Return the NLTK English stopword list as a frozenset, loaded once per process."""
+    ensure_resource('stopwords')
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
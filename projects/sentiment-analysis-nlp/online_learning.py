@@ -0,0 +1,135 @@
+import copy
+import queue
+import threading
+
+from streaming_training import StreamingSentimentAnalyzer
+
+# Queued in place of an update to stop the background thread
+_STOP = object()
+
+
+class OnlineSentimentAnalyzer:
+    """
+    Serve predictions while learning from labelled feedback in the background.
+
+    Updates are applied with ``partial_fit`` to a private learner copy of a
+    StreamingSentimentAnalyzer, so each update costs time proportional to its
+    own size rather than the training history. When an update is done, a
+    copy of the learner is published as the new serving model with a single
+    reference assignment. ``predict`` and ``predict_batch`` read that
+    reference once per call, so they never wait for training and never see
+    a half-updated model.
+    """
+
+    def __init__(self, analyzer=None, publish_every=1, max_pending=100):
+        """
+        Args:
+            analyzer: StreamingSentimentAnalyzer to start from (default: a new one)
+            publish_every (int): Publish a new serving model after this many
+                updates, or sooner when no more updates are queued
+            max_pending (int): Queued updates before ``submit`` blocks
+        """
+        self._learner = analyzer if analyzer is not None else StreamingSentimentAnalyzer()
+        self._serving = copy.deepcopy(self._learner) if self._learner.is_trained else None
+        self.publish_every = publish_every
+        self.version = 0
+        self.updates_applied = 0
+        self.last_error = None
+        self._unpublished = 0
+        self._updates = queue.Queue(maxsize=max_pending)
+        self._thread = None
+
+    @property
+    def is_trained(self):
+        return self._serving is not None
+
+    @property
+    def serving_model(self):
+        """The StreamingSentimentAnalyzer currently answering predictions."""
+        return self._serving
+
+    def start(self):
+        """Start applying submitted updates in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='online-learner', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Apply the updates already queued, then stop the background thread."""
+        if self._thread is not None:
+            self._updates.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+
+    def submit(self, texts, labels):
+        """Queue a mini-batch of labelled texts for the background learner."""
+        if len(texts) != len(labels):
+            raise ValueError("texts and labels must have the same length")
+        self._updates.put((list(texts), list(labels)))
+
+    def flush(self):
+        """Wait until every submitted update has been applied and published."""
+        if self._thread is None:
+            raise ValueError("start() the background learner before calling flush()")
+        self._updates.join()
+
+    def update(self, texts, labels):
+        """Apply a mini-batch immediately in the calling thread and publish it."""
+        if self._thread is not None:
+            raise ValueError("Use submit() while the background learner is running")
+        self._apply(texts, labels)
+        self._publish()
+
+    def _apply(self, texts, labels):
+        self._learner.partial_fit(texts, labels)
+        self.updates_applied += 1
+        self._unpublished += 1
+
+    def _publish(self):
+        if not self._unpublished:
+            return
+        # The copy has a fresh, empty prediction cache
+        self._serving = copy.deepcopy(self._learner)
+        self.version += 1
+        self._unpublished = 0
+
+    def _run(self):
+        while True:
+            item = self._updates.get()
+            try:
+                if item is _STOP:
+                    self._publish()
+                    return
+                try:
+                    self._apply(*item)
+                except Exception as e:
+                    # A bad batch must not kill the learner; the serving model is unchanged
+                    self.last_error = e
+                    print(f"Online update failed: {e}")
+                if self._unpublished >= self.publish_every or self._updates.empty():
+                    self._publish()
+            finally:
+                self._updates.task_done()
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts):
+        serving = self._serving
+        if serving is None:
+            raise ValueError("Model must be trained before making predictions")
+        return serving.predict_batch(texts)
+
+    def save(self, path):
+        """Save the serving model; load it with StreamingSentimentAnalyzer.load."""
+        serving = self._serving
+        if serving is None:
+            raise ValueError("Model must be trained before saving")
+        serving.save(path)
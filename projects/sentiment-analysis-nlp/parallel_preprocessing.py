@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from sentiment_analysis import clean_text
+
+
+def _chunked(texts, chunk_size):
+    """Yield successive lists of at most chunk_size texts from any iterable."""
+    iterator = iter(texts)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _preprocess_chunk(preprocess, chunk):
+    """Run in a worker: preprocess one chunk of texts."""
+    return [preprocess(text) for text in chunk]
+
+
+def iter_preprocessed_chunks(texts, preprocess=clean_text, n_workers=None, chunk_size=10000):
+    """
+    Preprocess texts across a process pool, yielding results chunk by chunk.
+
+    Texts are sent to workers in chunks to amortize pickling and IPC costs,
+    and chunks are yielded in input order so the output lines up with the
+    labels. At most two chunks per worker are in flight, so an iterable of
+    any size (e.g. rows streamed from disk) is processed in bounded memory
+    and results can be fed straight to a vectorizer.
+
+    Args:
+        texts (iterable): Raw texts
+        preprocess (callable): Module-level function applied to each text;
+            it must be picklable by reference
+        n_workers (int): Worker processes (default: one per core)
+        chunk_size (int): Texts per task
+
+    Yields:
+        list: Preprocessed texts for each consecutive chunk
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = _chunked(texts, chunk_size)
+
+    # A single chunk or a single worker is not worth a process pool
+    first_chunks = list(islice(chunks, 2))
+    if n_workers == 1 or len(first_chunks) < 2:
+        for chunk in chain(first_chunks, chunks):
+            yield _preprocess_chunk(preprocess, chunk)
+        return
+
+    # Forking a process with live threads (e.g. a server or a BLAS pool) can deadlock
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context(start_method)) as executor:
+        pending = deque()
+        for chunk in chain(first_chunks, chunks):
+            pending.append(executor.submit(_preprocess_chunk, preprocess, chunk))
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def preprocess_parallel(texts, preprocess=clean_text, n_workers=None, chunk_size=10000):
+    """
+    Preprocess texts in parallel and return them as a list in input order.
+
+    Produces the same output as ``[preprocess(text) for text in texts]``.
+    """
+    return list(chain.from_iterable(iter_preprocessed_chunks(texts, preprocess, n_workers, chunk_size)))
@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of predictions, with an optional time to live.
+
+    Keys are 16-byte BLAKE2b digests of the preprocessed text, so texts that
+    differ only in case, punctuation or digits share an entry, and long
+    reviews are not kept in memory. ``clear`` starts a new generation; results
+    computed before it are dropped instead of stored, so predictions made by a
+    replaced model never end up in the cache.
+    """
+
+    def __init__(self, max_size=100000, ttl=None):
+        """
+        Args:
+            max_size (int): Maximum number of cached predictions
+            ttl (float): Seconds an entry stays valid (None: until evicted)
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def key(processed_text):
+        return hashlib.blake2b(processed_text.encode('utf-8'), digest_size=16).digest()
+
+    def get_many(self, keys):
+        """Look up several keys at once; missing or expired entries are None."""
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl is not None and now - entry[1] > self.ttl:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results.append(entry[0])
+        return results
+
+    def put_many(self, items, generation=None):
+        """
+        Store ``(key, prediction)`` pairs.
+
+        Args:
+            items (iterable): Pairs to store
+            generation (int): Value of ``self.generation`` when the predictions
+                were started; they are discarded if the cache was cleared since
+        """
+        now = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            for key, prediction in items:
+                self._entries[key] = (prediction, now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after the model has been retrained."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def __getstate__(self):
+        # Pickle the settings only: entries are cheap to rebuild, locks can't be pickled
+        return {'max_size': self.max_size, 'ttl': self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(state['max_size'], state['ttl'])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return the cache size, hit and miss counts and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_inference import MicroBatcher
+from model_artifact import load_artifact, read_header
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# Predictor loaded once in each worker process
+_predictor = None
+
+
+def _init_worker(model_path):
+    global _predictor
+    _predictor = load_artifact(model_path)
+
+
+class WorkerPredictor:
+    """
+    Handle on the predictor loaded in each pool worker.
+
+    It holds no state, so sending it to a worker with every batch costs a
+    few bytes instead of pickling the model.
+    """
+
+    def predict_batch(self, texts):
+        return [(str(sentiment), float(confidence)) for sentiment, confidence in _predictor.predict_batch(texts)]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, latency_ms):
+        self.counts[bisect_left(self.buckets, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+
+    def percentile(self, q):
+        """Upper bound of the bucket containing the q-th percentile."""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def stats(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else None,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'buckets': {f'le_{bound}ms': count for bound, count in zip(self.buckets, self.counts)}
+        }
+
+
+class ScoringServer:
+    """
+    Asyncio HTTP/1.1 server that scores texts with a saved model artifact.
+
+    Endpoints:
+        POST /predict        {"text": "..."}       -> {"sentiment": ..., "confidence": ...}
+        POST /predict_batch  {"texts": ["...", ...]} -> {"results": [...]}
+        GET  /health         model information
+        GET  /metrics        request counts and latency histograms per endpoint
+
+    Scoring runs in a process pool whose workers each memory-map the
+    artifact, so they share one copy of the weights. Concurrent single-text
+    requests are coalesced by a MicroBatcher, and batch requests are split
+    into chunks that are scored in parallel.
+
+    Workers are started with forkserver (or spawn where it is unavailable),
+    never by forking the server: a child forked from a process whose
+    scikit-learn/BLAS thread pools or event loop threads are running can
+    inherit a held lock and hang on its first prediction. The server itself
+    only reads the artifact header and never imports scikit-learn.
+    """
+
+    def __init__(self, model_path, n_workers=None, max_batch_size=256, max_delay=0.002,
+                 max_body_bytes=10 * 2 ** 20):
+        # Read the header here to fail fast on a bad artifact and to report model info
+        self.model_info = {key: value for key, value in read_header(model_path).items()
+                           if key in ('format_version', 'model_type', 'classes')}
+        self.model_path = model_path
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_body_bytes = max_body_bytes
+        self.histograms = {}
+        self.errors = 0
+        self.executor = None
+        self.batcher = None
+        self._connections = set()
+
+    async def start(self, host='127.0.0.1', port=8000):
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.executor = ProcessPoolExecutor(self.n_workers, mp_context=multiprocessing.get_context(start_method),
+                                            initializer=_init_worker, initargs=(self.model_path,))
+        self.batcher = MicroBatcher(WorkerPredictor(), self.max_batch_size, self.max_delay,
+                                    executor=self.executor, max_in_flight=self.n_workers)
+        await self.batcher.start()
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def stop(self):
+        # Closing idle keep-alive connections ends their handlers cleanly
+        for writer in list(self._connections):
+            writer.close()
+        if self.batcher is not None:
+            await self.batcher.stop()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def _handle_connection(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > self.max_body_bytes:
+                    await self._respond(writer, 413, {'error': 'request body too large'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                # Route and record latency by the bare path, without the query string
+                path = path.partition('?')[0]
+                start = time.perf_counter()
+                status, payload = await self._dispatch(method, path, body)
+                latency_ms = (time.perf_counter() - start) * 1000
+                self.histograms.setdefault(path if status != 404 else 'not_found', LatencyHistogram()).observe(latency_ms)
+                if status >= 400:
+                    self.errors += 1
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok', 'model': self.model_info, 'workers': self.n_workers}
+        if path == '/metrics':
+            return 200, self.metrics()
+        if path not in ('/predict', '/predict_batch'):
+            return 404, {'error': f'unknown path {path}'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return 400, {'error': 'request body must be JSON'}
+        if not isinstance(request, dict):
+            return 400, {'error': 'request body must be a JSON object'}
+
+        try:
+            if path == '/predict':
+                if not isinstance(request.get('text'), str):
+                    return 400, {'error': '"text" must be a string'}
+                sentiment, confidence = await self.batcher.predict(request['text'])
+                return 200, {'sentiment': sentiment, 'confidence': confidence}
+
+            texts = request.get('texts')
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                return 400, {'error': '"texts" must be a list of strings'}
+            return 200, {'results': await self._predict_batch(texts)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def _predict_batch(self, texts):
+        """Score a large batch as parallel chunks across the pool."""
+        loop = asyncio.get_running_loop()
+        predictor = WorkerPredictor()
+        chunk_size = max(1, min(self.max_batch_size, -(-len(texts) // self.n_workers)))
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, predictor.predict_batch, texts[i:i + chunk_size])
+            for i in range(0, len(texts), chunk_size)))
+        return [{'sentiment': sentiment, 'confidence': confidence}
+                for chunk in chunks for sentiment, confidence in chunk]
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    def metrics(self):
+        return {
+            'errors': self.errors,
+            'latency': {path: histogram.stats() for path, histogram in self.histograms.items()},
+            'batching': self.batcher.stats() if self.batcher is not None else None
+        }
+
+
+async def serve(model_path, host='127.0.0.1', port=8000, **kwargs):
+    """Run a ScoringServer until cancelled."""
+    server = ScoringServer(model_path, **kwargs)
+    listener = await server.start(host, port)
+    print(f"Serving {model_path} on http://{host}:{port} with {server.n_workers} workers")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a saved sentiment model artifact over HTTP")
+    parser.add_argument('--model', default='models/logistic_regression.model', help="Artifact from train_models.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None, help="Scoring processes (default: one per core)")
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-delay', type=float, default=0.002, help="Seconds to wait to fill a batch")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.model, args.host, args.port, n_workers=args.workers,
+                          max_batch_size=args.max_batch_size, max_delay=args.max_delay))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
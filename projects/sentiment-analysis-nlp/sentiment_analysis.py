@@ -1,31 +1,48 @@
 import numpy as np
-import pandas as pd
 import re
-import nltk
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from nltk_resources import english_stopwords
+from prediction_cache import PredictionCache
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# NLTK corpora, scikit-learn and plotting libraries are imported on first
+# use, so importing this module stays fast in worker processes
 
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+# Characters removed before analysis: everything except letters and whitespace
+NON_LETTERS = re.compile(r'[^a-zA-Z\s]')
+
+# Words that NLTK's word_tokenize splits in two. Once punctuation is removed
+# these are the only cases where its output differs from str.split()
+TOKENIZER_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na')
+}
+
+def clean_text(text):
+    """Lowercase and remove special characters and digits"""
+    return NON_LETTERS.sub('', text.lower())
+
+def tokenize(text):
+    """Lowercase, strip non-letters and split into words like word_tokenize"""
+    tokens = []
+    for word in clean_text(text).split():
+        if word in TOKENIZER_SPLITS:
+            tokens.extend(TOKENIZER_SPLITS[word])
+        else:
+            tokens.append(word)
+    return tokens
 
 # Simple rule-based sentiment analyzer
 class RuleBasedSentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, stop_words=None):
+        # Build the stopword set once; the NLTK list is loaded once per process
+        if stop_words is None:
+            stop_words = english_stopwords()
+        self.stop_words = frozenset(stop_words)
+        
         # Simple positive and negative word lists
         self.positive_words = {
             'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 
@@ -40,16 +57,11 @@ class RuleBasedSentimentAnalyzer:
         }
     
     def preprocess_text(self, text):
-        # Convert to lowercase
-        text = text.lower()
-        # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        # Tokenize
-        tokens = word_tokenize(text)
+        # Clean and tokenize, matching word_tokenize on the cleaned text
+        tokens = tokenize(text)
         # Remove stopwords
-        stop_words = set(stopwords.words('english'))
-        tokens = [word for word in tokens if word not in stop_words]
-        return tokens
+        stop_words = self.stop_words
+        return [word for word in tokens if word not in stop_words]
     
     def analyze_sentiment(self, text):
         tokens = self.preprocess_text(text)
@@ -65,49 +77,103 @@ class RuleBasedSentimentAnalyzer:
             return 'neutral', 0.5
 
 class MLBasedSentimentAnalyzer:
-    def __init__(self):
+    # Optional PredictionCache in front of predict/predict_batch
+    cache = None
+    
+    def __init__(self, cache_size=0, cache_ttl=None):
+        """
+        Args:
+            cache_size (int): Number of predictions to cache, keyed by the
+                preprocessed text (0 disables caching)
+            cache_ttl (float): Seconds a cached prediction stays valid
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        
         self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
         self.model = LogisticRegression()
         self.is_trained = False
+        if cache_size:
+            self.cache = PredictionCache(cache_size, cache_ttl)
     
     def preprocess_text(self, text):
-        # Convert to lowercase
-        text = text.lower()
-        # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        return text
-    
-    def train(self, texts, labels):
-        # Preprocess texts
-        processed_texts = [self.preprocess_text(text) for text in texts]
+        # Convert to lowercase and remove special characters and digits
+        return clean_text(text)
+    
+    def train(self, texts, labels, n_workers=1, feature_store=None):
+        """
+        Args:
+            texts (list): Training texts
+            labels (list): Their labels
+            n_workers (int): Processes used for preprocessing
+            feature_store (FeatureStore): Cache of TF-IDF matrices; when the same
+                texts were vectorized with the same settings before, the matrix
+                and fitted vectorizer are loaded instead of recomputed
+        """
+        # Preprocess texts, sharded across processes for large corpora
+        if n_workers == 1:
+            processed_texts = [self.preprocess_text(text) for text in texts]
+        else:
+            from parallel_preprocessing import preprocess_parallel
+            processed_texts = preprocess_parallel(texts, clean_text, n_workers=n_workers)
         
         # Vectorize texts
-        X = self.vectorizer.fit_transform(processed_texts)
+        if feature_store is not None:
+            X, self.vectorizer = feature_store.fit_transform(processed_texts, **self.vectorizer.get_params())
+        else:
+            X = self.vectorizer.fit_transform(processed_texts)
         
         # Train model
         self.model.fit(X, labels)
         self.is_trained = True
         
+        # Cached predictions came from the previous model
+        if self.cache is not None:
+            self.cache.clear()
+        
         print("Model trained successfully!")
     
     def predict(self, text):
+        return self.predict_batch([text])[0]
+    
+    def predict_batch(self, texts):
+        """Predict sentiment for many texts with one transform and one model pass"""
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
+        if not texts:
+            return []
             
-        # Preprocess text
-        processed_text = self.preprocess_text(text)
+        processed_texts = [self.preprocess_text(text) for text in texts]
+        if self.cache is None:
+            return self._predict_processed(processed_texts)
         
-        # Vectorize text
-        X = self.vectorizer.transform([processed_text])
+        # Only texts missing from the cache go through the model, once each
+        keys = [self.cache.key(text) for text in processed_texts]
+        generation = self.cache.generation
+        results = self.cache.get_many(keys)
+        missing = {}
+        for key, text, result in zip(keys, processed_texts, results):
+            if result is None:
+                missing.setdefault(key, text)
         
-        # Predict
-        prediction = self.model.predict(X)[0]
-        probability = self.model.predict_proba(X)[0]
+        if missing:
+            computed = dict(zip(missing, self._predict_processed(list(missing.values()))))
+            self.cache.put_many(computed.items(), generation)
+            results = [computed[key] if result is None else result for key, result in zip(keys, results)]
+        return results
+    
+    def _predict_processed(self, processed_texts):
+        """Vectorize preprocessed texts into one sparse matrix and classify them"""
+        X = self.vectorizer.transform(processed_texts)
         
-        # Get confidence score
-        confidence = max(probability)
+        # The predicted class is the most probable one, so a single
+        # predict_proba call gives both the label and the confidence
+        probabilities = self.model.predict_proba(X)
+        best = probabilities.argmax(axis=1)
+        predictions = self.model.classes_[best]
+        confidences = probabilities[np.arange(len(best)), best]
         
-        return prediction, confidence
+        return list(zip(predictions, confidences))
 
 def create_sample_data():
     """Create sample data for demonstration"""
@@ -131,6 +197,8 @@ def create_sample_data():
 
 def visualize_results(results):
     """Visualize sentiment analysis results"""
+    import matplotlib.pyplot as plt
+    
     sentiments = [result[1] for result in results]
     
     # Count sentiments
@@ -0,0 +1,196 @@
+import argparse
+import os
+import pickle
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.preprocessing import normalize
+
+from prediction_cache import PredictionCache
+from sentiment_analysis import MLBasedSentimentAnalyzer
+
+DEFAULT_CLASSES = ('negative', 'neutral', 'positive')
+
+
+def iter_review_chunks(path, chunk_size=10000, text_column='text', label_column='label'):
+    """
+    Read a CSV or JSONL review file in chunks.
+
+    Yields:
+        tuple: ``(texts, labels)`` lists of at most ``chunk_size`` rows;
+            labels is None when the file has no label column
+    """
+    import pandas as pd
+
+    if path.endswith('.jsonl') or path.endswith('.json'):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        reader = pd.read_csv(path, chunksize=chunk_size)
+
+    with reader:
+        for chunk in reader:
+            if text_column not in chunk:
+                raise ValueError(f"Column '{text_column}' not found in {path}")
+            texts = chunk[text_column].fillna('').astype(str).tolist()
+            labels = chunk[label_column].tolist() if label_column in chunk else None
+            yield texts, labels
+
+
+class StreamingTfidfVectorizer:
+    """
+    TF-IDF on top of a stateless HashingVectorizer.
+
+    Document frequencies are accumulated with ``partial_fit``, so the
+    vocabulary never has to be held in memory and new data can be added at
+    any time. IDF weights use the same smoothed formula as TfidfVectorizer,
+    and features no training document contained are ignored.
+    """
+
+    def __init__(self, n_features=2 ** 20, stop_words='english', ngram_range=(1, 1)):
+        self.hasher = HashingVectorizer(n_features=n_features, stop_words=stop_words,
+                                        ngram_range=ngram_range, alternate_sign=False, norm=None)
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+
+    def partial_fit(self, texts):
+        """Update document frequencies with a chunk of texts."""
+        counts = self.hasher.transform(texts)
+        self.document_frequency += np.bincount(counts.indices, minlength=len(self.document_frequency))
+        self.n_documents += counts.shape[0]
+        self._idf = None
+        return self
+
+    @property
+    def idf_(self):
+        # Computed once per update. Features never seen in training get zero
+        # weight, like out-of-vocabulary words in TfidfVectorizer; otherwise
+        # they would get the highest IDF and dominate the normalized rows
+        if getattr(self, '_idf', None) is None:
+            idf = np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+            idf[self.document_frequency == 0] = 0
+            self._idf = idf
+        return self._idf
+
+    def transform(self, texts):
+        """Hash texts into L2-normalized TF-IDF rows using the current IDF."""
+        if self.n_documents == 0:
+            raise ValueError("Vectorizer must be fitted before transforming texts")
+        X = self.hasher.transform(texts).tocsr()
+        X.data *= self.idf_[X.indices]
+        X.eliminate_zeros()
+        return normalize(X)
+
+    def fit_transform(self, texts):
+        return self.partial_fit(texts).transform(texts)
+
+
+class StreamingSentimentAnalyzer(MLBasedSentimentAnalyzer):
+    """
+    Out-of-core variant of MLBasedSentimentAnalyzer.
+
+    Trains chunk by chunk with ``partial_fit``, so memory is bounded by the
+    chunk size rather than the corpus, and a trained model can be updated
+    with new reviews without retraining from scratch.
+    """
+
+    def __init__(self, classifier='sgd', classes=DEFAULT_CLASSES, n_features=2 ** 20, cache_size=0, cache_ttl=None):
+        """
+        Args:
+            classifier (str): 'sgd' for logistic regression trained with SGD,
+                or 'nb' for multinomial Naive Bayes
+            classes (iterable): Every label the model will ever see
+            n_features (int): Size of the hashed feature space
+            cache_size (int): Number of predictions to cache (0 disables caching)
+            cache_ttl (float): Seconds a cached prediction stays valid
+        """
+        if classifier == 'sgd':
+            model = SGDClassifier(loss='log_loss', alpha=1e-5)
+        elif classifier == 'nb':
+            model = MultinomialNB()
+        else:
+            raise ValueError(f"Unknown classifier: {classifier}")
+
+        self.vectorizer = StreamingTfidfVectorizer(n_features=n_features)
+        self.model = model
+        self.classes = np.array(classes)
+        self.is_trained = False
+        if cache_size:
+            self.cache = PredictionCache(cache_size, cache_ttl)
+
+    def partial_fit(self, texts, labels):
+        """
+        Update the vectorizer and classifier with one chunk of labelled texts.
+
+        Labels are checked first, so a rejected chunk leaves the vectorizer
+        and classifier unchanged.
+        """
+        if len(texts) != len(labels):
+            raise ValueError(f"Got {len(texts)} texts but {len(labels)} labels")
+        unknown = set(labels) - set(self.classes.tolist())
+        if unknown:
+            raise ValueError(f"Unknown labels {sorted(map(str, unknown))}; expected one of {self.classes.tolist()}")
+        processed_texts = [self.preprocess_text(text) for text in texts]
+        X = self.vectorizer.partial_fit(processed_texts).transform(processed_texts)
+        self.model.partial_fit(X, labels, classes=self.classes)
+        self.is_trained = True
+        if self.cache is not None:
+            self.cache.clear()
+
+    def train(self, texts, labels, chunk_size=10000):
+        """Train on in-memory texts, one chunk at a time."""
+        for start in range(0, len(texts), chunk_size):
+            self.partial_fit(texts[start:start + chunk_size], labels[start:start + chunk_size])
+        print("Model trained successfully!")
+
+    def train_from_file(self, path, chunk_size=10000, text_column='text', label_column='label'):
+        """Stream a CSV or JSONL file through ``partial_fit``."""
+        n_rows = 0
+        for texts, labels in iter_review_chunks(path, chunk_size, text_column, label_column):
+            if labels is None:
+                raise ValueError(f"Column '{label_column}' not found in {path}")
+            self.partial_fit(texts, labels)
+            n_rows += len(texts)
+            print(f"Trained on {n_rows} reviews")
+        return n_rows
+
+    def save(self, path):
+        """Pickle the analyzer so training can be resumed later."""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+        print(f"Model saved to {path}")
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a sentiment model on a large CSV/JSONL file in chunks")
+    parser.add_argument('data', help="CSV or JSONL file with text and label columns")
+    parser.add_argument('--classifier', default='sgd', choices=['sgd', 'nb'])
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--text-column', default='text')
+    parser.add_argument('--label-column', default='label')
+    parser.add_argument('--classes', nargs='+', default=list(DEFAULT_CLASSES))
+    parser.add_argument('--model', default='models/streaming_sentiment.pkl')
+    parser.add_argument('--update', action='store_true', help="Continue training an existing model")
+    args = parser.parse_args()
+
+    if args.update and os.path.exists(args.model):
+        analyzer = StreamingSentimentAnalyzer.load(args.model)
+        print(f"Updating model from {args.model}")
+    else:
+        analyzer = StreamingSentimentAnalyzer(args.classifier, classes=args.classes)
+
+    analyzer.train_from_file(args.data, args.chunk_size, args.text_column, args.label_column)
+    analyzer.save(args.model)
+
+
+if __name__ == "__main__":
+    main()
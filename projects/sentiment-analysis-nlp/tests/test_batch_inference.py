@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import pytest
+
+from batch_inference import MicroBatcher
+
+
+class BlockingAnalyzer:
+    """predict_batch blocks until released, so batches stay in flight."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def predict_batch(self, texts):
+        self.started.set()
+        self.release.wait(5)
+        return [('positive', 1.0)] * len(texts)
+
+
+class EchoAnalyzer:
+    def __init__(self):
+        self.calls = []
+
+    def predict_batch(self, texts):
+        self.calls.append(list(texts))
+        return [(text, 1.0) for text in texts]
+
+
+def test_concurrent_requests_are_batched_in_order():
+    async def scenario():
+        analyzer = EchoAnalyzer()
+        async with MicroBatcher(analyzer, max_batch_size=8, max_delay=0.05) as batcher:
+            results = await asyncio.gather(*(batcher.predict(str(i)) for i in range(20)))
+        return analyzer, results
+
+    analyzer, results = asyncio.run(scenario())
+    assert [sentiment for sentiment, _ in results] == [str(i) for i in range(20)]
+    assert max(len(call) for call in analyzer.calls) == 8
+    assert len(analyzer.calls) < 20
+
+
+def test_stop_cancels_in_flight_requests():
+    async def scenario():
+        analyzer = BlockingAnalyzer()
+        batcher = MicroBatcher(analyzer, max_batch_size=2, max_delay=0.01, max_in_flight=1)
+        await batcher.start()
+        # The first batch is being scored, the next one is waiting for a slot
+        requests = [asyncio.ensure_future(batcher.predict(str(i))) for i in range(5)]
+        await asyncio.get_running_loop().run_in_executor(None, analyzer.started.wait, 5)
+        await asyncio.sleep(0.05)
+
+        await batcher.stop()
+        analyzer.release.set()
+        done, pending = await asyncio.wait(requests, timeout=2)
+        return requests, pending
+
+    requests, pending = asyncio.run(scenario())
+    assert not pending
+    assert all(request.cancelled() for request in requests)
+
+
+def test_stop_cancels_partially_collected_batch():
+    async def scenario():
+        batcher = MicroBatcher(EchoAnalyzer(), max_batch_size=100, max_delay=10)
+        await batcher.start()
+        requests = [asyncio.ensure_future(batcher.predict(str(i))) for i in range(3)]
+        # Let the worker take the requests off the queue into its batch
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        done, pending = await asyncio.wait(requests, timeout=2)
+        return requests, pending
+
+    requests, pending = asyncio.run(scenario())
+    assert not pending
+    assert all(request.cancelled() for request in requests)
+
+
+def test_analyzer_errors_propagate():
+    class FailingAnalyzer:
+        def predict_batch(self, texts):
+            raise RuntimeError('boom')
+
+    async def scenario():
+        async with MicroBatcher(FailingAnalyzer()) as batcher:
+            await batcher.predict('text')
+
+    with pytest.raises(RuntimeError, match='boom'):
+        asyncio.run(scenario())
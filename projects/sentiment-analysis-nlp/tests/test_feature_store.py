@@ -0,0 +1,111 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from feature_store import FeatureStore, corpus_hash  # noqa: E402
+from sentiment_analysis import MLBasedSentimentAnalyzer  # noqa: E402
+
+TEXTS = ['great product love it', 'awful product hate it', 'okay product', 'love the price']
+PARAMS = {'max_features': 100, 'stop_words': 'english'}
+
+
+def test_corpus_hash_respects_text_boundaries():
+    assert corpus_hash(['ab', 'c']) != corpus_hash(['a', 'bc'])
+    assert corpus_hash(TEXTS) == corpus_hash(list(TEXTS))
+
+
+def test_cached_fit_matches_a_fresh_fit(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    X_first, fitted = store.fit_transform(TEXTS, **PARAMS)
+    X_cached, rebuilt = store.fit_transform(TEXTS, **PARAMS)
+    assert (store.hits, store.misses) == (1, 1)
+
+    expected = TfidfVectorizer(**PARAMS)
+    X_expected = expected.fit_transform(TEXTS)
+    for X in (X_first, X_cached):
+        np.testing.assert_array_equal(X.toarray(), X_expected.toarray())
+
+    new_texts = ['love love hate', 'unknown words']
+    np.testing.assert_array_equal(rebuilt.transform(new_texts).toarray(), expected.transform(new_texts).toarray())
+    np.testing.assert_array_equal(rebuilt.get_feature_names_out(), expected.get_feature_names_out())
+    # The rebuilt vectorizer is fitted, but its parameters are the original ones
+    assert rebuilt.get_params() == expected.get_params()
+
+
+def test_different_params_or_texts_miss(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.fit_transform(TEXTS, **PARAMS)
+    store.fit_transform(TEXTS, max_features=100)
+    store.fit_transform(TEXTS[:-1], **PARAMS)
+    assert (store.hits, store.misses) == (0, 3)
+
+
+def test_transform_is_cached_for_fresh_and_rebuilt_vectorizers(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    _, fitted = store.fit_transform(TEXTS, **PARAMS)
+    _, rebuilt = store.fit_transform(TEXTS, **PARAMS)
+    X = store.transform(fitted, ['love it', 'hate it'])
+    X_cached = store.transform(rebuilt, ['love it', 'hate it'])
+    assert store.hits == 2
+    np.testing.assert_array_equal(X.toarray(), X_cached.toarray())
+
+
+def test_retraining_on_a_new_corpus_learns_its_vocabulary(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    labels = ['positive', 'negative', 'positive', 'positive']
+    analyzer = MLBasedSentimentAnalyzer()
+    analyzer.train(TEXTS, labels, feature_store=store)
+    # Second run on the same texts is a cache hit and rebuilds the vectorizer
+    analyzer.train(TEXTS, labels, feature_store=store)
+    assert store.hits == 1
+
+    analyzer.train(['superb gadget', 'dreadful gadget', 'superb value', 'superb fit'], labels, feature_store=store)
+    assert 'superb' in analyzer.vectorizer.vocabulary_
+    assert 'love' not in analyzer.vectorizer.vocabulary_
+    assert analyzer.vectorizer.transform(['superb dreadful']).nnz == 2
+
+
+def fill(store, n, start=0, size_texts=200):
+    """Add n entries of similar size, returning their keys oldest first."""
+    keys = []
+    for i in range(start, start + n):
+        texts = [f'entry{i} word{j} text{j % 7}' for j in range(size_texts)]
+        store.fit_transform(texts)
+        keys.append(store.entries()[-1][0])
+        # Keep last-use times distinct on filesystems with coarse timestamps
+        time.sleep(0.02)
+    return keys
+
+
+def test_evicts_least_recently_used_entries_beyond_max_bytes(tmp_path):
+    store = FeatureStore(str(tmp_path), max_bytes=10 ** 12)
+    keys = fill(store, 3)
+    entry_size = max(size for _, size, _ in store.entries())
+
+    # Use the oldest entry again, so the second one becomes least recently used
+    store.fit_transform([f'entry0 word{j} text{j % 7}' for j in range(200)])
+    time.sleep(0.02)
+
+    store.max_bytes = 3 * entry_size + entry_size // 2
+    new_key = fill(store, 1, start=3)[0]
+    remaining = [key for key, _, _ in store.entries()]
+
+    assert keys[1] not in remaining
+    assert set(remaining) == {keys[0], keys[2], new_key}
+    assert store.size() <= store.max_bytes
+    assert not os.path.exists(os.path.join(str(tmp_path), keys[1]))
+
+
+def test_evict_and_clear(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    fill(store, 3)
+    total = store.size()
+    assert store.evict(total - 1) == 1
+    assert store.stats()['entries'] == 2
+    assert store.clear() == 2
+    assert store.entries() == [] and store.size() == 0
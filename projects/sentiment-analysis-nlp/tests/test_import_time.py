@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds allowed for importing a module in a fresh worker process. Importing
+# NLTK, scikit-learn or pandas eagerly takes about a second or more each
+IMPORT_BUDGET_SECONDS = 0.5
+
+HEAVY_MODULES = ('nltk', 'sklearn', 'pandas', 'matplotlib', 'seaborn')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def import_in_subprocess(module):
+    # No network access at import time: downloads would fail fast instead of hanging
+    env = dict(os.environ, SENTIMENT_NLTK_DOWNLOAD='0')
+    output = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                            cwd=PROJECT_DIR, env=env, capture_output=True, text=True, timeout=60, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('module', ['sentiment_analysis', 'train_models'])
+def test_import_is_light(module):
+    result = import_in_subprocess(module)
+    assert result['loaded'] == []
+    assert result['elapsed'] < IMPORT_BUDGET_SECONDS
+
+
+def test_analyzers_construct_without_nltk_when_stopwords_given():
+    probe = ("import sys\n"
+             "from sentiment_analysis import RuleBasedSentimentAnalyzer\n"
+             "RuleBasedSentimentAnalyzer(stop_words=['the']).analyze_sentiment('a great day')\n"
+             "print('nltk' in sys.modules)\n")
+    output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, timeout=60, check=True)
+    assert output.stdout.strip() == 'False'
@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+from lexicon_scoring import LexiconScorer  # noqa: E402
+from sentiment_analysis import RuleBasedSentimentAnalyzer  # noqa: E402
+
+STOP_WORDS = {'i', 'this', 'is', 'it', 'the', 'and', 'was', 'so', 'a'}
+
+CORPUS = [
+    "I love this product! It's amazing and works perfectly.",
+    "This is the worst purchase I've ever made. Terrible quality.",
+    "The product is okay, nothing special but does the job.",
+    "Not bad, but could be better. Average experience.",
+    "GREAT great Great... but the battery was awful",
+    "I cannot say I'm happy; pleased? no. Sad, upset, annoyed!",
+    "café was brilliant, naïve staff were boring 😀",
+    "",
+    "   \t\n  ",
+    "good\x00bad",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return RuleBasedSentimentAnalyzer(stop_words=STOP_WORDS)
+
+
+def test_analyze_batch_matches_analyze_sentiment(analyzer):
+    scorer = LexiconScorer.from_analyzer(analyzer)
+    assert scorer.analyze_batch(CORPUS) == [analyzer.analyze_sentiment(text) for text in CORPUS]
+
+
+def test_analyze_batch_matches_analyze_sentiment_on_random_texts(analyzer):
+    rng = random.Random(0)
+    words = (sorted(analyzer.positive_words) + sorted(analyzer.negative_words) +
+             ['meh', 'product', 'cannot', 'the', 'not', 'Good!', 'BAD,', '42'])
+    texts = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 12))) for _ in range(200)]
+
+    scorer = LexiconScorer.from_analyzer(analyzer)
+    assert scorer.analyze_batch(texts) == [analyzer.analyze_sentiment(text) for text in texts]
+
+
+def test_empty_batch():
+    assert LexiconScorer.from_word_lists({'good'}, {'bad'}).analyze_batch([]) == []
+
+
+def test_weighted_lexicon():
+    scorer = LexiconScorer({'superb': 3.0, 'good': 1.0, 'poor': -1.0, 'awful': -2.5})
+    positive, negative = scorer.score(['superb but poor', 'good good awful', 'nothing here'])
+
+    assert np.allclose(positive, [3.0, 2.0, 0.0])
+    assert np.allclose(negative, [1.0, 2.5, 0.0])
+    assert scorer.analyze_batch(['superb but poor', 'good good awful', 'nothing here']) == [
+        ('positive', 3.0 / 5.0),
+        ('negative', 2.5 / 5.5),
+        ('neutral', 0.5),
+    ]
+
+
+def test_negation_flips_polarity():
+    scorer = LexiconScorer.from_word_lists({'good'}, {'bad'}, negation_window=3)
+    assert [label for label, _ in scorer.analyze_batch(['not good', 'not bad', "don't expect much, it is bad"])] == [
+        'negative', 'positive', 'negative']
+
+
+def test_negation_window_edge():
+    scorer = LexiconScorer.from_word_lists({'good'}, {'bad'}, negation_window=2)
+    # 'good' is exactly two tokens after 'not' and still negated; three is out of range
+    positive, negative = scorer.score(['not very good', 'not very very good'])
+    assert positive.tolist() == [0.0, 1.0]
+    assert negative.tolist() == [1.0, 0.0]
+
+
+def test_negation_window_restarts_at_each_negator():
+    scorer = LexiconScorer.from_word_lists({'good'}, {'bad'}, negation_window=1)
+    positive, negative = scorer.score(['not x never good', 'good not'])
+    assert positive.tolist() == [0.0, 1.0]
+    assert negative.tolist() == [1.0, 0.0]
+
+
+def test_negator_at_end_of_document_does_not_leak_into_next():
+    scorer = LexiconScorer.from_word_lists({'good'}, {'bad'}, negation_window=5)
+    positive, negative = scorer.score(['it was not', 'good', 'bad never', 'bad'])
+    assert positive.tolist() == [0.0, 1.0, 0.0, 0.0]
+    assert negative.tolist() == [0.0, 0.0, 1.0, 1.0]
+
+
+def test_split_words_negate():
+    scorer = LexiconScorer.from_word_lists({'good'}, {'bad'}, negation_window=1)
+    assert scorer.analyze_batch(['cannot good'])[0][0] == 'negative'
+
+
+def test_negation_disabled_by_default():
+    scorer = LexiconScorer.from_word_lists({'good'}, {'bad'})
+    assert scorer.analyze_batch(['not good'])[0][0] == 'positive'
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from model_artifact import load_artifact, save_artifact
+from sentiment_analysis import clean_text
+
+pytest.importorskip('sklearn')
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.linear_model import LogisticRegression, SGDClassifier  # noqa: E402
+from sklearn.naive_bayes import MultinomialNB  # noqa: E402
+from sklearn.svm import SVC  # noqa: E402
+
+WORDS = {
+    'positive': ['great', 'love', 'excellent', 'happy', 'wonderful'],
+    'negative': ['awful', 'hate', 'terrible', 'sad', 'broken'],
+    'neutral': ['okay', 'average', 'fine', 'plain', 'ordinary'],
+}
+FILLER = ['the', 'product', 'delivery', 'price', 'box', 'screen', 'café', 'battery', 'day']
+
+
+def make_corpus(n=300, labels=('positive', 'negative', 'neutral'), seed=0):
+    rng = np.random.default_rng(seed)
+    texts, y = [], []
+    for _ in range(n):
+        label = labels[rng.integers(len(labels))]
+        words = list(rng.choice(FILLER, size=6)) + list(rng.choice(WORDS[label], size=2))
+        rng.shuffle(words)
+        texts.append(' '.join(words) + '!')
+        y.append(label)
+    return texts, np.array(y)
+
+
+def fit(model, labels, **vectorizer_params):
+    texts, y = make_corpus(labels=labels)
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    X = vectorizer.fit_transform([clean_text(text) for text in texts])
+    model.fit(X, y)
+    return vectorizer, model
+
+
+EVAL_TEXTS = make_corpus(n=50, seed=1)[0] + ['', 'unseen words only', 'GREAT great GREAT', 'x' * 500]
+
+MODELS = [
+    ('binary logistic regression', lambda: LogisticRegression(), ('positive', 'negative'), {}),
+    ('multinomial logistic regression', lambda: LogisticRegression(max_iter=1000), tuple(WORDS), {}),
+    ('naive bayes', lambda: MultinomialNB(), tuple(WORDS), {'sublinear_tf': True}),
+    ('sgd log loss', lambda: SGDClassifier(loss='log_loss', random_state=0), tuple(WORDS),
+     {'ngram_range': (1, 2), 'stop_words': 'english'}),
+    ('binary sgd log loss', lambda: SGDClassifier(loss='log_loss', random_state=0), ('positive', 'negative'),
+     {'binary': True, 'norm': 'l1'}),
+]
+
+
+@pytest.mark.parametrize('name, make_model, labels, params', MODELS, ids=[model[0] for model in MODELS])
+def test_artifact_matches_sklearn(tmp_path, name, make_model, labels, params):
+    vectorizer, model = fit(make_model(), labels, **params)
+    path = str(tmp_path / 'model.artifact')
+    save_artifact(vectorizer, model, path)
+    predictor = load_artifact(path)
+
+    X = vectorizer.transform([clean_text(text) for text in EVAL_TEXTS])
+    np.testing.assert_allclose(predictor.transform(EVAL_TEXTS).toarray(), X.toarray(), atol=1e-12)
+    np.testing.assert_allclose(predictor.predict_proba(EVAL_TEXTS), model.predict_proba(X), atol=1e-9)
+
+    predictions = predictor.predict_batch(EVAL_TEXTS)
+    assert [sentiment for sentiment, _ in predictions] == list(model.predict(X))
+    assert predictor.predict(EVAL_TEXTS[0]) == predictions[0]
+
+
+def test_weights_are_memory_mapped(tmp_path):
+    vectorizer, model = fit(LogisticRegression(), tuple(WORDS))
+    path = str(tmp_path / 'model.artifact')
+    save_artifact(vectorizer, model, path)
+    predictor = load_artifact(path)
+    for name in ('vocabulary', 'idf', 'coef', 'intercept'):
+        assert isinstance(predictor.arrays[name].base, np.memmap) or isinstance(predictor.arrays[name], np.memmap)
+
+
+def test_rejects_unsupported_model(tmp_path):
+    vectorizer, model = fit(SVC(), tuple(WORDS))
+    with pytest.raises(ValueError):
+        save_artifact(vectorizer, model, str(tmp_path / 'model.artifact'))
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'model.pkl'
+    path.write_bytes(b'not an artifact at all')
+    with pytest.raises(ValueError):
+        load_artifact(str(path))
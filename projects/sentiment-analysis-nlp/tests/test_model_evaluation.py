@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pytest
+
+from model_evaluation import cross_validate_models, load_csr, save_csr
+
+pytest.importorskip('sklearn')
+from scipy.sparse import random as sparse_random  # noqa: E402
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+from sklearn.model_selection import StratifiedKFold, cross_val_score  # noqa: E402
+from sklearn.naive_bayes import MultinomialNB  # noqa: E402
+
+
+def make_features(n_samples=120, n_features=40, seed=0):
+    rng = np.random.default_rng(seed)
+    X = sparse_random(n_samples, n_features, density=0.2, format='csr', random_state=seed)
+    y = np.where(X[:, :5].sum(axis=1).A1 > X[:, 5:10].sum(axis=1).A1, 'positive', 'negative')
+    # Some label noise so folds do not all score 1.0
+    flip = rng.random(n_samples) < 0.1
+    y[flip] = np.where(y[flip] == 'positive', 'negative', 'positive')
+    return X, y
+
+
+def is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_csr_round_trip_is_memory_mapped(tmp_path):
+    X, _ = make_features()
+    save_csr(X, str(tmp_path / 'matrix'))
+    loaded = load_csr(str(tmp_path / 'matrix'))
+
+    assert loaded.shape == X.shape
+    assert (loaded != X).nnz == 0
+    for array in (loaded.data, loaded.indices, loaded.indptr):
+        assert is_memory_mapped(array)
+
+
+MODELS = {'Logistic Regression': LogisticRegression(), 'Naive Bayes': MultinomialNB()}
+
+
+def test_matches_scikit_learn_cross_val_score():
+    X, y = make_features()
+    results = cross_validate_models(X, y, MODELS, n_splits=4, n_workers=1, random_state=3)
+
+    folds = StratifiedKFold(n_splits=4, shuffle=True, random_state=3)
+    for name, model in MODELS.items():
+        expected = cross_val_score(model, X, y, cv=folds)
+        np.testing.assert_allclose(results[name]['accuracies'], expected)
+        assert results[name]['mean_accuracy'] == pytest.approx(expected.mean())
+        assert results[name]['std_accuracy'] == pytest.approx(expected.std())
+        assert results[name]['mean_fit_time'] > 0
+        assert results[name]['predict_latency'] > 0
+
+
+def test_parallel_matches_serial():
+    X, y = make_features()
+    serial = cross_validate_models(X, y, MODELS, n_splits=3, n_workers=1)
+    parallel = cross_validate_models(X, y, MODELS, n_splits=3, n_workers=2)
+    for name in MODELS:
+        np.testing.assert_array_equal(serial[name]['accuracies'], parallel[name]['accuracies'])
+
+
+def test_models_passed_in_are_not_fitted():
+    X, y = make_features()
+    model = LogisticRegression()
+    cross_validate_models(X, y, {'lr': model}, n_splits=3, n_workers=1)
+    assert not hasattr(model, 'coef_')
+
+
+def test_work_dir_is_kept_only_when_given(tmp_path, monkeypatch):
+    X, y = make_features()
+
+    work_dir = str(tmp_path / 'cv')
+    cross_validate_models(X, y, MODELS, n_splits=3, n_workers=1, work_dir=work_dir)
+    assert sorted(os.listdir(work_dir)) == ['data.npy', 'indices.npy', 'indptr.npy', 'labels.npy', 'shape.npy']
+
+    monkeypatch.setenv('TMPDIR', str(tmp_path / 'tmp'))
+    os.makedirs(str(tmp_path / 'tmp'))
+    import tempfile
+    monkeypatch.setattr(tempfile, 'tempdir', None)
+    cross_validate_models(X, y, MODELS, n_splits=3, n_workers=1)
+    assert os.listdir(str(tmp_path / 'tmp')) == []
+
+
+def make_texts(n_samples=90, seed=1):
+    rng = np.random.default_rng(seed)
+    words = {'positive': ['good', 'great', 'love'], 'negative': ['bad', 'awful', 'hate']}
+    neutral = ['item', 'box', 'day', 'it', 'was', 'the']
+    texts, labels = [], []
+    for i in range(n_samples):
+        label = 'positive' if i % 2 else 'negative'
+        # Often use a word of the other polarity so folds do not all score 1.0
+        polarity = label if rng.random() < 0.7 else ('negative' if i % 2 else 'positive')
+        # A word unique to this document only enters the vocabulary when it is a training row
+        texts.append(' '.join([rng.choice(words[polarity])] + list(rng.choice(neutral, 3)) + [f'rare{i}']))
+        labels.append(label)
+    return texts, labels
+
+
+def test_vectorizer_is_fitted_on_training_folds_only(tmp_path):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import make_pipeline
+
+    texts, labels = make_texts()
+    vectorizer = TfidfVectorizer()
+    work_dir = str(tmp_path / 'cv')
+    results = cross_validate_models(texts, labels, MODELS, n_splits=3, n_workers=2, random_state=0,
+                                    work_dir=work_dir, vectorizer=vectorizer)
+
+    folds = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+    for fold, (train_index, _) in enumerate(folds.split(texts, labels)):
+        train_vocabulary = TfidfVectorizer().fit([texts[i] for i in train_index]).vocabulary_
+        assert load_csr(os.path.join(work_dir, f'fold_{fold}')).shape == (len(texts), len(train_vocabulary))
+    for name, model in MODELS.items():
+        expected = cross_val_score(make_pipeline(TfidfVectorizer(), model), texts, labels, cv=folds)
+        assert expected.min() < 1
+        np.testing.assert_allclose(results[name]['accuracies'], expected)
+    assert not hasattr(vectorizer, 'vocabulary_')
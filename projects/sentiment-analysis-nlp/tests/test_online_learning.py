@@ -0,0 +1,135 @@
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+from online_learning import OnlineSentimentAnalyzer  # noqa: E402
+from streaming_training import StreamingSentimentAnalyzer  # noqa: E402
+
+POSITIVE = ['great product love it', 'excellent and wonderful', 'happy with it, great']
+NEGATIVE = ['awful product hate it', 'terrible and broken', 'sad about it, awful']
+PROBE = ['love it', 'hate it', 'great', 'broken']
+
+
+def make_online(**kwargs):
+    learner = StreamingSentimentAnalyzer(classes=('negative', 'positive'), n_features=2 ** 12)
+    learner.partial_fit(POSITIVE + NEGATIVE, ['positive'] * 3 + ['negative'] * 3)
+    return OnlineSentimentAnalyzer(learner, **kwargs)
+
+
+def block_partial_fit(online):
+    """Make the learner's next partial_fit calls wait until released."""
+    learner = online._learner
+    partial_fit = learner.partial_fit
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(texts, labels):
+        started.set()
+        assert release.wait(10)
+        return partial_fit(texts, labels)
+
+    learner.partial_fit = blocking
+    return started, release
+
+
+def test_predictions_are_served_while_partial_fit_runs():
+    online = make_online()
+    before = online.predict_batch(PROBE)
+    serving = online.serving_model
+    started, release = block_partial_fit(online)
+
+    with online:
+        # Teach the opposite labels so the new model visibly differs
+        online.submit(POSITIVE * 20, ['negative'] * 60)
+        assert started.wait(10)
+
+        # partial_fit is in progress: predictions come from the old model, unchanged
+        assert online.predict_batch(PROBE) == before
+        assert online.serving_model is serving
+        assert online.version == 0
+
+        release.set()
+        online.flush()
+
+    assert online.version == 1
+    assert online.serving_model is not serving
+    assert online.predict('great product love it')[0] == 'negative'
+    # The previously published model was not modified by the update
+    assert serving.predict_batch(PROBE) == before
+
+
+def test_published_models_are_never_mutated():
+    online = make_online(publish_every=1)
+    seen = {}
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            model = online.serving_model
+            coef = model.model.coef_.copy()
+            try:
+                model.predict_batch(PROBE)
+            except Exception as e:
+                errors.append(e)
+            # Every model ever published keeps the weights it was published with
+            first = seen.setdefault(id(model), (model, coef))[1]
+            if not np.array_equal(first, model.model.coef_):
+                errors.append(AssertionError('published model changed after the swap'))
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    rng = np.random.default_rng(0)
+    with online:
+        for _ in range(30):
+            labels = list(rng.choice(['negative', 'positive'], size=6))
+            online.submit(POSITIVE + NEGATIVE, labels)
+        online.flush()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert online.updates_applied == 30
+    assert len(seen) > 1
+
+
+def test_failed_update_keeps_serving_model():
+    online = make_online()
+    serving = online.serving_model
+    vectorizer = online._learner.vectorizer
+    n_documents = vectorizer.n_documents
+    document_frequency = vectorizer.document_frequency.copy()
+    with online:
+        online.submit(['some text'], ['not-a-class'])
+        online.flush()
+    assert isinstance(online.last_error, ValueError)
+    assert online.serving_model is serving
+    assert online.version == 0
+    # The rejected batch did not reach the learner's vectorizer either
+    assert vectorizer.n_documents == n_documents
+    assert np.array_equal(vectorizer.document_frequency, document_frequency)
+
+
+def test_publish_every_batches_swaps():
+    online = make_online(publish_every=3)
+    started, release = block_partial_fit(online)
+    with online:
+        for _ in range(6):
+            online.submit(POSITIVE, ['positive'] * 3)
+        assert started.wait(10)
+        release.set()
+        online.flush()
+    assert online.updates_applied == 6
+    assert 2 <= online.version < 6
+
+
+def test_synchronous_update_publishes():
+    online = make_online()
+    online.update(NEGATIVE, ['negative'] * 3)
+    assert online.version == 1
+    with online:
+        with pytest.raises(ValueError):
+            online.update(NEGATIVE, ['negative'] * 3)
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from parallel_preprocessing import iter_preprocessed_chunks, preprocess_parallel
+from sentiment_analysis import clean_text, tokenize
+
+
+def make_texts(n=47):
+    rng = random.Random(0)
+    words = ['Great', 'product!', "I'm", 'cannot', 'believe', 'it', '42%', 'café', 'BAD...', 'ok']
+    return [f'{i}: ' + ' '.join(rng.choice(words) for _ in range(rng.randint(0, 8))) for i in range(n)]
+
+
+@pytest.mark.parametrize('preprocess', [clean_text, tokenize])
+def test_parallel_matches_serial_in_order(preprocess):
+    texts = make_texts()
+    assert preprocess_parallel(texts, preprocess, n_workers=2, chunk_size=4) == [preprocess(text) for text in texts]
+
+
+def test_chunks_are_yielded_in_input_order():
+    texts = make_texts()
+    chunks = list(iter_preprocessed_chunks(iter(texts), clean_text, n_workers=2, chunk_size=5))
+
+    assert [len(chunk) for chunk in chunks] == [5] * 9 + [2]
+    assert [text for chunk in chunks for text in chunk] == [clean_text(text) for text in texts]
+
+
+@pytest.mark.parametrize('texts', [[], ['Only one'], make_texts(3)])
+def test_small_inputs_run_serially(texts):
+    assert preprocess_parallel(texts, clean_text, n_workers=2, chunk_size=4) == [clean_text(text) for text in texts]
@@ -0,0 +1,146 @@
+import pickle
+
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', clock)
+    return clock
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2)
+    cache.put_many([('a', 1), ('b', 2)])
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get_many(['a']) == [1]
+    cache.put_many([('c', 3)])
+
+    assert cache.get_many(['a', 'b', 'c']) == [1, None, 3]
+    assert cache.stats()['evictions'] == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_size=10, ttl=5)
+    cache.put_many([('a', 1)])
+    clock.now += 4
+    cache.put_many([('b', 2)])
+    clock.now += 2
+
+    assert cache.get_many(['a', 'b']) == [None, 2]
+    assert cache.stats()['expirations'] == 1
+    assert len(cache) == 1
+
+
+def test_entries_without_ttl_never_expire(clock):
+    cache = PredictionCache(max_size=10)
+    cache.put_many([('a', 1)])
+    clock.now += 10 ** 9
+    assert cache.get_many(['a']) == [1]
+
+
+def test_clear_drops_entries_and_results_of_the_old_generation():
+    cache = PredictionCache(max_size=10)
+    cache.put_many([('a', 1)])
+    generation = cache.generation
+
+    # A prediction started before the model was replaced finishes after it
+    cache.clear()
+    cache.put_many([('b', 2)], generation)
+
+    assert cache.get_many(['a', 'b']) == [None, None]
+    cache.put_many([('b', 3)], cache.generation)
+    assert cache.get_many(['b']) == [3]
+
+
+def test_stats_report_hit_rate():
+    cache = PredictionCache(max_size=10)
+    cache.put_many([('a', 1)])
+    cache.get_many(['a', 'a', 'b', 'a'])
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (3, 1, 1)
+    assert stats['hit_rate'] == 0.75
+
+
+def test_key_is_a_fixed_size_digest():
+    assert PredictionCache.key('great movie') == PredictionCache.key('great movie')
+    assert PredictionCache.key('great movie') != PredictionCache.key('great movies')
+    assert len(PredictionCache.key('x' * 100000)) == 16
+
+
+def test_pickling_keeps_settings_not_entries():
+    cache = PredictionCache(max_size=7, ttl=3)
+    cache.put_many([('a', 1)])
+    restored = pickle.loads(pickle.dumps(cache))
+    assert (restored.max_size, restored.ttl, len(restored)) == (7, 3, 0)
+
+
+def test_rejects_empty_cache():
+    with pytest.raises(ValueError):
+        PredictionCache(max_size=0)
+
+
+class TestAnalyzerCache:
+    TEXTS = ['I love it, great product', 'great product, I love it!', 'terrible, I hate it',
+             'awful and broken', 'love love love', 'hate this, so bad']
+    LABELS = ['positive', 'positive', 'negative', 'negative', 'positive', 'negative']
+
+    @pytest.fixture
+    def analyzer(self):
+        pytest.importorskip('sklearn')
+        from sentiment_analysis import MLBasedSentimentAnalyzer
+
+        analyzer = MLBasedSentimentAnalyzer(cache_size=100)
+        analyzer.train(self.TEXTS, self.LABELS)
+
+        calls = []
+        predict_processed = analyzer._predict_processed
+
+        def counting(processed_texts):
+            calls.append(list(processed_texts))
+            return predict_processed(processed_texts)
+
+        analyzer._predict_processed = counting
+        analyzer.calls = calls
+        return analyzer
+
+    def test_repeated_texts_skip_the_model(self, analyzer):
+        first = analyzer.predict_batch(['Great product!!', 'great product', 'awful'])
+        second = analyzer.predict_batch(['GREAT PRODUCT', 'awful'])
+
+        # Texts equal after preprocessing are scored once, then served from the cache
+        assert analyzer.calls == [['great product', 'awful']]
+        assert first[0] == first[1] == second[0]
+        assert first[2] == second[1]
+        assert analyzer.cache.stats()['hits'] == 2
+
+    def test_results_match_uncached_predictions(self, analyzer):
+        cached = analyzer.predict_batch(self.TEXTS + self.TEXTS)
+        uncached = analyzer._predict_processed([analyzer.preprocess_text(text) for text in self.TEXTS + self.TEXTS])
+        assert cached == uncached
+
+    def test_retraining_invalidates_the_cache(self, analyzer):
+        before = analyzer.predict('love it')
+        generation = analyzer.cache.generation
+
+        # Swap the labels so the retrained model predicts the opposite
+        flipped = ['negative' if label == 'positive' else 'positive' for label in self.LABELS]
+        analyzer.train(self.TEXTS, flipped)
+        after = analyzer.predict('love it')
+
+        assert analyzer.cache.generation == generation + 1
+        assert before[0] != after[0]
+        assert len(analyzer.calls) == 2
@@ -0,0 +1,96 @@
+import asyncio
+import http.client
+import json
+
+import pytest
+
+pytest.importorskip('sklearn')
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.naive_bayes import MultinomialNB  # noqa: E402
+
+from model_artifact import load_artifact, save_artifact  # noqa: E402
+from scoring_server import ScoringServer  # noqa: E402
+
+REQUEST_TIMEOUT = 30
+
+TEXTS = ['great love it', 'awful hate it', 'okay it is fine'] * 20
+LABELS = ['positive', 'negative', 'neutral'] * 20
+
+
+@pytest.fixture(scope='module')
+def model_path(tmp_path_factory):
+    vectorizer = TfidfVectorizer()
+    X = vectorizer.fit_transform(TEXTS)
+    path = str(tmp_path_factory.mktemp('models') / 'naive_bayes.model')
+    save_artifact(vectorizer, MultinomialNB().fit(X, LABELS), path)
+    return path
+
+
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=REQUEST_TIMEOUT)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def run_with_server(model_path, requests):
+    """Start a server on a free port, send requests in order and return the responses."""
+    async def scenario():
+        server = ScoringServer(model_path, n_workers=2)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        loop = asyncio.get_running_loop()
+        try:
+            responses = []
+            for method, path, body in requests:
+                responses.append(await asyncio.wait_for(
+                    loop.run_in_executor(None, request, port, method, path, body), REQUEST_TIMEOUT))
+            metrics = server.metrics()
+        finally:
+            listener.close()
+            await server.stop()
+        return responses, metrics
+
+    return asyncio.run(scenario())
+
+
+def test_predict_round_trip(model_path):
+    expected = load_artifact(model_path).predict_batch(['love it', 'hate it', 'fine'])
+    responses, metrics = run_with_server(model_path, [
+        ('GET', '/health', None),
+        ('POST', '/predict', json.dumps({'text': 'love it'})),
+        ('POST', '/predict_batch', json.dumps({'texts': ['love it', 'hate it', 'fine']})),
+    ])
+
+    health, single, batch = responses
+    assert health[0] == 200 and health[1]['model']['classes'] == ['negative', 'neutral', 'positive']
+    assert single == (200, {'sentiment': str(expected[0][0]), 'confidence': pytest.approx(expected[0][1])})
+    assert batch[0] == 200
+    assert [result['sentiment'] for result in batch[1]['results']] == [str(label) for label, _ in expected]
+    assert metrics['latency']['/predict']['count'] == 1
+
+
+def test_bad_requests(model_path):
+    responses, metrics = run_with_server(model_path, [
+        ('POST', '/predict', json.dumps([1, 2])),
+        ('POST', '/predict_batch', json.dumps('texts')),
+        ('POST', '/predict', 'not json'),
+        ('POST', '/predict', json.dumps({'text': 3})),
+        ('POST', '/predict_batch', json.dumps({'texts': ['ok', 4]})),
+        ('GET', '/predict', None),
+        ('GET', '/missing', None),
+    ])
+    assert [status for status, _ in responses] == [400, 400, 400, 400, 400, 405, 404]
+    assert metrics['errors'] == 7
+
+
+def test_query_string_is_ignored_for_routing(model_path):
+    responses, metrics = run_with_server(model_path, [
+        ('GET', '/health?verbose=1', None),
+        ('POST', '/predict?source=test', json.dumps({'text': 'great'})),
+    ])
+    assert [status for status, _ in responses] == [200, 200]
+    assert set(metrics['latency']) == {'/health', '/predict'}
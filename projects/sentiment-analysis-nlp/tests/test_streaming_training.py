@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from streaming_training import StreamingSentimentAnalyzer, StreamingTfidfVectorizer  # noqa: E402
+
+DOCUMENTS = [
+    'the battery lasts all day and charges fast',
+    'screen cracked after one week, very disappointed',
+    'fast shipping and the screen is bright',
+    'battery died quickly, would not buy again',
+    'great value for the price',
+    'the price went up and the quality went down',
+    'charges fast, bright screen, great battery',
+]
+POSITIVE = ['great product love it', 'excellent and wonderful', 'happy with it, great']
+NEGATIVE = ['awful product hate it', 'terrible and broken', 'sad about it, awful']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3])
+def test_partial_fit_in_chunks_matches_one_fit(chunk_size):
+    whole = StreamingTfidfVectorizer().partial_fit(DOCUMENTS)
+    chunked = StreamingTfidfVectorizer()
+    for start in range(0, len(DOCUMENTS), chunk_size):
+        chunked.partial_fit(DOCUMENTS[start:start + chunk_size])
+
+    assert chunked.n_documents == whole.n_documents == len(DOCUMENTS)
+    assert np.array_equal(chunked.document_frequency, whole.document_frequency)
+    assert np.array_equal(chunked.idf_, whole.idf_)
+    assert (chunked.transform(DOCUMENTS) != whole.transform(DOCUMENTS)).nnz == 0
+
+
+def test_idf_matches_tfidf_vectorizer():
+    streaming = StreamingTfidfVectorizer().partial_fit(DOCUMENTS)
+    reference = TfidfVectorizer(stop_words='english').fit(DOCUMENTS)
+
+    terms = reference.get_feature_names_out()
+    columns = streaming.hasher.transform(terms).indices
+    assert len(set(columns)) == len(terms)
+    assert np.allclose(streaming.idf_[columns], reference.idf_)
+
+
+def test_idf_is_recomputed_after_partial_fit():
+    vectorizer = StreamingTfidfVectorizer().partial_fit(DOCUMENTS[:3])
+    before = vectorizer.idf_.copy()
+    vectorizer.partial_fit(DOCUMENTS[3:])
+    assert not np.array_equal(vectorizer.idf_, before)
+
+
+def test_unseen_features_get_zero_weight():
+    vectorizer = StreamingTfidfVectorizer().partial_fit(DOCUMENTS)
+    assert vectorizer.transform(['zebra xylophone']).nnz == 0
+    row = vectorizer.transform(['battery zebra'])
+    assert row.nnz == 1
+    assert np.isclose(row.data[0], 1.0)
+
+
+def test_transform_before_fit_raises():
+    with pytest.raises(ValueError):
+        StreamingTfidfVectorizer().transform(DOCUMENTS)
+
+
+@pytest.mark.parametrize('classifier', ['sgd', 'nb'])
+def test_analyzer_learns_in_chunks_and_round_trips(classifier, tmp_path):
+    analyzer = StreamingSentimentAnalyzer(classifier, classes=('negative', 'positive'), n_features=2 ** 12)
+    texts = (POSITIVE + NEGATIVE) * 10
+    labels = (['positive'] * 3 + ['negative'] * 3) * 10
+    analyzer.train(texts, labels, chunk_size=6)
+
+    assert analyzer.vectorizer.n_documents == len(texts)
+    assert analyzer.predict('love it, great')[0] == 'positive'
+    assert analyzer.predict('hate it, awful')[0] == 'negative'
+
+    path = str(tmp_path / 'model.pkl')
+    analyzer.save(path)
+    restored = StreamingSentimentAnalyzer.load(path)
+    assert restored.predict_batch(POSITIVE + NEGATIVE) == analyzer.predict_batch(POSITIVE + NEGATIVE)
+
+
+@pytest.mark.parametrize('texts, labels', [(['some text'], ['not-a-class']),
+                                           (['some text', 'more text'], ['positive'])])
+def test_rejected_chunk_leaves_analyzer_unchanged(texts, labels):
+    analyzer = StreamingSentimentAnalyzer(classes=('negative', 'positive'), n_features=2 ** 12)
+    analyzer.partial_fit(POSITIVE + NEGATIVE, ['positive'] * 3 + ['negative'] * 3)
+    document_frequency = analyzer.vectorizer.document_frequency.copy()
+    coef = analyzer.model.coef_.copy()
+
+    with pytest.raises(ValueError):
+        analyzer.partial_fit(texts, labels)
+    assert analyzer.vectorizer.n_documents == 6
+    assert np.array_equal(analyzer.vectorizer.document_frequency, document_frequency)
+    assert np.array_equal(analyzer.model.coef_, coef)
+
+
+def test_partial_fit_clears_prediction_cache():
+    analyzer = StreamingSentimentAnalyzer(classes=('negative', 'positive'), n_features=2 ** 12, cache_size=10)
+    analyzer.partial_fit(POSITIVE + NEGATIVE, ['positive'] * 3 + ['negative'] * 3)
+    analyzer.predict_batch(POSITIVE)
+    assert len(analyzer.cache) == 3
+
+    analyzer.partial_fit(NEGATIVE, ['negative'] * 3)
+    assert len(analyzer.cache) == 0
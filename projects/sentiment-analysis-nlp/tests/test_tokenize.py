@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from sentiment_analysis import NON_LETTERS, RuleBasedSentimentAnalyzer, tokenize
+
+nltk_tokenize = pytest.importorskip('nltk.tokenize')
+
+CORPUS = [
+    "I love this product! It's amazing and works perfectly.",
+    "This is the worst purchase I've ever made. Terrible quality.",
+    "The product is okay, nothing special but does the job.",
+    "Absolutely fantastic! Highly recommend to everyone.",
+    "Not bad, but could be better. Average experience.",
+    "I'm so disappointed with this service. Never again!",
+]
+
+EDGE_CASES = [
+    "",
+    "   \t\n  ",
+    "I cannot believe it. CANNOT! Cannot?",
+    "gonna gotta wanna gimme lemme",
+    "I'm gonna, you're gotta; we wanna... lemme-gimme",
+    "can't won't don't shouldn't I'd we'll they've y'all 'tis 'twas d'ye more'n",
+    "cannotbe notcannot can not",
+    "wanna",
+    "Price: $19.99 (20% off) -- #1 best-seller!!! @shop",
+    "\"Quoted\" and 'single' and `backticks` and <tags> [brackets] {braces}",
+    "café naïve résumé coöperate",
+    "Привет мир and 東京 and emoji 😀👍 mixed in",
+    "non\u00a0breaking\u2003em\u2009thin\u3000spaces",
+    "tabs\tand\nnewlines\r\nand\x0bvertical\x0cfeeds",
+    "ALL CAPS REVIEW WITH NO PUNCTUATION",
+    "a b c d e f g",
+]
+
+
+def word_tokenize_reference(text):
+    """The original pipeline: lowercase, strip non-letters, NLTK word_tokenize."""
+    cleaned = NON_LETTERS.sub('', text.lower())
+    try:
+        return nltk_tokenize.word_tokenize(cleaned)
+    except LookupError:
+        # Without Punkt data, tokenize as one sentence: after cleanup the text
+        # has no sentence punctuation, so Punkt would not split it anyway
+        return nltk_tokenize.NLTKWordTokenizer().tokenize(cleaned)
+
+
+def fuzzed_texts(n, seed=0):
+    """Random mixes of words, contractions, punctuation, digits and unicode."""
+    rng = random.Random(seed)
+    pieces = ['cannot', 'gonna', 'gotta', 'wanna', 'gimme', 'lemme', "can't", "i'm", "'tis",
+              'good', 'BAD', 'movie', 'x', '.', ',', '!', '?', "'", '"', '-', '(', ')', '42',
+              'é', 'ß', '東', '😀', ' ', '  ', '\t', '\n', ' ']
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30))) for _ in range(n)]
+
+
+@pytest.mark.parametrize('text', CORPUS + EDGE_CASES)
+def test_tokenize_matches_word_tokenize(text):
+    assert tokenize(text) == word_tokenize_reference(text)
+
+
+def test_tokenize_matches_word_tokenize_on_fuzzed_texts():
+    mismatches = [text for text in fuzzed_texts(5000) if tokenize(text) != word_tokenize_reference(text)]
+    assert mismatches == []
+
+
+def test_preprocess_removes_stopwords_after_tokenizing():
+    analyzer = RuleBasedSentimentAnalyzer(stop_words=['i', 'not', 'this'])
+    assert analyzer.preprocess_text("I cannot love this!") == ['can', 'love']
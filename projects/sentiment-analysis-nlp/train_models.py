@@ -1,36 +1,23 @@
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-import matplotlib.pyplot as plt
-import seaborn as sns
 import re
-import nltk
 import pickle
 import os
+import time
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from model_artifact import save_artifact
+from feature_store import FeatureStore
+from model_evaluation import cross_validate_models, print_cv_summary
+from parallel_preprocessing import preprocess_parallel
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+# scikit-learn, pandas and plotting libraries are imported where they are
+# used, so worker processes that only need preprocess_text start quickly
 
 def preprocess_text(text):
     """Preprocess text for analysis"""
-    if pd.isna(text):
-        return ""
+    if not isinstance(text, str):
+        import pandas as pd
+        if pd.isna(text):
+            return ""
     
     # Convert to lowercase
     text = text.lower()
@@ -82,24 +69,63 @@ def create_sample_dataset():
     texts, labels = zip(*data)
     return list(texts), list(labels)
 
-def train_and_evaluate_models(X_train, X_test, y_train, y_test):
-    """Train and evaluate multiple models"""
+def get_models(include_kernel_svm=False):
+    """
+    Models to compare, all of which scale linearly with the number of reviews.
+    
+    The linear SVMs have no predict_proba of their own. They are calibrated
+    with sigmoid (Platt) scaling fitted on 3-fold out-of-fold decision values.
+    With ensemble=False a single SVM is refitted on all the data, so
+    prediction costs one linear model. The RBF-kernel SVC scales
+    quadratically or worse with the training set size, so it is only
+    included on request, for small datasets.
+    """
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.svm import LinearSVC
+    
     models = {
         'Logistic Regression': LogisticRegression(max_iter=1000),
         'Naive Bayes': MultinomialNB(),
-        'SVM': SVC(probability=True)
+        'Linear SVM': CalibratedClassifierCV(LinearSVC(), method='sigmoid', cv=3, ensemble=False),
+        'SGD SVM': CalibratedClassifierCV(SGDClassifier(loss='hinge', alpha=1e-5, random_state=42),
+                                          method='sigmoid', cv=3, ensemble=False),
+        'SGD Logistic': SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
     }
     
+    if include_kernel_svm:
+        from sklearn.svm import SVC
+        models['Kernel SVM'] = SVC(probability=True)
+    
+    return models
+
+def train_and_evaluate_models(X_train, X_test, y_train, y_test, models=None):
+    """Train and evaluate multiple models, timing fit and predict for each"""
+    from sklearn.metrics import accuracy_score, classification_report
+    
+    if models is None:
+        models = get_models()
+    
+    # CalibratedClassifierCV counts samples per class with y == class, which
+    # needs an array rather than a list
+    y_train = np.asarray(y_train)
+    y_test = np.asarray(y_test)
+    
     results = {}
     
     for name, model in models.items():
         print(f"\nTraining {name}...")
         
         # Train model
+        start = time.perf_counter()
         model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
         
         # Make predictions
+        start = time.perf_counter()
         y_pred = model.predict(X_test)
+        predict_time = time.perf_counter() - start
         
         # Calculate accuracy
         accuracy = accuracy_score(y_test, y_pred)
@@ -108,10 +134,12 @@ def train_and_evaluate_models(X_train, X_test, y_train, y_test):
         results[name] = {
             'model': model,
             'accuracy': accuracy,
-            'predictions': y_pred
+            'predictions': y_pred,
+            'fit_time': fit_time,
+            'predict_time': predict_time
         }
         
-        print(f"{name} Accuracy: {accuracy:.4f}")
+        print(f"{name} Accuracy: {accuracy:.4f} (fit {fit_time:.2f}s, predict {predict_time:.3f}s)")
         
         # Print classification report
         print(f"\n{name} Classification Report:")
@@ -119,8 +147,16 @@ def train_and_evaluate_models(X_train, X_test, y_train, y_test):
     
     return results
 
+def print_timing_summary(results):
+    """Print accuracy, fit and predict times side by side"""
+    print(f"\n{'Model':<22}{'Accuracy':>10}{'Fit (s)':>10}{'Predict (s)':>13}")
+    for name, result in results.items():
+        print(f"{name:<22}{result['accuracy']:>10.4f}{result['fit_time']:>10.2f}{result['predict_time']:>13.3f}")
+
 def plot_model_comparison(results):
     """Plot model comparison"""
+    import matplotlib.pyplot as plt
+    
     model_names = list(results.keys())
     accuracies = [results[name]['accuracy'] for name in model_names]
     
@@ -141,6 +177,10 @@ def plot_model_comparison(results):
 
 def plot_confusion_matrix(y_true, y_pred, model_name):
     """Plot confusion matrix for a model"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.metrics import confusion_matrix
+    
     cm = confusion_matrix(y_true, y_pred)
     
     plt.figure(figsize=(8, 6))
@@ -171,8 +211,31 @@ def save_model(model, vectorizer, model_name):
     
     print(f"Model saved to {model_path}")
     print(f"Vectorizer saved to {vectorizer_path}")
+    
+    # Linear models are also written as a pickle-free, memory-mappable artifact
+    artifact_path = f'models/{model_name.lower().replace(" ", "_")}.model'
+    try:
+        save_artifact(vectorizer, model, artifact_path)
+    except ValueError as e:
+        print(f"Skipping model artifact: {e}")
 
 def main():
+    import argparse
+    from sklearn.model_selection import train_test_split
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
+    parser = argparse.ArgumentParser(description="Train and compare sentiment models")
+    parser.add_argument('--kernel-svm', action='store_true',
+                        help="Also train an RBF-kernel SVC (slow; only for small datasets)")
+    parser.add_argument('--cv', type=int, default=0, metavar='K',
+                        help="Also run K-fold cross-validation of every model in parallel, "
+                             "fitting TF-IDF on the training folds only")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for cross-validation (default: one per core)")
+    parser.add_argument('--feature-store', default='features',
+                        help="Directory caching TF-IDF matrices between runs ('' to disable)")
+    args = parser.parse_args()
+    
     print("Training Sentiment Analysis Models")
     print("=================================")
     
@@ -181,9 +244,9 @@ def main():
     texts, labels = create_sample_dataset()
     print(f"Dataset size: {len(texts)} samples")
     
-    # Preprocess texts
+    # Preprocess texts, in parallel once the corpus spans several chunks
     print("Preprocessing texts...")
-    processed_texts = [preprocess_text(text) for text in texts]
+    processed_texts = preprocess_parallel(texts, preprocess_text)
     
     # Split data
     print("Splitting data into train/test sets...")
@@ -194,15 +257,30 @@ def main():
     print(f"Training set size: {len(X_train)}")
     print(f"Test set size: {len(X_test)}")
     
-    # Vectorize texts
+    # Vectorize texts, reusing matrices cached by earlier runs on the same data
     print("Vectorizing texts...")
-    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-    X_train_vec = vectorizer.fit_transform(X_train)
-    X_test_vec = vectorizer.transform(X_test)
+    vectorizer_params = {'max_features': 1000, 'stop_words': 'english'}
+    if args.feature_store:
+        store = FeatureStore(args.feature_store)
+        X_train_vec, vectorizer = store.fit_transform(X_train, **vectorizer_params)
+        X_test_vec = store.transform(vectorizer, X_test)
+    else:
+        vectorizer = TfidfVectorizer(**vectorizer_params)
+        X_train_vec = vectorizer.fit_transform(X_train)
+        X_test_vec = vectorizer.transform(X_test)
     
     # Train and evaluate models
     print("Training and evaluating models...")
-    results = train_and_evaluate_models(X_train_vec, X_test_vec, y_train, y_test)
+    models = get_models(include_kernel_svm=args.kernel_svm)
+    results = train_and_evaluate_models(X_train_vec, X_test_vec, y_train, y_test, models)
+    print_timing_summary(results)
+    
+    if args.cv:
+        print(f"\nCross-validating models with {args.cv} folds...")
+        cv_results = cross_validate_models(processed_texts, labels, get_models(include_kernel_svm=args.kernel_svm),
+                                           n_splits=args.cv, n_workers=args.workers,
+                                           vectorizer=TfidfVectorizer(**vectorizer_params))
+        print_cv_summary(cv_results)
     
     # Plot model comparison
     print("Plotting model comparison...")
@@ -0,0 +1,240 @@
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import subprocess
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from text_generation import load_sample_text
+
+SEED_TEXT = "To be or not to "
+
+
+def synthetic_corpus(base_text, size, seed=0):
+    """
+    Build a corpus of roughly ``size`` characters from the word statistics
+    of a base text, so benchmarks can scale beyond the bundled sample.
+    """
+    counts = Counter(re.findall(r"\S+", base_text))
+    words = list(counts)
+    probabilities = np.array([counts[word] for word in words], dtype=np.float64)
+    probabilities /= probabilities.sum()
+
+    rng = np.random.default_rng(seed)
+    average_length = float(np.dot(probabilities, [len(word) + 1 for word in words]))
+    # Draw slightly more words than needed and trim to the exact size
+    picks = rng.choice(len(words), size=int(1.1 * size / average_length) + 1, p=probabilities)
+
+    lines = []
+    for start in range(0, len(picks), 10):
+        lines.append(' '.join(words[idx] for idx in picks[start:start + 10]))
+    return '\n'.join(lines)[:size]
+
+
+def load_corpus(name, synthetic_size, data_path='data/sample_text.txt'):
+    """Load the bundled sample text or a synthetic corpus derived from it."""
+    text = load_sample_text(data_path)
+    if name == 'synthetic':
+        return synthetic_corpus(text, synthetic_size)
+    return text
+
+
+def _peak_rss_bytes():
+    """Peak resident set size of the current process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if platform.system() == 'Darwin' else peak * 1024
+
+
+def run_case(case):
+    """Train and measure one benchmark configuration in a fresh process."""
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    import tensorflow as tf
+    from text_generation import TextGenerator, configure_threads
+    from export_model import holdout_split, perplexity
+
+    configure_threads(case.get('intra_op_threads'), case.get('inter_op_threads'))
+
+    text = load_corpus(case['corpus'], case['synthetic_size'])
+    generator = TextGenerator(sequence_length=case['sequence_length'], tokenizer=case['tokenizer'])
+    generator.preprocess_text(text)
+    X, y = generator.create_sequences(text)
+
+    split = int(len(X) * 0.9)
+    X_train, y_train = X[:split], y[:split]
+    X_val, y_val = holdout_split(X, y)
+
+    generator.create_model(
+        embedding_dim=case['embedding_dim'],
+        lstm_units=case['lstm_units'],
+        jit_compile=case.get('jit_compile', False),
+        steps_per_execution=case.get('steps_per_execution', 1)
+    )
+
+    # Time each epoch; the first one includes graph tracing and is reported separately
+    epoch_times = []
+
+    class EpochTimer(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self.start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            epoch_times.append(time.perf_counter() - self.start)
+
+    generator.model.fit(X_train, y_train, epochs=case['epochs'], batch_size=case['batch_size'],
+                        callbacks=[EpochTimer()], verbose=0)
+    steady_epoch_time = float(np.median(epoch_times[1:] if len(epoch_times) > 1 else epoch_times))
+
+    # Bits per character on the held-out split, converted from per-token perplexity
+    nats_per_token = math.log(perplexity(generator, X_val, y_val))
+    val_chars = len(generator.codec.decode(y_val))
+    bits_per_char = nats_per_token * len(y_val) / val_chars / math.log(2)
+
+    generator.generate_text(SEED_TEXT, length=1)
+    start = time.perf_counter()
+    generator.generate_text(SEED_TEXT, length=1)
+    time_to_first_token = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generator.generate_text(SEED_TEXT, length=case['generate_length'])
+    generation_time = time.perf_counter() - start
+
+    result = dict(case)
+    result.update({
+        'corpus_chars': len(text),
+        'vocab_size': generator.vocab_size,
+        'train_sequences': len(X_train),
+        'bits_per_char': bits_per_char,
+        'first_epoch_seconds': epoch_times[0],
+        'train_samples_per_sec': len(X_train) / steady_epoch_time,
+        'generation_tokens_per_sec': case['generate_length'] / generation_time,
+        'time_to_first_token_ms': time_to_first_token * 1000,
+        'peak_rss_mb': _peak_rss_bytes() / 2 ** 20,
+        'tensorflow_version': tf.__version__
+    })
+    return result
+
+
+def benchmark_matrix(corpora, sequence_lengths, lstm_units, batch_sizes, **common):
+    """Build one benchmark case per combination of the matrix parameters."""
+    return [
+        dict(common, corpus=corpus, sequence_length=seq_len, lstm_units=units, batch_size=batch)
+        for corpus, seq_len, units, batch in itertools.product(corpora, sequence_lengths, lstm_units, batch_sizes)
+    ]
+
+
+def _git_commit():
+    """Return the current git commit hash, if available."""
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(cases, output_path='benchmarks/results.json'):
+    """
+    Run benchmark cases one at a time, each in its own process.
+
+    A fresh process per case keeps peak RSS and timings independent of the
+    cases that ran before it. Results are written as JSON.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for i, case in enumerate(cases):
+        print(f"Benchmark {i + 1}/{len(cases)}: {case}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, case).result()
+        results.append(result)
+        print(f"  bpc={result['bits_per_char']:.3f} "
+              f"train={result['train_samples_per_sec']:.0f} samples/s "
+              f"gen={result['generation_tokens_per_sec']:.1f} tokens/s "
+              f"ttft={result['time_to_first_token_ms']:.1f}ms "
+              f"rss={result['peak_rss_mb']:.0f}MB")
+
+    report = {
+        'metadata': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': _git_commit(),
+            'python_version': platform.python_version(),
+            'numpy_version': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'results': results
+    }
+
+    directory = os.path.dirname(output_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to {output_path}")
+
+    return report
+
+
+def compare_reports(baseline_path, report):
+    """Print per-case changes against a previous benchmark report."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    # Cases match on workload shape, so runs with different training modes can be compared
+    keys = ('corpus', 'tokenizer', 'sequence_length', 'lstm_units', 'batch_size')
+    baseline_results = {tuple(r[k] for k in keys): r for r in baseline['results']}
+    metrics = ('bits_per_char', 'train_samples_per_sec', 'generation_tokens_per_sec',
+               'time_to_first_token_ms', 'peak_rss_mb')
+
+    print(f"\nComparison with {baseline_path}:")
+    for result in report['results']:
+        previous = baseline_results.get(tuple(result[k] for k in keys))
+        if previous is None:
+            continue
+        changes = ', '.join(f"{metric} {result[metric] / previous[metric] - 1:+.1%}"
+                            for metric in metrics if previous.get(metric))
+        print(f"  {dict(zip(keys, (result[k] for k in keys)))}: {changes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text generation quality and speed")
+    parser.add_argument('--corpora', nargs='+', default=['sample', 'synthetic'], choices=['sample', 'synthetic'])
+    parser.add_argument('--synthetic-size', type=int, default=200000, help="Synthetic corpus size in characters")
+    parser.add_argument('--sequence-lengths', nargs='+', type=int, default=[40])
+    parser.add_argument('--lstm-units', nargs='+', type=int, default=[64, 128])
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[64, 256])
+    parser.add_argument('--embedding-dim', type=int, default=50)
+    parser.add_argument('--tokenizer', default='char', choices=['char', 'bpe'])
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--jit-compile', action='store_true', help="Compile training steps with XLA")
+    parser.add_argument('--steps-per-execution', type=int, default=1)
+    parser.add_argument('--intra-op-threads', type=int, default=None)
+    parser.add_argument('--inter-op-threads', type=int, default=None)
+    parser.add_argument('--generate-length', type=int, default=100)
+    parser.add_argument('--output', default='benchmarks/results.json')
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    cases = benchmark_matrix(
+        args.corpora, args.sequence_lengths, args.lstm_units, args.batch_sizes,
+        embedding_dim=args.embedding_dim, tokenizer=args.tokenizer, epochs=args.epochs,
+        generate_length=args.generate_length, synthetic_size=args.synthetic_size,
+        jit_compile=args.jit_compile, steps_per_execution=args.steps_per_execution,
+        intra_op_threads=args.intra_op_threads, inter_op_threads=args.inter_op_threads
+    )
+    report = run_benchmarks(cases, args.output)
+
+    if args.compare:
+        compare_reports(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import heapq
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from char_codec import CharCodec
+
+# Splits text into words, punctuation runs and whitespace runs. Merges never
+# cross these boundaries, and joining the pieces gives back the original text.
+PRETOKENIZE_PATTERN = re.compile(r" ?\w+| ?[^\s\w]+|\s+(?!\S)|\s+")
+
+
+class BPETokenizer:
+    """
+    Byte-pair-encoding tokenizer built on top of a character codec.
+
+    Ids below ``base.size`` are the characters of the base ``CharCodec``;
+    every learned merge adds one id after them. Generating one subword token
+    per model step instead of one character cuts the number of forward passes
+    per generated word.
+    """
+
+    def __init__(self, base=None, merges=None):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            base (CharCodec): Character codec for the initial alphabet
+            merges (list): Learned ``(left_id, right_id)`` pairs in merge order
+        """
+        self.base = base
+        self.merges = [tuple(pair) for pair in merges or []]
+        self._cache = {}
+        if base is not None:
+            self._build_tables()
+
+    def _build_tables(self):
+        """Build merge ranks and the id -> string table."""
+        self.size = self.base.size + len(self.merges)
+        self.dtype = np.uint16 if self.size <= np.iinfo(np.uint16).max + 1 else np.int32
+        self._ranks = {pair: self.base.size + rank for rank, pair in enumerate(self.merges)}
+
+        tokens = list(self.base.chars)
+        if self.base.reserved_unknown:
+            tokens.append(self.base.unknown_char)
+        for left, right in self.merges:
+            tokens.append(tokens[left] + tokens[right])
+        self.tokens = tokens
+        self._cache = {}
+
+    def train(self, text, vocab_size=512, min_frequency=2):
+        """
+        Learn merges from a text.
+
+        Args:
+            text (str): Training corpus
+            vocab_size (int): Target vocabulary size including base characters
+            min_frequency (int): Stop when the best pair occurs less often
+
+        Returns:
+            BPETokenizer: The trained tokenizer
+        """
+        self.base = CharCodec.from_text(text)
+        word_counts = Counter(PRETOKENIZE_PATTERN.findall(text))
+        words = [self.base.encode(word).tolist() for word in word_counts]
+        counts = list(word_counts.values())
+
+        # Pair frequencies and the words each pair occurs in
+        pair_counts = Counter()
+        where = defaultdict(set)
+        for word_idx, ids in enumerate(words):
+            for pair in zip(ids, ids[1:]):
+                pair_counts[pair] += counts[word_idx]
+                where[pair].add(word_idx)
+
+        # Max-heap of candidate pairs; stale entries are skipped when popped
+        heap = [(-count, pair) for pair, count in pair_counts.items()]
+        heapq.heapify(heap)
+
+        merges = []
+        while self.base.size + len(merges) < vocab_size and heap:
+            neg_count, pair = heapq.heappop(heap)
+            if pair_counts.get(pair, 0) != -neg_count:
+                continue
+            if -neg_count < min_frequency:
+                break
+
+            new_id = self.base.size + len(merges)
+            merges.append(pair)
+
+            # Re-count pairs only in the words containing the merged pair
+            changed = set()
+            for word_idx in where.pop(pair):
+                ids = words[word_idx]
+                count = counts[word_idx]
+                for old_pair in zip(ids, ids[1:]):
+                    pair_counts[old_pair] -= count
+                    changed.add(old_pair)
+                ids = self._merge_pair(ids, pair, new_id)
+                for new_pair in zip(ids, ids[1:]):
+                    pair_counts[new_pair] += count
+                    where[new_pair].add(word_idx)
+                    changed.add(new_pair)
+                words[word_idx] = ids
+
+            for changed_pair in changed:
+                count = pair_counts[changed_pair]
+                if count > 0:
+                    heapq.heappush(heap, (-count, changed_pair))
+                else:
+                    del pair_counts[changed_pair]
+
+        self.merges = merges
+        self._build_tables()
+        print(f"Learned {len(merges)} merges (vocabulary size {self.size})")
+        return self
+
+    @staticmethod
+    def _merge_pair(ids, pair, new_id):
+        """Replace every occurrence of a pair in an id list."""
+        merged = []
+        i = 0
+        while i < len(ids):
+            if i < len(ids) - 1 and ids[i] == pair[0] and ids[i + 1] == pair[1]:
+                merged.append(new_id)
+                i += 2
+            else:
+                merged.append(ids[i])
+                i += 1
+        return merged
+
+    def _encode_word(self, word):
+        """Apply learned merges to a single pre-token."""
+        ids = self._cache.get(word)
+        if ids is not None:
+            return ids
+
+        ids = self.base.encode(word).tolist()
+        while len(ids) > 1:
+            # Apply the earliest learned merge present in the word
+            candidates = [(self._ranks[pair], pair) for pair in zip(ids, ids[1:])
+                          if pair in self._ranks]
+            if not candidates:
+                break
+            new_id, pair = min(candidates)
+            ids = self._merge_pair(ids, pair, new_id)
+
+        self._cache[word] = ids
+        return ids
+
+    def encode(self, text):
+        """Encode a string into a 1-D array of token ids."""
+        ids = []
+        for word in PRETOKENIZE_PATTERN.findall(text):
+            ids.extend(self._encode_word(word))
+        return np.array(ids, dtype=self.dtype)
+
+    def decode(self, ids):
+        """Decode a sequence of token ids back into a string."""
+        tokens = self.tokens
+        return ''.join(tokens[idx] for idx in np.asarray(ids).tolist())
+
+    def get_mappings(self):
+        """Return token to id and id to token mappings."""
+        token_to_idx = {}
+        for idx, token in enumerate(self.tokens):
+            token_to_idx.setdefault(token, idx)
+        idx_to_token = dict(enumerate(self.tokens))
+        return token_to_idx, idx_to_token
+
+    def get_config(self):
+        """Return a serializable description of the tokenizer."""
+        return {
+            'type': 'bpe',
+            'base': self.base.get_config(),
+            'merges': [list(pair) for pair in self.merges]
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        """Recreate a tokenizer from ``get_config`` output."""
+        return cls(CharCodec.from_config(config['base']), config['merges'])
+
+
+def codec_from_config(config):
+    """Recreate a character codec or BPE tokenizer from its saved config."""
+    if config.get('type', 'char') == 'bpe':
+        return BPETokenizer.from_config(config)
+    return CharCodec.from_config(config)
@@ -0,0 +1,128 @@
+import numpy as np
+
+# Number of characters converted per NumPy pass. Bounds the temporary
+# UTF-32 buffer so very large corpora can be encoded without doubling memory.
+ENCODE_CHUNK_SIZE = 1 << 24
+
+
+def _codepoints(text):
+    """Return the Unicode codepoints of a string as a uint32 array."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+
+def _iter_codepoint_chunks(text, chunk_size=ENCODE_CHUNK_SIZE):
+    """Yield codepoint arrays for consecutive slices of a string."""
+    for start in range(0, len(text), chunk_size):
+        yield _codepoints(text[start:start + chunk_size])
+
+
+class CharCodec:
+    """
+    Character-level codec backed by NumPy lookup tables.
+
+    Encodes and decodes whole strings in a few vectorized passes instead of
+    one dictionary lookup per character. Characters outside the vocabulary
+    map to ``unknown_id`` instead of raising ``KeyError``.
+    """
+
+    def __init__(self, chars, unknown_id=None, unknown_char='�'):
+        """
+        Initialize the codec.
+
+        Args:
+            chars (str or list): Vocabulary characters, index order is id order
+            unknown_id (int): Id for out-of-vocabulary characters. If None, a
+                new id is reserved after the last character.
+            unknown_char (str): Character emitted when decoding the reserved id
+        """
+        self.chars = ''.join(chars)
+        self.reserved_unknown = unknown_id is None
+        self.unknown_id = len(self.chars) if unknown_id is None else int(unknown_id)
+        self.unknown_char = unknown_char
+        self.size = len(self.chars) + (1 if self.reserved_unknown else 0)
+
+        if self.size <= np.iinfo(np.uint8).max + 1:
+            self.dtype = np.uint8
+        elif self.size <= np.iinfo(np.uint16).max + 1:
+            self.dtype = np.uint16
+        else:
+            self.dtype = np.int32
+
+        # id -> codepoint table used for decoding
+        decode_chars = self.chars + (unknown_char if self.reserved_unknown else '')
+        self._decode_table = _codepoints(decode_chars).copy()
+
+        # codepoint -> id table used for encoding, sized to the largest codepoint
+        char_codepoints = _codepoints(self.chars)
+        table_size = int(char_codepoints.max()) + 1 if len(char_codepoints) else 1
+        self._encode_table = np.full(table_size, self.unknown_id, dtype=self.dtype)
+        self._encode_table[char_codepoints] = np.arange(len(self.chars), dtype=self.dtype)
+
+    @classmethod
+    def from_text(cls, text, **kwargs):
+        """Build a codec from the sorted set of characters in a text."""
+        counts = np.zeros(1, dtype=np.int64)
+        for codepoints in _iter_codepoint_chunks(text):
+            chunk_counts = np.bincount(codepoints)
+            if len(chunk_counts) > len(counts):
+                chunk_counts[:len(counts)] += counts
+                counts = chunk_counts
+            else:
+                counts[:len(chunk_counts)] += chunk_counts
+        present = np.flatnonzero(counts).astype('<u4')
+        chars = present.tobytes().decode('utf-32-le')
+        return cls(chars, **kwargs)
+
+    @classmethod
+    def from_mappings(cls, idx_to_char):
+        """
+        Build a codec from a legacy ``idx_to_char`` mapping.
+
+        Models saved before the codec existed have no reserved unknown id, so
+        unknown characters fall back to the space character (or id 0).
+        """
+        chars = ''.join(idx_to_char[idx] for idx in range(len(idx_to_char)))
+        unknown_id = chars.index(' ') if ' ' in chars else 0
+        return cls(chars, unknown_id=unknown_id)
+
+    def encode(self, text):
+        """Encode a string into a 1-D array of ids."""
+        ids = np.empty(len(text), dtype=self.dtype)
+        table = self._encode_table
+        last = len(table) - 1
+        pos = 0
+        for codepoints in _iter_codepoint_chunks(text):
+            chunk = table[np.minimum(codepoints, last)]
+            chunk[codepoints > last] = self.unknown_id
+            ids[pos:pos + len(chunk)] = chunk
+            pos += len(chunk)
+        return ids
+
+    def decode(self, ids):
+        """Decode a sequence of ids back into a string."""
+        ids = np.asarray(ids, dtype=np.int64)
+        return self._decode_table[ids].astype('<u4').tobytes().decode('utf-32-le')
+
+    def get_mappings(self):
+        """Return dictionary mappings equivalent to the lookup tables."""
+        char_to_idx = {char: idx for idx, char in enumerate(self.chars)}
+        idx_to_char = {idx: char for idx, char in enumerate(self.chars)}
+        if self.reserved_unknown:
+            idx_to_char[self.unknown_id] = self.unknown_char
+        return char_to_idx, idx_to_char
+
+    def get_config(self):
+        """Return a serializable description of the codec."""
+        return {
+            'type': 'char',
+            'chars': self.chars,
+            'unknown_id': None if self.reserved_unknown else self.unknown_id,
+            'unknown_char': self.unknown_char
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        """Recreate a codec from ``get_config`` output."""
+        return cls(config['chars'],
+                   unknown_id=config.get('unknown_id'),
+                   unknown_char=config.get('unknown_char', '�'))
@@ -0,0 +1,314 @@
+import os
+import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tensorflow as tf
+
+CHECKPOINT_PATTERN = re.compile(r'ckpt-(\d+)(?:-(\d+))?\.npz$')
+
+
+class CheckpointManager:
+    """
+    Writes training checkpoints in a background thread and keeps the last K.
+
+    Each checkpoint is a single ``.npz`` file with model weights, optimizer
+    state (including its step counter), the completed epoch, the number of
+    batches already trained in the next epoch, the NumPy, Python and
+    TensorFlow RNG states and any extra scalars such as the data shuffle
+    seed. Files are written to a temporary name and renamed, so a crash
+    mid-write never leaves a truncated checkpoint behind.
+    """
+
+    def __init__(self, directory='models/checkpoints', keep=3):
+        """
+        Initialize the manager.
+
+        Args:
+            directory (str): Directory holding the checkpoint files
+            keep (int): Number of most recent checkpoints to retain (at least 1)
+        """
+        if keep < 1:
+            raise ValueError("keep must be at least 1.")
+        self.directory = directory
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+        self._lock = threading.Lock()
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def checkpoints(self):
+        """Return existing checkpoint paths sorted from oldest to newest."""
+        found = []
+        for name in os.listdir(self.directory):
+            match = CHECKPOINT_PATTERN.match(name)
+            if match:
+                found.append((int(match.group(1)), int(match.group(2) or 0),
+                              os.path.join(self.directory, name)))
+        return [path for _, _, path in sorted(found)]
+
+    def latest(self):
+        """Return the newest checkpoint path, or None."""
+        checkpoints = self.checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    def save(self, model, epoch, step=0, **extra):
+        """
+        Snapshot training state and write it asynchronously.
+
+        The snapshot is taken on the calling thread so training can continue
+        while the previous state is written. At most one write is in flight;
+        a new save waits for the previous one to finish. ``step`` is the
+        number of batches of epoch ``epoch + 1`` already trained, for saves
+        in the middle of an epoch. Keyword arguments are stored as extra
+        scalars and returned by ``restore``.
+        """
+        arrays = snapshot_training_state(model, epoch, extra)
+        arrays['step'] = np.array(step)
+        name = f'ckpt-{epoch:05d}-{step:06d}.npz' if step else f'ckpt-{epoch:05d}.npz'
+        path = os.path.join(self.directory, name)
+
+        with self._lock:
+            if self._pending is not None:
+                self._pending.result()
+            self._pending = self._executor.submit(self._write, path, arrays)
+
+    def _write(self, path, arrays):
+        """Write a checkpoint atomically and prune old ones."""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+        for old_path in self.checkpoints()[:-self.keep]:
+            os.remove(old_path)
+
+    def wait(self):
+        """Block until the pending write has finished."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.result()
+                self._pending = None
+
+    def restore(self, model, path=None):
+        """
+        Restore training state from a checkpoint.
+
+        Args:
+            model: Compiled Keras model to restore into
+            path (str): Checkpoint to load (default: the latest)
+
+        Returns:
+            tuple: Number of completed epochs (0 if there was no checkpoint),
+                batches already trained in the next epoch and the dict of
+                extra scalars passed to ``save``
+        """
+        path = path or self.latest()
+        if path is None:
+            return 0, 0, {}
+
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        epoch = restore_training_state(model, arrays)
+        step = int(arrays['step']) if 'step' in arrays else 0
+        extra = {name[len('extra_'):]: arrays[name].item() for name in arrays if name.startswith('extra_')}
+        print(f"Resumed from {path} after epoch {epoch}" + (f", step {step}" if step else ""))
+        return epoch, step, extra
+
+
+def snapshot_training_state(model, epoch, extra=None):
+    """Copy model, optimizer and RNG state into a dict of NumPy arrays."""
+    arrays = {'epoch': np.array(epoch)}
+    for name, value in (extra or {}).items():
+        arrays[f'extra_{name}'] = np.array(value)
+
+    for i, weight in enumerate(model.get_weights()):
+        arrays[f'weight_{i:04d}'] = weight
+
+    optimizer = model.optimizer
+    for i, variable in enumerate(optimizer.variables):
+        arrays[f'optimizer_{i:04d}'] = variable.numpy()
+
+    np_state = np.random.get_state()
+    arrays['np_rng_keys'] = np_state[1]
+    arrays['np_rng_pos'] = np.array([np_state[2], np_state[3]])
+    arrays['np_rng_gauss'] = np.array(np_state[4])
+
+    py_version, py_state, py_gauss = random.getstate()
+    arrays['py_rng_state'] = np.array(py_state, dtype=np.uint64)
+    arrays['py_rng_meta'] = np.array([py_version, py_gauss is not None, py_gauss or 0.0], dtype=np.float64)
+
+    arrays['tf_rng_state'] = tf.random.get_global_generator().state.numpy()
+    return arrays
+
+
+def _sorted_arrays(arrays, prefix):
+    """Return arrays whose names start with a prefix, in index order."""
+    return [arrays[name] for name in sorted(arrays) if name.startswith(prefix)]
+
+
+def restore_training_state(model, arrays):
+    """Apply a snapshot from ``snapshot_training_state`` to a model."""
+    model.set_weights(_sorted_arrays(arrays, 'weight_'))
+
+    # Optimizer slots are created lazily, so build them before assigning
+    optimizer = model.optimizer
+    optimizer.build(model.trainable_variables)
+    for variable, value in zip(optimizer.variables, _sorted_arrays(arrays, 'optimizer_')):
+        variable.assign(value)
+
+    pos, has_gauss = arrays['np_rng_pos']
+    np.random.set_state(('MT19937', arrays['np_rng_keys'], int(pos), int(has_gauss),
+                         float(arrays['np_rng_gauss'])))
+
+    py_version, has_gauss, py_gauss = arrays['py_rng_meta']
+    random.setstate((int(py_version), tuple(int(x) for x in arrays['py_rng_state']),
+                     float(py_gauss) if has_gauss else None))
+
+    tf.random.get_global_generator().reset(arrays['tf_rng_state'])
+    return int(arrays['epoch'])
+
+
+def shuffled_epochs(X, y, batch_size, seed, initial_epoch, epochs, initial_step=0):
+    """
+    Dataset of training batches for epochs ``initial_epoch`` to ``epochs - 1``.
+
+    Epoch ``e`` is shuffled with the stateless seed ``(seed, e)``, so a run
+    resumed at any epoch sees the same batches as an uninterrupted run with
+    the same seed. The first ``initial_step`` batches of ``initial_epoch``
+    are skipped, to resume from a checkpoint saved in the middle of it.
+    Pass ``steps_per_epoch=ceil(len(X) / batch_size)`` to fit.
+
+    Only the shuffled indices live in TensorFlow; batches are gathered from
+    the NumPy arrays, so the dataset is never copied into a tensor.
+    """
+    n = len(X)
+
+    def epoch_batches(epoch):
+        order = tf.random.experimental.stateless_shuffle(
+            tf.range(n, dtype=tf.int64), seed=tf.stack([tf.constant(seed, tf.int64), epoch]))
+        batches = tf.data.Dataset.from_tensor_slices(order).batch(batch_size)
+        return batches.skip(tf.where(epoch == initial_epoch, tf.constant(initial_step, tf.int64), 0))
+
+    def gather(indices):
+        batch_X, batch_y = tf.numpy_function(lambda idx: (X[idx], y[idx]), [indices],
+                                             [tf.as_dtype(X.dtype), tf.as_dtype(y.dtype)])
+        batch_X.set_shape((None,) + X.shape[1:])
+        batch_y.set_shape((None,) + y.shape[1:])
+        return batch_X, batch_y
+
+    dataset = tf.data.Dataset.range(initial_epoch, epochs).flat_map(epoch_batches)
+    return dataset.map(gather).prefetch(tf.data.AUTOTUNE)
+
+
+class AsyncCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Keras callback saving a resumable checkpoint at the end of every epoch.
+
+    With ``save_every_n_steps``, a checkpoint is also saved every N batches
+    within an epoch, recording how many batches of the epoch are done.
+    ``initial_step`` is the number of batches of the first epoch that a
+    resumed run has already trained. ``extra`` scalars (e.g. the shuffle
+    seed) are stored with every checkpoint. If ``best_model`` is given, its
+    best monitored value is stored too, so a resumed run does not overwrite
+    a better saved model.
+    """
+
+    def __init__(self, manager, best_model=None, save_every_n_steps=None, initial_step=0, **extra):
+        super().__init__()
+        self.manager = manager
+        self.best_model = best_model
+        self.save_every_n_steps = save_every_n_steps
+        self.initial_step = initial_step
+        self.extra = extra
+        self._epoch = 0
+        self._last_saved_step = 0
+
+    def _extra(self):
+        extra = dict(self.extra)
+        if self.best_model is not None and self.best_model.best is not None:
+            extra['best_value'] = self.best_model.best
+        return extra
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = epoch
+        self._last_saved_step = self.initial_step
+
+    def on_train_batch_end(self, batch, logs=None):
+        # The end of the epoch is saved by on_epoch_end
+        if not self.save_every_n_steps or batch + 1 >= self.params['steps']:
+            return
+        step = self.initial_step + batch + 1
+        if step - self._last_saved_step >= self.save_every_n_steps:
+            self.manager.save(self.model, self._epoch, step, **self._extra())
+            self._last_saved_step = step
+
+    def on_epoch_end(self, epoch, logs=None):
+        # Keras epochs are zero-based; store the number of completed epochs
+        self.manager.save(self.model, epoch + 1, **self._extra())
+        self.initial_step = 0
+
+    def on_train_end(self, logs=None):
+        self.manager.wait()
+
+
+class AsyncModelCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Save the best model by ``monitor`` without blocking the training loop.
+
+    Replaces ``ModelCheckpoint(save_best_only=True)``. Weights are copied on
+    the training thread, then loaded into a separate copy of the model and
+    written by a worker thread. The copy is compiled with the same loss and
+    a fresh optimizer, so the file loads like before but without optimizer
+    slots; resumable optimizer state lives in the ``CheckpointManager`` files.
+    """
+
+    def __init__(self, filepath, monitor='val_loss', mode='min', best=None):
+        super().__init__()
+        self.filepath = filepath
+        self.monitor = monitor
+        self.mode = mode
+        self.best = best
+        self._copy = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+
+    def _improved(self, value):
+        if self.best is None:
+            return True
+        return value < self.best if self.mode == 'min' else value > self.best
+
+    def on_train_begin(self, logs=None):
+        if self._copy is None:
+            self._copy = tf.keras.models.clone_model(self.model)
+            optimizer = self.model.optimizer
+            self._copy.compile(optimizer=type(optimizer).from_config(optimizer.get_config()),
+                               loss=self.model.loss)
+
+    def on_epoch_end(self, epoch, logs=None):
+        value = (logs or {}).get(self.monitor)
+        if value is None or not self._improved(value):
+            return
+        self.best = float(value)
+        weights = self.model.get_weights()
+
+        if self._pending is not None:
+            self._pending.result()
+        self._pending = self._executor.submit(self._write, weights)
+
+    def _write(self, weights):
+        """Write the model atomically, keeping the file extension for the format."""
+        self._copy.set_weights(weights)
+        root, ext = os.path.splitext(self.filepath)
+        tmp_path = f'{root}.tmp{ext}'
+        self._copy.save(tmp_path)
+        os.replace(tmp_path, self.filepath)
+
+    def on_train_end(self, logs=None):
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
@@ -0,0 +1,195 @@
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from bpe_tokenizer import codec_from_config
+
+
+def corpus_key(text, codec):
+    """Hash a corpus together with the codec used to encode it."""
+    digest = hashlib.sha256(text.encode('utf-8'))
+    digest.update(json.dumps(codec.get_config(), sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def prepare_datasets(text, codec, sequence_lengths, cache_dir='experiments/cache'):
+    """
+    Encode a corpus once and cache its windowed datasets on disk.
+
+    Arrays are stored as ``.npy`` files keyed by the corpus hash, so repeated
+    sweeps skip encoding entirely and worker processes can memory-map them.
+
+    Args:
+        text (str): Training corpus
+        codec: CharCodec or BPETokenizer used for encoding
+        sequence_lengths (iterable): Window lengths to build datasets for
+        cache_dir (str): Directory for the cached arrays
+
+    Returns:
+        dict: Maps each sequence length to its ``(X_path, y_path)``
+    """
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+
+    key = corpus_key(text, codec)
+    encoded_path = os.path.join(cache_dir, f'{key}_encoded.npy')
+    if not os.path.exists(encoded_path):
+        np.save(encoded_path, codec.encode(text))
+        print(f"Encoded corpus cached to {encoded_path}")
+    encoded = np.load(encoded_path, mmap_mode='r')
+
+    dataset_paths = {}
+    for sequence_length in sorted(set(sequence_lengths)):
+        X_path = os.path.join(cache_dir, f'{key}_seq{sequence_length}_X.npy')
+        y_path = os.path.join(cache_dir, f'{key}_seq{sequence_length}_y.npy')
+        if not (os.path.exists(X_path) and os.path.exists(y_path)):
+            windows = np.lib.stride_tricks.sliding_window_view(encoded, sequence_length)
+            np.save(X_path, windows[:-1])
+            np.save(y_path, encoded[sequence_length:])
+            print(f"Cached {len(windows) - 1} sequences of length {sequence_length}")
+        dataset_paths[sequence_length] = (X_path, y_path)
+
+    return dataset_paths
+
+
+def _init_worker(threads_per_worker):
+    """Limit each worker process to its share of the CPU cores."""
+    os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+    from text_generation import configure_threads
+    configure_threads(threads_per_worker, 1)
+
+
+def _run_experiment(exp_name, params, dataset_paths, codec_config, output_dir,
+                    epochs, batch_size, validation_split, seed_text):
+    """Train and evaluate one configuration inside a worker process."""
+    from text_generation import TextGenerator
+
+    generator = TextGenerator(sequence_length=params['sequence_length'],
+                              tokenizer=codec_config.get('type', 'char'))
+    generator.set_codec(codec_from_config(codec_config))
+
+    X_path, y_path = dataset_paths
+    X = np.load(X_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+
+    generator.create_model(embedding_dim=params['embedding_dim'], lstm_units=params['lstm_units'])
+
+    exp_dir = os.path.join(output_dir, exp_name)
+    start_time = time.time()
+    history = generator.train(
+        X, y,
+        epochs=epochs,
+        batch_size=batch_size,
+        validation_split=validation_split,
+        checkpoint_path=os.path.join(exp_dir, 'checkpoint.h5')
+    )
+    train_time = time.time() - start_time
+
+    model_path = os.path.join(exp_dir, 'model.h5')
+    mappings_path = os.path.join(exp_dir, 'char_mappings.npy')
+    generator.save_model(model_path, mappings_path)
+
+    sample_text = generator.generate_text(seed_text, length=100, temperature=0.5)
+
+    # Convert metrics to plain floats so results can be pickled and saved as JSON
+    history_dict = {name: [float(value) for value in values] for name, values in history.history.items()}
+
+    return {
+        'name': exp_name,
+        'params': params,
+        'final_loss': history_dict['loss'][-1],
+        'final_val_loss': history_dict['val_loss'][-1],
+        'final_accuracy': history_dict['accuracy'][-1],
+        'final_val_accuracy': history_dict['val_accuracy'][-1],
+        'epochs_run': len(history_dict['loss']),
+        'train_time': train_time,
+        'model_path': model_path,
+        'mappings_path': mappings_path,
+        'sample_text': sample_text,
+        'history': history_dict
+    }
+
+
+def write_results(results, output_dir):
+    """Write a CSV results table and a JSON file with full histories."""
+    table_path = os.path.join(output_dir, 'results.csv')
+    columns = ['name', 'sequence_length', 'embedding_dim', 'lstm_units',
+               'final_loss', 'final_val_loss', 'final_accuracy', 'final_val_accuracy',
+               'epochs_run', 'train_time', 'model_path']
+    with open(table_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for result in results:
+            row = {column: result.get(column) for column in columns}
+            row.update(result['params'])
+            writer.writerow(row)
+
+    json_path = os.path.join(output_dir, 'results.json')
+    with open(json_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Results written to {table_path} and {json_path}")
+
+
+def run_experiments(text, codec, configs, epochs=20, batch_size=64, validation_split=0.1,
+                    n_workers=None, output_dir='experiments', seed_text="To be or not"):
+    """
+    Train hyperparameter configurations in parallel worker processes.
+
+    The corpus is encoded once and windowed datasets are cached per sequence
+    length. Each worker gets ``cpu_count // n_workers`` TensorFlow threads so
+    concurrent runs share the machine instead of oversubscribing it.
+
+    Args:
+        text (str): Training corpus
+        codec: CharCodec or BPETokenizer built from the corpus
+        configs (list): Dicts with sequence_length, embedding_dim and lstm_units
+        n_workers (int): Number of worker processes (default: one per config,
+            capped at the number of cores)
+        output_dir (str): Directory for checkpoints, models and result tables
+
+    Returns:
+        list: Result dicts in the same order as ``configs``
+    """
+    cpu_count = os.cpu_count() or 1
+    if n_workers is None:
+        n_workers = min(len(configs), cpu_count)
+    threads_per_worker = max(1, cpu_count // n_workers)
+
+    dataset_paths = prepare_datasets(
+        text, codec, [params['sequence_length'] for params in configs],
+        cache_dir=os.path.join(output_dir, 'cache')
+    )
+
+    print(f"Running {len(configs)} experiments on {n_workers} workers "
+          f"with {threads_per_worker} threads each...")
+
+    # TensorFlow is not fork-safe, so workers are started with spawn
+    context = multiprocessing.get_context('spawn')
+    results = [None] * len(configs)
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context,
+                             initializer=_init_worker, initargs=(threads_per_worker,)) as executor:
+        futures = {}
+        for i, params in enumerate(configs):
+            future = executor.submit(
+                _run_experiment, f"model_exp_{i + 1}", params,
+                dataset_paths[params['sequence_length']], codec.get_config(), output_dir,
+                epochs, batch_size, validation_split, seed_text
+            )
+            futures[future] = i
+
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            print(f"Experiment {i + 1}/{len(configs)} finished in "
+                  f"{results[i]['train_time']:.1f}s: {configs[i]} "
+                  f"val_loss={results[i]['final_val_loss']:.4f}")
+
+    write_results(results, output_dir)
+    return results
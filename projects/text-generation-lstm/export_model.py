@@ -0,0 +1,204 @@
+import argparse
+import copy
+import os
+
+import numpy as np
+
+import sampling
+
+QUANTIZATION_MODES = ('none', 'dynamic', 'float16', 'int8')
+
+
+class TFLiteTextModel:
+    """
+    Lightweight runtime for an exported TFLite text generation model.
+
+    Callable like a Keras model (``model(windows, training=False)``), so it can
+    be assigned to ``TextGenerator.model`` and used by ``generate_text``.
+    Prefers the standalone ``tflite_runtime`` package and only falls back to
+    TensorFlow when it is not installed.
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        """
+        Load an exported model.
+
+        Args:
+            model_path (str): Path to the ``.tflite`` file
+            num_threads (int): CPU threads used by the interpreter
+        """
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.model_path = model_path
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input_index = self.interpreter.get_input_details()[0]['index']
+        self._output_index = self.interpreter.get_output_details()[0]['index']
+
+    def __call__(self, windows, training=False):
+        """Run the model on int32 windows of shape (batch, sequence_length)."""
+        windows = np.asarray(windows, dtype=np.int32)
+        # The fused TFLite LSTM kernel has a fixed batch size of one
+        outputs = []
+        for window in windows:
+            self.interpreter.set_tensor(self._input_index, window[None, :])
+            self.interpreter.invoke()
+            outputs.append(self.interpreter.get_tensor(self._output_index)[0].copy())
+        return np.stack(outputs)
+
+
+def export_tflite(model, sequence_length, output_path, quantization='dynamic', representative_data=None):
+    """
+    Convert a Keras text generation model to a compact TFLite artifact.
+
+    Args:
+        model: Trained Keras model
+        sequence_length (int): Input window length
+        output_path (str): Destination ``.tflite`` path
+        quantization (str): 'none', 'dynamic' (int8 weights), 'float16' or
+            'int8' (int8 weights and activations, calibrated on data)
+        representative_data (np.ndarray): Input windows for int8 calibration
+
+    Returns:
+        int: Size of the exported artifact in bytes
+    """
+    import tensorflow as tf
+
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {quantization}")
+    if quantization == 'int8' and representative_data is None:
+        raise ValueError("int8 quantization requires representative_data.")
+
+    @tf.function(input_signature=[tf.TensorSpec([1, sequence_length], tf.int32)])
+    def serve(windows):
+        return model(windows, training=False)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([serve.get_concrete_function()], model)
+    if quantization != 'none':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        def representative_dataset():
+            for window in representative_data[:200]:
+                yield [np.asarray(window, dtype=np.int32)[None, :]]
+        converter.representative_dataset = representative_dataset
+
+    tflite_model = converter.convert()
+
+    directory = os.path.dirname(output_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+
+    print(f"Exported {quantization} model to {output_path} ({len(tflite_model) / 1024:.1f} KB)")
+    return len(tflite_model)
+
+
+def holdout_split(X, y, fraction=0.1):
+    """Return the last ``fraction`` of the sequences, like Keras validation_split."""
+    split = int(len(X) * (1 - fraction))
+    return X[split:], y[split:]
+
+
+def perplexity(generator, X, y, batch_size=256):
+    """Compute per-token perplexity of a generator's model on held-out data."""
+    total_nll = 0.0
+    for start in range(0, len(X), batch_size):
+        windows = np.asarray(X[start:start + batch_size], dtype=np.int32)
+        targets = np.asarray(y[start:start + batch_size], dtype=np.int64)
+        log_probs = sampling.log_softmax(generator.next_token_logits(windows))
+        total_nll -= log_probs[np.arange(len(targets)), targets].sum()
+    return float(np.exp(total_nll / len(X)))
+
+
+def load_quantized_generator(model_path, mappings_path, num_threads=None):
+    """Create a TextGenerator that runs an exported TFLite model."""
+    from text_generation import TextGenerator
+
+    generator = TextGenerator()
+    generator.load_mappings(mappings_path)
+    generator.model = TFLiteTextModel(model_path, num_threads=num_threads)
+    print(f"Quantized model loaded from {model_path}")
+    return generator
+
+
+def export_quantized(generator, X_val, y_val, output_path='models/text_gen_model.tflite',
+                     mappings_path='models/char_mappings.npy', quantization='dynamic', tolerance=0.05):
+    """
+    Export a quantized model and check its held-out perplexity.
+
+    Args:
+        generator (TextGenerator): Generator with a trained Keras model
+        X_val, y_val (np.ndarray): Held-out sequences and next tokens
+        output_path (str): Destination ``.tflite`` path
+        mappings_path (str): Where to save the mappings used by the artifact
+        quantization (str): Quantization mode passed to ``export_tflite``
+        tolerance (float): Maximum allowed relative perplexity increase
+
+    Returns:
+        dict: Perplexities, relative change and artifact sizes
+    """
+    size = export_tflite(generator.model, generator.sequence_length, output_path,
+                         quantization=quantization, representative_data=X_val)
+    generator.save_mappings(mappings_path)
+
+    quantized = copy.copy(generator)
+    quantized.model = TFLiteTextModel(output_path)
+
+    reference_ppl = perplexity(generator, X_val, y_val)
+    quantized_ppl = perplexity(quantized, X_val, y_val)
+    relative_change = quantized_ppl / reference_ppl - 1
+
+    report = {
+        'quantization': quantization,
+        'reference_perplexity': reference_ppl,
+        'quantized_perplexity': quantized_ppl,
+        'relative_change': relative_change,
+        'reference_size_bytes': int(sum(w.nbytes for w in generator.model.get_weights())),
+        'quantized_size_bytes': size
+    }
+
+    print(f"Held-out perplexity: {reference_ppl:.4f} (float32) -> "
+          f"{quantized_ppl:.4f} ({quantization}), change {relative_change:+.2%}")
+
+    if relative_change > tolerance:
+        raise ValueError(f"Quantized perplexity increased by {relative_change:.2%}, "
+                         f"above the {tolerance:.2%} tolerance.")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a quantized text generation model")
+    parser.add_argument('--model', default='models/text_gen_model.h5', help="Trained Keras model")
+    parser.add_argument('--mappings', default='models/char_mappings.npy', help="Character mappings")
+    parser.add_argument('--text', default='data/sample_text.txt', help="Corpus for the held-out split")
+    parser.add_argument('--output', default='models/text_gen_model.tflite', help="Exported model path")
+    parser.add_argument('--output-mappings', default='models/tflite_mappings.npy',
+                        help="Mappings saved alongside the exported model")
+    parser.add_argument('--quantization', default='dynamic', choices=QUANTIZATION_MODES)
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help="Maximum relative perplexity increase")
+    args = parser.parse_args()
+
+    from text_generation import TextGenerator, load_sample_text
+
+    generator = TextGenerator()
+    generator.load_model(args.model, args.mappings)
+
+    text = load_sample_text(args.text)
+    X, y = generator.create_sequences(text)
+    X_val, y_val = holdout_split(X, y)
+
+    export_quantized(generator, X_val, y_val, args.output, args.output_mappings,
+                     quantization=args.quantization, tolerance=args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Inference-only entry point for text generation.
+
+Only NumPy is imported up front. TensorFlow is imported when a Keras model is
+loaded (TFLite models use ``tflite_runtime`` when it is installed), and
+matplotlib is never imported. Load the model once with ``InferenceSession``
+and call ``generate`` repeatedly, or run ``python generate.py --interactive``
+to keep a warm process that reads seed texts from stdin.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from text_generation import TextGenerator
+
+
+class CompiledKerasModel:
+    """Keras model wrapped in a ``tf.function`` for low per-call overhead."""
+
+    def __init__(self, model_path, num_threads=None):
+        """
+        Load a Keras model for inference.
+
+        Args:
+            model_path (str): Path to the saved ``.h5`` model
+            num_threads (int): TensorFlow intra-op threads (default: all cores)
+        """
+        import tensorflow as tf
+        from text_generation import configure_threads
+
+        if num_threads:
+            configure_threads(num_threads, 1)
+
+        # Skip restoring optimizer state and losses, inference does not need them
+        self.keras_model = tf.keras.models.load_model(model_path, compile=False)
+        self._predict = tf.function(lambda windows: self.keras_model(windows, training=False),
+                                    reduce_retracing=True)
+
+    def __call__(self, windows, training=False):
+        """Run the model on int32 windows of shape (batch, sequence_length)."""
+        return self._predict(np.asarray(windows, dtype=np.int32)).numpy()
+
+
+class InferenceSession:
+    """Load a text generation model once and serve repeated generation calls."""
+
+    def __init__(self, model_path='models/text_gen_model.h5', mappings_path='models/char_mappings.npy',
+                 num_threads=None, state_cache_bytes=None, warmup=True):
+        """
+        Load mappings and model.
+
+        Args:
+            model_path (str): ``.h5`` Keras model or ``.tflite`` exported model
+            mappings_path (str): Character mappings saved with the model
+            num_threads (int): CPU threads used for inference
+            state_cache_bytes (int): Cache LSTM states for repeated seeds within
+                this memory bound (Keras models only)
+            warmup (bool): Run one forward pass so the first request is fast
+        """
+        self.generator = TextGenerator()
+        self.generator.load_mappings(mappings_path)
+
+        if model_path.endswith('.tflite'):
+            from export_model import TFLiteTextModel
+            self.generator.model = TFLiteTextModel(model_path, num_threads=num_threads)
+        else:
+            self.generator.model = CompiledKerasModel(model_path, num_threads=num_threads)
+
+        if state_cache_bytes:
+            self.generator.enable_state_cache(state_cache_bytes)
+
+        if warmup:
+            self.generate('', length=1)
+
+    def generate(self, seed_text, length=200, temperature=1.0, top_k=0, top_p=1.0, beam_width=0):
+        """Generate text from a seed; see ``TextGenerator.generate_text``."""
+        return self.generator.generate_text(
+            seed_text, length=length, temperature=temperature,
+            top_k=top_k, top_p=top_p, beam_width=beam_width
+        )
+
+
+def main():
+    start_time = time.time()
+
+    parser = argparse.ArgumentParser(description="Generate text with a trained LSTM model")
+    parser.add_argument('--model', default='models/text_gen_model.h5', help=".h5 or .tflite model")
+    parser.add_argument('--mappings', default='models/char_mappings.npy', help="Character mappings")
+    parser.add_argument('--seed', default="To be or not to ", help="Seed text")
+    parser.add_argument('--length', type=int, default=200, help="Number of tokens to generate")
+    parser.add_argument('--temperature', type=float, default=0.5)
+    parser.add_argument('--top-k', type=int, default=0)
+    parser.add_argument('--top-p', type=float, default=1.0)
+    parser.add_argument('--beam-width', type=int, default=0)
+    parser.add_argument('--threads', type=int, default=None, help="CPU threads for inference")
+    parser.add_argument('--state-cache-mb', type=float, default=0,
+                        help="Cache LSTM states for repeated seeds (Keras models only)")
+    parser.add_argument('--interactive', action='store_true',
+                        help="Read one seed per line from stdin until EOF or an empty line")
+    args = parser.parse_args()
+
+    session = InferenceSession(args.model, args.mappings, num_threads=args.threads,
+                               state_cache_bytes=int(args.state_cache_mb * 2 ** 20))
+    print(f"Model ready in {time.time() - start_time:.2f}s", file=sys.stderr)
+
+    options = dict(length=args.length, temperature=args.temperature,
+                   top_k=args.top_k, top_p=args.top_p, beam_width=args.beam_width)
+
+    if not args.interactive:
+        print(session.generate(args.seed, **options))
+        return
+
+    for line in sys.stdin:
+        seed_text = line.rstrip('\n')
+        if not seed_text:
+            break
+        print(session.generate(seed_text, **options), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import numpy as np
+
+# Added to probabilities before taking the log, matching the original
+# temperature code path for models that end in a softmax layer.
+PROBABILITY_EPSILON = 1e-8
+
+
+def log_softmax(logits):
+    """Numerically stable log-softmax over the last axis."""
+    logits = np.asarray(logits, dtype=np.float64)
+    shifted = logits - np.max(logits, axis=-1, keepdims=True)
+    return shifted - np.log(np.sum(np.exp(shifted), axis=-1, keepdims=True))
+
+
+def softmax(logits):
+    """Numerically stable softmax over the last axis."""
+    return np.exp(log_softmax(logits))
+
+
+def probabilities_to_logits(probabilities):
+    """Convert softmax outputs into logits usable by the samplers."""
+    return np.log(np.asarray(probabilities, dtype=np.float64) + PROBABILITY_EPSILON)
+
+
+def greedy(logits):
+    """Pick the highest scoring id for every row of ``(batch, vocab)`` logits."""
+    return np.argmax(logits, axis=-1)
+
+
+def filter_top_k(logits, k):
+    """Keep the ``k`` largest logits per row and mask the rest with ``-inf``."""
+    logits = np.asarray(logits, dtype=np.float64)
+    if k <= 0 or k >= logits.shape[-1]:
+        return logits
+    threshold = np.partition(logits, -k, axis=-1)[..., -k, None]
+    return np.where(logits < threshold, -np.inf, logits)
+
+
+def filter_top_p(logits, p):
+    """
+    Nucleus filtering: keep the smallest set of ids whose probability mass
+    reaches ``p`` per row and mask the rest with ``-inf``.
+    """
+    logits = np.asarray(logits, dtype=np.float64)
+    if p >= 1.0:
+        return logits
+    order = np.argsort(-logits, axis=-1)
+    sorted_logits = np.take_along_axis(logits, order, axis=-1)
+    sorted_probs = softmax(sorted_logits)
+    # Drop an id once the mass before it already reaches p; the top id always stays
+    remove = np.cumsum(sorted_probs, axis=-1) - sorted_probs >= p
+    remove[..., 0] = False
+    sorted_logits[remove] = -np.inf
+    filtered = np.empty_like(logits)
+    np.put_along_axis(filtered, order, sorted_logits, axis=-1)
+    return filtered
+
+
+def sample(logits, temperature=1.0, top_k=0, top_p=1.0, rng=None):
+    """
+    Sample one id per row of ``(batch, vocab)`` logits.
+
+    Uses the Gumbel-max trick, so no probability vector has to be normalized
+    or validated. A temperature of 0 falls back to greedy decoding.
+
+    Args:
+        logits (np.ndarray): Unnormalized scores of shape (batch, vocab)
+        temperature (float): Softmax temperature
+        top_k (int): Keep only the k most likely ids (0 disables)
+        top_p (float): Keep the smallest nucleus with this mass (1.0 disables)
+        rng: NumPy Generator or RandomState, defaults to ``np.random``
+
+    Returns:
+        np.ndarray: Sampled ids of shape (batch,)
+    """
+    logits = np.atleast_2d(logits)
+    if temperature <= 0:
+        return greedy(logits)
+
+    rng = np.random if rng is None else rng
+    scaled = np.asarray(logits, dtype=np.float64) / temperature
+    scaled = filter_top_p(filter_top_k(scaled, top_k), top_p)
+    return np.argmax(scaled + rng.gumbel(size=scaled.shape), axis=-1)
+
+
+def generate_ids(step_fn, pattern, length, temperature=1.0, top_k=0, top_p=1.0, rng=None):
+    """
+    Autoregressively sample ids from a sliding-window model.
+
+    Args:
+        step_fn: Maps int32 windows of shape (batch, window) to logits
+        pattern (np.ndarray): Seed window of shape (window,) or (batch, window)
+        length (int): Number of ids to generate
+
+    Returns:
+        np.ndarray: Generated ids of shape (batch, length)
+    """
+    windows = np.atleast_2d(np.asarray(pattern, dtype=np.int32))
+    generated = np.empty((windows.shape[0], length), dtype=np.int32)
+
+    for step in range(length):
+        next_ids = sample(step_fn(windows), temperature, top_k, top_p, rng)
+        generated[:, step] = next_ids
+        windows = np.concatenate([windows[:, 1:], next_ids[:, None].astype(np.int32)], axis=1)
+
+    return generated
+
+
+def beam_search(step_fn, pattern, length, beam_width=4):
+    """
+    Find a high-likelihood continuation with beam search.
+
+    All beams are scored in one batched ``step_fn`` call per step.
+
+    Args:
+        step_fn: Maps int32 windows of shape (batch, window) to logits
+        pattern (np.ndarray): Seed window of shape (window,)
+        length (int): Number of ids to generate
+        beam_width (int): Number of hypotheses kept per step
+
+    Returns:
+        np.ndarray: Ids of the best hypothesis, shape (length,)
+    """
+    windows = np.asarray(pattern, dtype=np.int32)[None, :]
+    sequences = np.empty((1, 0), dtype=np.int32)
+    scores = np.zeros(1)
+
+    for _ in range(length):
+        log_probs = log_softmax(step_fn(windows))
+        vocab_size = log_probs.shape[-1]
+        candidates = (scores[:, None] + log_probs).ravel()
+
+        width = min(beam_width, len(candidates))
+        best = np.argpartition(-candidates, width - 1)[:width]
+        best = best[np.argsort(-candidates[best])]
+        beam_idx, token_idx = np.divmod(best, vocab_size)
+
+        scores = candidates[best]
+        next_ids = token_idx.astype(np.int32)[:, None]
+        sequences = np.concatenate([sequences[beam_idx], next_ids], axis=1)
+        windows = np.concatenate([windows[beam_idx, 1:], next_ids], axis=1)
+
+    return sequences[0]
@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class StateCache:
+    """
+    LRU cache of LSTM states after consuming a seed, keyed by its token ids.
+
+    Entries are evicted least-recently-used first once the total size of the
+    cached arrays would exceed ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes=64 * 2 ** 20):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Memory bound for cached outputs and states
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(ids):
+        """Build a hashable key from a sequence of token ids."""
+        return np.asarray(ids, dtype=np.int32).tobytes()
+
+    def get(self, ids):
+        """Return the cached ``(output, states)`` for a seed, or None."""
+        key = self._key(ids)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, ids, output, states):
+        """Cache the model output and LSTM states after consuming a seed."""
+        key = self._key(ids)
+        size = len(key) + output.nbytes + sum(state.nbytes for state in states)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[2]
+            while self.current_bytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted[2]
+                self.evictions += 1
+            self._entries[key] = (output, states, size)
+            self.current_bytes += size
+
+    def clear(self):
+        """Drop all entries, e.g. after the model weights change."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and memory usage."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class IncrementalDecoder:
+    """
+    Step-by-step decoder sharing weights with a trained window model.
+
+    Rebuilds the Embedding/LSTM/Dense stack with ``return_state=True`` so a
+    seed is consumed once and each generated token costs a single timestep.
+    Unlike the sliding-window model, the carried state conditions on the
+    whole generated history rather than only the last ``sequence_length``
+    tokens. The first prediction after a seed is identical in both modes.
+    """
+
+    def __init__(self, model):
+        """
+        Build the step model.
+
+        Args:
+            model: Trained Keras model made of Embedding, LSTM and Dense layers
+        """
+        import tensorflow as tf
+        from tensorflow.keras import layers
+
+        if not hasattr(model, 'layers'):
+            raise ValueError("Incremental decoding requires a Keras model.")
+
+        self.model = model
+        tokens = tf.keras.Input(shape=(None,), dtype=tf.int32)
+        state_inputs = []
+        state_outputs = []
+        x = tokens
+
+        for layer in model.layers:
+            config = layer.get_config()
+            if isinstance(layer, layers.Embedding):
+                config.pop('input_length', None)
+                new_layer = layers.Embedding.from_config(config)
+                x = new_layer(x)
+            elif isinstance(layer, layers.LSTM):
+                config.update(return_sequences=True, return_state=True, stateful=False)
+                new_layer = layers.LSTM.from_config(config)
+                h = tf.keras.Input(shape=(layer.units,))
+                c = tf.keras.Input(shape=(layer.units,))
+                x, h_out, c_out = new_layer(x, initial_state=[h, c])
+                state_inputs.extend([h, c])
+                state_outputs.extend([h_out, c_out])
+            elif isinstance(layer, layers.Dense):
+                new_layer = layers.Dense.from_config(config)
+                x = new_layer(x[:, -1, :])
+            else:
+                raise ValueError(f"Unsupported layer for incremental decoding: {layer.name}")
+            new_layer.set_weights(layer.get_weights())
+
+        self.state_sizes = [int(state.shape[-1]) for state in state_inputs]
+        self.step_model = tf.keras.Model([tokens] + state_inputs, [x] + state_outputs)
+        self._run = tf.function(lambda inputs: self.step_model(inputs, training=False),
+                                reduce_retracing=True)
+
+    def _call(self, ids, states):
+        """Run the step model and return the output and new states as arrays."""
+        outputs = self._run([np.asarray(ids, dtype=np.int32)] + list(states))
+        outputs = [np.asarray(output) for output in outputs]
+        return outputs[0], outputs[1:]
+
+    def prime(self, ids):
+        """Consume a seed from zero state; returns ``(output, states)``."""
+        states = [np.zeros((1, size), dtype=np.float32) for size in self.state_sizes]
+        return self._call(np.asarray(ids)[None, :], states)
+
+    def step(self, next_ids, states):
+        """Advance by one token per row; returns ``(output, states)``."""
+        return self._call(np.asarray(next_ids)[:, None], states)
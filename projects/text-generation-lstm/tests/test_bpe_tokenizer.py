@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pytest
+
+from bpe_tokenizer import BPETokenizer, codec_from_config
+from char_codec import CharCodec
+
+CORPUS = ("the cat sat on the mat. the cat ate the rat.\n"
+          "then the rat sat on the hat, and the cat sat there.\n") * 20
+
+
+@pytest.fixture(scope='module')
+def tokenizer():
+    return BPETokenizer(CharCodec.from_text(CORPUS)).train(CORPUS, vocab_size=60)
+
+
+def test_training_learns_merges_up_to_vocab_size(tokenizer):
+    assert tokenizer.merges
+    assert tokenizer.size <= 60
+    assert tokenizer.size == tokenizer.base.size + len(tokenizer.merges)
+
+
+def test_encode_decode_round_trip(tokenizer):
+    ids = tokenizer.encode(CORPUS)
+    assert tokenizer.decode(ids) == CORPUS
+    # Merges must make the encoding shorter than one id per character
+    assert len(ids) < len(CORPUS)
+
+
+def test_round_trip_of_unseen_text(tokenizer):
+    text = "a hat ate  the theater cat\n\nrats!"
+    assert tokenizer.decode(tokenizer.encode(text)) == text.replace('!', '�')
+
+
+def test_merges_apply_only_inside_pretokens(tokenizer):
+    for word in (" the", " cat", "."):
+        ids = tokenizer.encode(word)
+        assert tokenizer.decode(ids) == word
+    assert tokenizer.encode("the cat").tolist() == (tokenizer.encode("the").tolist() +
+                                                    tokenizer.encode(" cat").tolist())
+
+
+def test_config_round_trip_through_json(tokenizer):
+    config = json.loads(json.dumps(tokenizer.get_config()))
+    restored = codec_from_config(config)
+
+    assert isinstance(restored, BPETokenizer)
+    assert restored.merges == tokenizer.merges
+    assert restored.tokens == tokenizer.tokens
+    assert np.array_equal(restored.encode(CORPUS), tokenizer.encode(CORPUS))
+    assert restored.decode(restored.encode(CORPUS)) == CORPUS
+
+
+def test_codec_from_config_defaults_to_char_codec():
+    codec = CharCodec.from_text("abc")
+    restored = codec_from_config(codec.get_config())
+    assert isinstance(restored, CharCodec)
+    assert restored.decode(restored.encode("cab")) == "cab"
@@ -0,0 +1,51 @@
+import numpy as np
+
+from char_codec import CharCodec
+
+
+def test_encode_decode_round_trip():
+    text = "To be, or not to be: that is the question.\n"
+    codec = CharCodec.from_text(text)
+
+    ids = codec.encode(text)
+    assert ids.dtype == codec.dtype
+    assert codec.decode(ids) == text
+
+
+def test_round_trip_beyond_basic_multilingual_plane():
+    text = "naïve café — 😀 ok"
+    codec = CharCodec.from_text(text)
+    assert codec.decode(codec.encode(text)) == text
+
+
+def test_unknown_characters_map_to_reserved_id():
+    codec = CharCodec.from_text("abc")
+    assert codec.reserved_unknown
+    assert codec.size == 4
+
+    ids = codec.encode("abz😀c")
+    assert ids.tolist() == [0, 1, codec.unknown_id, codec.unknown_id, 2]
+    assert codec.decode(ids) == "ab��c"
+
+
+def test_explicit_unknown_id_reuses_an_existing_character():
+    codec = CharCodec(sorted("ab "), unknown_id=0)
+    assert not codec.reserved_unknown
+    assert codec.size == 3
+    assert codec.decode(codec.encode("a?b")) == "a b"
+
+
+def test_legacy_mappings_fall_back_to_space():
+    codec = CharCodec.from_mappings({0: ' ', 1: 'a', 2: 'b'})
+    assert codec.unknown_id == 0
+    assert codec.encode("axb").tolist() == [1, 0, 2]
+
+
+def test_config_round_trip():
+    codec = CharCodec.from_text("hello world", unknown_char='?')
+    restored = CharCodec.from_config(codec.get_config())
+
+    text = "hello, world"
+    assert np.array_equal(restored.encode(text), codec.encode(text))
+    assert restored.decode(restored.encode(text)) == "hello? world"
+    assert restored.get_mappings() == codec.get_mappings()
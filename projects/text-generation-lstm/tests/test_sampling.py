@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from sampling import beam_search, filter_top_k, filter_top_p, generate_ids, sample, softmax
+
+LOGITS = np.array([[2.0, 1.0, 0.5, -1.0, 3.0],
+                   [0.0, 0.0, 0.0, 0.0, 0.0]])
+
+
+@pytest.mark.parametrize('k', [1, 2, 4])
+def test_top_k_keeps_the_k_largest_logits(k):
+    filtered = filter_top_k(LOGITS[:1], k)
+    kept = np.flatnonzero(np.isfinite(filtered[0]))
+    assert sorted(kept) == sorted(np.argsort(-LOGITS[0])[:k])
+    assert np.array_equal(filtered[0, kept], LOGITS[0, kept])
+
+
+def test_top_k_keeps_ties_instead_of_dropping_every_token():
+    filtered = filter_top_k(LOGITS[1:], 2)
+    assert np.isfinite(filtered).all()
+
+
+@pytest.mark.parametrize('k', [0, 5, 10])
+def test_top_k_disabled_or_larger_than_vocab_is_a_no_op(k):
+    assert np.array_equal(filter_top_k(LOGITS, k), LOGITS)
+
+
+@pytest.mark.parametrize('p', [1e-9, 0.1, 0.5, 0.9, 0.999])
+def test_top_p_keeps_at_least_one_token_and_reaches_the_mass(p):
+    filtered = filter_top_p(LOGITS, p)
+    for row, original in zip(filtered, LOGITS):
+        kept = np.isfinite(row)
+        assert kept.sum() >= 1
+        assert kept[np.argmax(original)]
+        assert softmax(original)[kept].sum() >= min(p, 1.0) - 1e-12
+
+
+def test_top_p_keeps_the_smallest_nucleus():
+    logits = np.log([[0.5, 0.3, 0.15, 0.05]])
+    assert np.isfinite(filter_top_p(logits, 0.5)).tolist() == [[True, False, False, False]]
+    assert np.isfinite(filter_top_p(logits, 0.7)).tolist() == [[True, True, False, False]]
+    assert np.isfinite(filter_top_p(logits, 0.85)).tolist() == [[True, True, True, False]]
+
+
+def test_sample_only_returns_unmasked_ids():
+    rng = np.random.default_rng(0)
+    batch = np.repeat(LOGITS[:1], 500, axis=0)
+    assert set(sample(batch, top_k=2, rng=rng).tolist()) <= {0, 4}
+    assert set(sample(batch, top_p=1e-9, rng=rng).tolist()) == {4}
+
+
+def test_zero_temperature_is_greedy():
+    assert sample(LOGITS[:1], temperature=0).tolist() == [4]
+
+
+def test_fixed_seed_is_deterministic():
+    first = sample(np.repeat(LOGITS, 50, axis=0), temperature=0.8, top_k=3, top_p=0.9,
+                   rng=np.random.default_rng(42))
+    second = sample(np.repeat(LOGITS, 50, axis=0), temperature=0.8, top_k=3, top_p=0.9,
+                    rng=np.random.default_rng(42))
+    assert np.array_equal(first, second)
+
+
+def _step_fn(windows):
+    # Favours the id after the last one in the window, so the expected
+    # continuation of a window ending in 1 is 2, 3, 0, 1, ...
+    logits = np.full((len(windows), 4), -2.0)
+    logits[np.arange(len(windows)), (windows[:, -1] + 1) % 4] = 2.0
+    return logits
+
+
+def test_generate_ids_with_fixed_seed_is_deterministic():
+    pattern = np.array([0, 1])
+    first = generate_ids(_step_fn, pattern, 20, top_k=2, rng=np.random.default_rng(7))
+    second = generate_ids(_step_fn, pattern, 20, top_k=2, rng=np.random.default_rng(7))
+    assert first.shape == (1, 20)
+    assert np.array_equal(first, second)
+
+
+def test_greedy_generation_and_beam_search_follow_the_model():
+    pattern = np.array([0, 1])
+    assert generate_ids(_step_fn, pattern, 6, temperature=0)[0].tolist() == [2, 3, 0, 1, 2, 3]
+    assert beam_search(_step_fn, pattern, 6, beam_width=3).tolist() == [2, 3, 0, 1, 2, 3]
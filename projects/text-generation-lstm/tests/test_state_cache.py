@@ -0,0 +1,70 @@
+import numpy as np
+
+from state_cache import StateCache
+
+
+def entry(value):
+    output = np.full(16, value, dtype=np.float32)
+    states = [np.full(32, value, dtype=np.float32), np.full(32, value, dtype=np.float32)]
+    return output, states
+
+
+# Two int32 ids in the key plus 16 + 2 * 32 float32 values
+ENTRY_BYTES = 8 + 4 * (16 + 64)
+
+
+def test_get_returns_cached_arrays_and_counts_hits():
+    cache = StateCache()
+    output, states = entry(1)
+    cache.put([1, 2], output, states)
+
+    cached_output, cached_states = cache.get([1, 2])
+    assert cached_output is output
+    assert cached_states is states
+    assert cache.get([2, 1]) is None
+    assert cache.get(np.array([1, 2], dtype=np.int64)) is not None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+    assert stats['bytes'] == ENTRY_BYTES
+
+
+def test_least_recently_used_entry_is_evicted_by_byte_budget():
+    cache = StateCache(max_bytes=2 * ENTRY_BYTES)
+    cache.put([0, 1], *entry(1))
+    cache.put([0, 2], *entry(2))
+    # Reading the first seed makes the second one the least recently used
+    assert cache.get([0, 1]) is not None
+    cache.put([0, 3], *entry(3))
+
+    assert cache.get([0, 2]) is None
+    assert cache.get([0, 1])[0][0] == 1
+    assert cache.get([0, 3])[0][0] == 3
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] == 2 * ENTRY_BYTES <= stats['max_bytes']
+
+
+def test_replacing_an_entry_does_not_count_its_size_twice():
+    cache = StateCache(max_bytes=2 * ENTRY_BYTES)
+    cache.put([0, 1], *entry(1))
+    cache.put([0, 1], *entry(5))
+
+    assert cache.stats()['bytes'] == ENTRY_BYTES
+    assert cache.get([0, 1])[0][0] == 5
+    assert cache.stats()['evictions'] == 0
+
+
+def test_entry_larger_than_budget_is_not_cached():
+    cache = StateCache(max_bytes=ENTRY_BYTES - 1)
+    cache.put([0, 1], *entry(1))
+    assert cache.get([0, 1]) is None
+    assert cache.stats()['bytes'] == 0
+
+
+def test_clear_drops_entries():
+    cache = StateCache()
+    cache.put([0, 1], *entry(1))
+    cache.clear()
+    assert cache.get([0, 1]) is None
+    assert cache.stats()['bytes'] == 0
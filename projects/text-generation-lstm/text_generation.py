@@ -1,38 +1,54 @@
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Embedding
-from tensorflow.keras.optimizers import Adam
-import matplotlib.pyplot as plt
 import os
+from char_codec import CharCodec
+from bpe_tokenizer import BPETokenizer, codec_from_config
+import sampling
+from state_cache import StateCache, IncrementalDecoder
 
 class TextGenerator:
     """
     Text Generator using LSTM neural networks
     """
     
-    def __init__(self, sequence_length=40):
+    def __init__(self, sequence_length=40, tokenizer='char', bpe_vocab_size=512):
         """
         Initialize the text generator.
         
         Args:
-            sequence_length (int): Length of input sequences
+            sequence_length (int): Length of input sequences in tokens
+            tokenizer (str): 'char' for characters or 'bpe' for subword tokens
+            bpe_vocab_size (int): Target vocabulary size for the BPE tokenizer
         """
+        if tokenizer not in ('char', 'bpe'):
+            raise ValueError(f"Unknown tokenizer: {tokenizer}")
+        
         self.sequence_length = sequence_length
+        self.tokenizer = tokenizer
+        self.bpe_vocab_size = bpe_vocab_size
         self.model = None
+        self.output_logits = False
+        self.state_cache = None
+        self._decoder = None
+        self.codec = None
         self.char_to_idx = None
         self.idx_to_char = None
         self.vocab_size = None
     
+    def set_codec(self, codec):
+        """Use a codec for encoding and decoding text."""
+        self.codec = codec
+        self.vocab_size = codec.size
+        self.char_to_idx, self.idx_to_char = codec.get_mappings()
+    
     def preprocess_text(self, text):
-        """Preprocess text and create character mappings."""
-        # Get unique characters
-        chars = sorted(list(set(text)))
-        self.vocab_size = len(chars)
-        
-        # Create character to index mappings
-        self.char_to_idx = {char: idx for idx, char in enumerate(chars)}
-        self.idx_to_char = {idx: char for idx, char in enumerate(chars)}
+        """Preprocess text and create character or subword mappings."""
+        if self.tokenizer == 'bpe':
+            self.set_codec(BPETokenizer().train(text, vocab_size=self.bpe_vocab_size))
+            chars = list(self.codec.base.chars)
+        else:
+            # Build lookup tables from the unique characters
+            self.set_codec(CharCodec.from_text(text))
+            chars = list(self.codec.chars)
         
         print(f"Vocabulary size: {self.vocab_size}")
         print(f"Characters: {''.join(chars)}")
@@ -42,37 +58,89 @@ class TextGenerator:
     def create_sequences(self, text):
         """Create input-output sequences for training."""
         # Convert text to indices
-        text_indices = [self.char_to_idx[char] for char in text]
+        text_indices = self.codec.encode(text)
+        
+        # Create sequences as sliding windows over the encoded text
+        windows = np.lib.stride_tricks.sliding_window_view(text_indices, self.sequence_length)
+        X = np.ascontiguousarray(windows[:-1])
+        y = text_indices[self.sequence_length:]
+        
+        print(f"Created {len(X)} sequences")
+        
+        return X, y
+    
+    def create_streams(self, text, batch_streams=32, bptt_length=None):
+        """
+        Split text into contiguous streams for stateful training.
         
-        # Create sequences
-        sequences = []
-        next_chars = []
+        The encoded text is cut into ``batch_streams`` equal streams, and each
+        stream into non-overlapping chunks of ``bptt_length`` tokens. Rows are
+        ordered chunk by chunk, so batch ``i`` of size ``batch_streams`` holds
+        chunk ``i`` of every stream and directly continues batch ``i - 1``.
         
-        for i in range(len(text_indices) - self.sequence_length):
-            sequences.append(text_indices[i:i + self.sequence_length])
-            next_chars.append(text_indices[i + self.sequence_length])
+        Args:
+            text (str): Training corpus
+            batch_streams (int): Number of parallel streams (the batch size)
+            bptt_length (int): Tokens per chunk (default: sequence_length)
         
-        # Convert to numpy arrays
-        X = np.array(sequences)
-        y = np.array(next_chars)
+        Returns:
+            tuple: ``(X, y)`` of shape (chunks * batch_streams, bptt_length),
+                where ``y`` is ``X`` shifted by one token
+        """
+        bptt_length = bptt_length or self.sequence_length
+        text_indices = self.codec.encode(text)
         
-        print(f"Created {len(X)} sequences")
+        stream_length = (len(text_indices) - 1) // batch_streams
+        n_chunks = stream_length // bptt_length
+        if n_chunks < 2:
+            raise ValueError("Text is too short for the requested streams and chunk length.")
+        
+        used = n_chunks * bptt_length
+        inputs = text_indices[:batch_streams * stream_length].reshape(batch_streams, stream_length)
+        targets = text_indices[1:batch_streams * stream_length + 1].reshape(batch_streams, stream_length)
+        
+        # (streams, chunks, bptt) -> (chunks, streams, bptt) -> rows in batch order
+        X = inputs[:, :used].reshape(batch_streams, n_chunks, bptt_length).swapaxes(0, 1)
+        y = targets[:, :used].reshape(batch_streams, n_chunks, bptt_length).swapaxes(0, 1)
+        X = np.ascontiguousarray(X.reshape(-1, bptt_length))
+        y = np.ascontiguousarray(y.reshape(-1, bptt_length))
+        
+        print(f"Created {batch_streams} streams of {n_chunks} chunks")
         
         return X, y
     
-    def create_model(self, embedding_dim=50, lstm_units=128):
-        """Create LSTM model for text generation."""
+    def create_model(self, embedding_dim=50, lstm_units=128, output_logits=False,
+                     jit_compile=False, steps_per_execution=1):
+        """
+        Create LSTM model for text generation.
+        
+        Args:
+            embedding_dim (int): Size of the token embeddings
+            lstm_units (int): Units in each LSTM layer
+            output_logits (bool): End with a linear layer instead of softmax so
+                sampling can apply temperature to the logits directly
+            jit_compile (bool): Compile the training step with XLA
+            steps_per_execution (int): Training batches run per graph call
+        """
+        import tensorflow as tf
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Embedding
+        from tensorflow.keras.optimizers import Adam
+        
+        self.output_logits = output_logits
         self.model = Sequential([
             Embedding(self.vocab_size, embedding_dim, input_length=self.sequence_length),
             LSTM(lstm_units, return_sequences=True),
             LSTM(lstm_units),
-            Dense(self.vocab_size, activation='softmax')
+            Dense(self.vocab_size, activation=None if output_logits else 'softmax')
         ])
         
         self.model.compile(
             optimizer=Adam(learning_rate=0.001),
-            loss='sparse_categorical_crossentropy',
-            metrics=['accuracy']
+            loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=output_logits),
+            metrics=['accuracy'],
+            jit_compile=jit_compile,
+            steps_per_execution=steps_per_execution
         )
         
         print("Model created successfully!")
@@ -80,19 +148,46 @@ class TextGenerator:
         
         return self.model
     
-    def train(self, X, y, epochs=50, batch_size=128, validation_split=0.1):
-        """Train the text generation model."""
+    def train(self, X, y, epochs=50, batch_size=128, validation_split=0.1,
+              checkpoint_path='models/text_gen_model.h5', checkpoint_dir=None,
+              keep_checkpoints=3, resume=False, save_every_n_steps=None):
+        """
+        Train the text generation model.
+        
+        Args:
+            checkpoint_path (str): Where the best model (by val_loss) is saved,
+                in a background thread
+            checkpoint_dir (str): Also write a resumable checkpoint here after
+                every epoch, in a background thread
+            keep_checkpoints (int): Number of resumable checkpoints to retain
+            resume (bool): Continue from the latest checkpoint in checkpoint_dir
+            save_every_n_steps (int): Also checkpoint every N batches within
+                an epoch, so a resumed run skips the batches already trained
+        
+        With a checkpoint_dir, every epoch is shuffled from a seed stored in
+        the checkpoints. A resumed run then continues with the same weights,
+        optimizer state, RNG state and batch order as an uninterrupted one.
+        Only the early-stopping patience counter restarts from zero.
+        """
         if self.model is None:
             raise ValueError("Model not created. Call create_model() first.")
+        if (resume or save_every_n_steps) and checkpoint_dir is None:
+            raise ValueError("resume and save_every_n_steps require a checkpoint_dir.")
         
-        # Create models directory if it doesn't exist
-        if not os.path.exists('models'):
-            os.makedirs('models')
+        import tensorflow as tf
+        from checkpointing import AsyncModelCheckpoint
+        
+        # Cached seed states belong to the old weights
+        self._reset_state_cache()
+        
+        # Create checkpoint directory if it doesn't exist
+        model_dir = os.path.dirname(checkpoint_path)
+        if model_dir and not os.path.exists(model_dir):
+            os.makedirs(model_dir)
         
         # Callbacks
-        checkpoint_cb = tf.keras.callbacks.ModelCheckpoint(
-            'models/text_gen_model.h5',
-            save_best_only=True,
+        checkpoint_cb = AsyncModelCheckpoint(
+            checkpoint_path,
             monitor='val_loss',
             mode='min'
         )
@@ -103,100 +198,360 @@ class TextGenerator:
             restore_best_weights=True
         )
         
-        # Train model
+        callbacks = [checkpoint_cb, early_stopping_cb]
+        
         print("Starting training...")
+        if checkpoint_dir is None:
+            return self.model.fit(
+                X, y,
+                epochs=epochs,
+                batch_size=batch_size,
+                validation_split=validation_split,
+                callbacks=callbacks,
+                verbose=1
+            )
+        
+        from checkpointing import AsyncCheckpoint, CheckpointManager, shuffled_epochs
+        
+        manager = CheckpointManager(checkpoint_dir, keep=keep_checkpoints)
+        initial_epoch, initial_step, extra = manager.restore(self.model) if resume else (0, 0, {})
+        shuffle_seed = extra.get('shuffle_seed')
+        if shuffle_seed is None:
+            shuffle_seed = int(np.random.randint(2 ** 31))
+        checkpoint_cb.best = extra.get('best_value')
+        callbacks.append(AsyncCheckpoint(manager, best_model=checkpoint_cb,
+                                         save_every_n_steps=save_every_n_steps,
+                                         initial_step=initial_step, shuffle_seed=shuffle_seed))
+        
+        # Hold out the tail like validation_split does, then shuffle the rest
+        # in an order that depends only on the seed and the epoch
+        split = int(len(X) * (1 - validation_split))
+        validation_data = (X[split:], y[split:]) if split < len(X) else None
+        steps_per_epoch = -(-split // batch_size)
+        
+        partial = None
+        if initial_step:
+            # Keras runs the same number of steps in every epoch of a fit
+            # call, so finish the interrupted epoch in a call of its own
+            partial = self.model.fit(
+                shuffled_epochs(X[:split], y[:split], batch_size, shuffle_seed,
+                                initial_epoch, initial_epoch + 1, initial_step),
+                epochs=initial_epoch + 1,
+                initial_epoch=initial_epoch,
+                steps_per_epoch=steps_per_epoch - initial_step,
+                validation_data=validation_data,
+                callbacks=callbacks,
+                verbose=1
+            )
+            initial_epoch += 1
+        
         history = self.model.fit(
-            X, y,
+            shuffled_epochs(X[:split], y[:split], batch_size, shuffle_seed, initial_epoch, epochs),
             epochs=epochs,
-            batch_size=batch_size,
-            validation_split=validation_split,
-            callbacks=[checkpoint_cb, early_stopping_cb],
+            initial_epoch=initial_epoch,
+            steps_per_epoch=steps_per_epoch,
+            validation_data=validation_data,
+            callbacks=callbacks,
             verbose=1
         )
         
+        if partial is not None:
+            history.epoch = partial.epoch + history.epoch
+            for key, values in partial.history.items():
+                history.history[key] = values + history.history.get(key, [])
+        
         return history
     
-    def generate_text(self, seed_text, length=200, temperature=1.0):
-        """Generate text using the trained model."""
+    def _build_stateful_model(self, batch_streams, bptt_length):
+        """Build a stateful copy of the model that predicts at every timestep."""
+        import tensorflow as tf
+        from tensorflow.keras import layers
+        from tensorflow.keras.optimizers import Adam
+        
+        stateful_model = tf.keras.Sequential()
+        stateful_model.add(tf.keras.Input(batch_shape=(batch_streams, bptt_length), dtype=tf.int32))
+        for layer in self.model.layers:
+            config = layer.get_config()
+            if isinstance(layer, layers.Embedding):
+                config.pop('input_length', None)
+                config.pop('batch_input_shape', None)
+            elif isinstance(layer, layers.LSTM):
+                config.update(return_sequences=True, stateful=True)
+            stateful_model.add(type(layer).from_config(config))
+        stateful_model.set_weights(self.model.get_weights())
+        
+        stateful_model.compile(
+            optimizer=Adam(learning_rate=0.001),
+            loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=self.output_logits),
+            metrics=['accuracy']
+        )
+        return stateful_model
+    
+    def train_stateful(self, X, y, batch_streams=32, epochs=50, validation_split=0.1,
+                       checkpoint_path='models/text_gen_model.h5', checkpoint_dir=None,
+                       keep_checkpoints=3, resume=False):
+        """
+        Train with truncated backpropagation through time.
+        
+        Unlike ``train`` on sliding windows, every token is read once per
+        epoch: LSTM state is carried from one chunk of a stream to the next
+        and gradients stop at chunk boundaries. A stateful copy of the model
+        is trained and its weights are copied back into ``self.model``, which
+        keeps its window input for generation.
+        
+        Args:
+            X, y: Arrays from ``create_streams`` with the same batch_streams
+            batch_streams (int): Number of parallel streams
+            validation_split (float): Fraction of chunks at the end of every
+                stream held out for validation
+            checkpoint_path (str): Where the trained window model is saved
+            checkpoint_dir (str): Also write a resumable checkpoint here after
+                every epoch, in a background thread
+            keep_checkpoints (int): Number of resumable checkpoints to retain
+            resume (bool): Continue from the latest checkpoint in checkpoint_dir
+        
+        Streams are read in order and LSTM state is reset at the start of
+        every epoch, so a resumed run continues exactly like an uninterrupted
+        one. Only the early-stopping patience counter restarts from zero.
+        """
+        if self.model is None:
+            raise ValueError("Model not created. Call create_model() first.")
+        if resume and checkpoint_dir is None:
+            raise ValueError("resume=True requires a checkpoint_dir.")
+        if len(X) % batch_streams:
+            raise ValueError("X does not match batch_streams; build it with create_streams().")
+        
+        import tensorflow as tf
+        
+        self._reset_state_cache()
+        
+        n_chunks = len(X) // batch_streams
+        val_chunks = int(n_chunks * validation_split)
+        split = (n_chunks - val_chunks) * batch_streams
+        validation_data = (X[split:], y[split:]) if val_chunks else None
+        
+        stateful_model = self._build_stateful_model(batch_streams, X.shape[1])
+        
+        # Streams restart from the beginning of the corpus every epoch. Validation
+        # chunks follow the training chunks, so they continue the carried state.
+        reset_states_cb = tf.keras.callbacks.LambdaCallback(
+            on_epoch_begin=lambda epoch, logs: stateful_model.reset_states()
+        )
+        callbacks = [reset_states_cb]
+        if validation_data is not None:
+            callbacks.append(tf.keras.callbacks.EarlyStopping(
+                monitor='val_loss',
+                patience=5,
+                restore_best_weights=True
+            ))
+        
+        initial_epoch = 0
+        if checkpoint_dir is not None:
+            from checkpointing import AsyncCheckpoint, CheckpointManager
+            
+            manager = CheckpointManager(checkpoint_dir, keep=keep_checkpoints)
+            if resume:
+                initial_epoch, _, _ = manager.restore(stateful_model)
+            callbacks.append(AsyncCheckpoint(manager))
+        
+        print("Starting stateful training...")
+        history = stateful_model.fit(
+            X[:split], y[:split],
+            epochs=epochs,
+            initial_epoch=initial_epoch,
+            batch_size=batch_streams,
+            shuffle=False,
+            validation_data=validation_data,
+            callbacks=callbacks,
+            verbose=1
+        )
+        
+        self.model.set_weights(stateful_model.get_weights())
+        
+        model_dir = os.path.dirname(checkpoint_path)
+        if model_dir and not os.path.exists(model_dir):
+            os.makedirs(model_dir)
+        self.model.save(checkpoint_path)
+        
+        return history
+    
+    def _output_to_logits(self, output):
+        """Convert raw model outputs into logits."""
+        output = np.asarray(output)
+        if self.output_logits:
+            return output
+        return sampling.probabilities_to_logits(output)
+    
+    def next_token_logits(self, windows):
+        """Return next-token logits of shape (batch, vocab) for int32 windows."""
+        return self._output_to_logits(self.model(windows, training=False))
+    
+    def enable_state_cache(self, max_bytes=64 * 2 ** 20):
+        """
+        Cache LSTM states for repeated seed texts.
+        
+        Generation then consumes the seed once, reuses the cached state on
+        later calls with the same seed, and feeds one token per step while
+        carrying the LSTM state forward.
+        
+        Args:
+            max_bytes (int): Memory bound for cached states
+        """
+        self.state_cache = StateCache(max_bytes)
+        self._decoder = None
+        return self.state_cache
+    
+    def _reset_state_cache(self):
+        """Drop the incremental decoder and cached states after weights change."""
+        self._decoder = None
+        if self.state_cache is not None:
+            self.state_cache.clear()
+    
+    def _generate_incremental(self, pattern, length, temperature, top_k, top_p):
+        """Generate token ids by carrying LSTM state from a cached seed."""
+        keras_model = getattr(self.model, 'keras_model', self.model)
+        if self._decoder is None or self._decoder.model is not keras_model:
+            self._reset_state_cache()
+            self._decoder = IncrementalDecoder(keras_model)
+        
+        cached = self.state_cache.get(pattern)
+        if cached is None:
+            output, states = self._decoder.prime(pattern)
+            self.state_cache.put(pattern, output, states)
+        else:
+            output, states = cached
+        
+        generated_ids = np.empty(length, dtype=np.int32)
+        for step in range(length):
+            next_ids = sampling.sample(self._output_to_logits(output), temperature, top_k, top_p)
+            generated_ids[step] = next_ids[0]
+            if step < length - 1:
+                output, states = self._decoder.step(next_ids, states)
+        
+        return generated_ids
+    
+    def generate_text(self, seed_text, length=200, temperature=1.0, top_k=0, top_p=1.0, beam_width=0):
+        """
+        Generate text using the trained model.
+        
+        Args:
+            seed_text (str): Text to start generating from
+            length (int): Number of tokens to generate
+            temperature (float): Sampling temperature, 0 for greedy decoding
+            top_k (int): Sample only from the k most likely tokens (0 disables)
+            top_p (float): Sample only from the nucleus with this mass (1.0 disables)
+            beam_width (int): Use beam search with this many beams instead of sampling
+        
+        With ``enable_state_cache`` the seed state is cached and generation
+        carries LSTM state instead of re-running the sliding window.
+        """
         if self.model is None:
             raise ValueError("Model not trained. Train the model first.")
         
-        # Prepare seed text
-        if len(seed_text) < self.sequence_length:
+        # Convert seed text to indices
+        pattern = self.codec.encode(seed_text).astype(np.int32)
+        
+        # Prepare seed tokens
+        if len(pattern) < self.sequence_length:
             # Pad with spaces if too short
-            seed_text = seed_text.ljust(self.sequence_length)
-        elif len(seed_text) > self.sequence_length:
+            pad_id = self.codec.encode(' ')[0]
+            padding = np.full(self.sequence_length - len(pattern), pad_id, dtype=np.int32)
+            pattern = np.concatenate([pattern, padding])
+        elif len(pattern) > self.sequence_length:
             # Truncate if too long
-            seed_text = seed_text[-self.sequence_length:]
-        
-        # Convert seed text to indices
-        generated_text = seed_text
-        pattern = [self.char_to_idx[char] for char in seed_text]
+            pattern = pattern[-self.sequence_length:]
+        seed_text = self.codec.decode(pattern)
         
-        # Generate characters
-        for _ in range(length):
-            # Prepare input
-            x = np.reshape(pattern, (1, len(pattern)))
-            
-            # Predict next character
-            prediction = self.model.predict(x, verbose=0)[0]
-            
-            # Apply temperature
-            prediction = np.log(prediction + 1e-8) / temperature
-            exp_preds = np.exp(prediction)
-            prediction = exp_preds / np.sum(exp_preds)
-            
-            # Sample next character
-            next_idx = np.random.choice(len(prediction), p=prediction)
-            next_char = self.idx_to_char[next_idx]
-            
-            # Add to generated text
-            generated_text += next_char
-            
-            # Update pattern
-            pattern.append(next_idx)
-            pattern = pattern[1:]
+        # Generate tokens
+        if beam_width > 0:
+            generated_ids = sampling.beam_search(self.next_token_logits, pattern, length, beam_width)
+        elif self.state_cache is not None:
+            generated_ids = self._generate_incremental(pattern, length, temperature, top_k, top_p)
+        else:
+            generated_ids = sampling.generate_ids(
+                self.next_token_logits, pattern, length,
+                temperature=temperature, top_k=top_k, top_p=top_p
+            )[0]
         
-        return generated_text
+        return seed_text + self.codec.decode(generated_ids)
     
-    def save_model(self, filepath='models/text_gen_model.h5'):
-        """Save the trained model."""
+    def save_model(self, filepath='models/text_gen_model.h5', mappings_path='models/char_mappings.npy'):
+        """Save the trained model and its character mappings."""
         if self.model is None:
             raise ValueError("No model to save.")
         
-        # Create models directory if it doesn't exist
-        if not os.path.exists('models'):
-            os.makedirs('models')
+        # Create output directory if it doesn't exist
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
         
         self.model.save(filepath)
         print(f"Model saved to {filepath}")
         
-        # Save character mappings
+        self.save_mappings(mappings_path)
+    
+    def save_mappings(self, mappings_path='models/char_mappings.npy'):
+        """Save the character or subword mappings."""
+        directory = os.path.dirname(mappings_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
         mappings = {
             'char_to_idx': self.char_to_idx,
             'idx_to_char': self.idx_to_char,
             'vocab_size': self.vocab_size,
-            'sequence_length': self.sequence_length
+            'sequence_length': self.sequence_length,
+            'codec': self.codec.get_config(),
+            'tokenizer': self.tokenizer,
+            'output_logits': self.output_logits
         }
-        np.save('models/char_mappings.npy', mappings)
-        print("Character mappings saved.")
+        np.save(mappings_path, mappings)
+        print(f"Character mappings saved to {mappings_path}")
     
     def load_model(self, model_path='models/text_gen_model.h5', mappings_path='models/char_mappings.npy'):
-        """Load a trained model and character mappings."""
+        """Load a trained model and character or subword mappings."""
+        import tensorflow as tf
+        
         # Load model
         self.model = tf.keras.models.load_model(model_path)
         print(f"Model loaded from {model_path}")
         
-        # Load character mappings
+        self.load_mappings(mappings_path)
+    
+    def load_mappings(self, mappings_path='models/char_mappings.npy'):
+        """Load character or subword mappings saved by ``save_mappings``."""
         mappings = np.load(mappings_path, allow_pickle=True).item()
-        self.char_to_idx = mappings['char_to_idx']
-        self.idx_to_char = mappings['idx_to_char']
+        if 'codec' in mappings:
+            self.set_codec(codec_from_config(mappings['codec']))
+            self.tokenizer = mappings.get('tokenizer', 'char')
+        else:
+            self.set_codec(CharCodec.from_mappings(mappings['idx_to_char']))
         self.vocab_size = mappings['vocab_size']
         self.sequence_length = mappings['sequence_length']
+        self.output_logits = mappings.get('output_logits', False)
         print("Character mappings loaded.")
 
+def configure_threads(intra_op_threads=None, inter_op_threads=None):
+    """
+    Set TensorFlow CPU thread pool sizes.
+    
+    Must be called before TensorFlow runs any operation in the process.
+    
+    Args:
+        intra_op_threads (int): Threads used inside a single op (e.g. matmul)
+        inter_op_threads (int): Independent ops run concurrently
+    """
+    import tensorflow as tf
+    
+    if intra_op_threads:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    if inter_op_threads:
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
 def plot_training_history(history):
     """Plot training history."""
+    import matplotlib.pyplot as plt
+    
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
     
     # Plot loss
@@ -4,8 +4,10 @@ from tensorflow.keras.optimizers import Adam
 import matplotlib.pyplot as plt
 import os
 from text_generation import TextGenerator, plot_training_history, load_sample_text
+from char_codec import CharCodec
+from experiment_runner import run_experiments
 
-def experiment_with_hyperparameters():
+def experiment_with_hyperparameters(n_workers=None):
     """Experiment with different hyperparameters for text generation."""
     print("Experimenting with different hyperparameters...")
     
@@ -19,64 +21,22 @@ def experiment_with_hyperparameters():
         {'sequence_length': 50, 'embedding_dim': 100, 'lstm_units': 128},
     ]
     
-    results = []
+    # Build the vocabulary once and share it across experiments
+    codec = CharCodec.from_text(text)
     
-    for i, params in enumerate(hyperparams):
-        print(f"\nExperiment {i+1}/{len(hyperparams)}: {params}")
-        
-        # Create text generator
-        generator = TextGenerator(sequence_length=params['sequence_length'])
-        
-        # Preprocess text
-        generator.preprocess_text(text)
-        
-        # Create sequences
-        X, y = generator.create_sequences(text)
-        
-        # Create model
-        model = generator.create_model(
-            embedding_dim=params['embedding_dim'],
-            lstm_units=params['lstm_units']
-        )
-        
-        # Train model
-        print("Training model...")
-        history = generator.train(
-            X, y,
-            epochs=20,
-            batch_size=64,
-            validation_split=0.1
-        )
-        
-        # Evaluate model
-        final_loss = history.history['loss'][-1]
-        final_val_loss = history.history['val_loss'][-1]
-        final_accuracy = history.history['accuracy'][-1]
-        final_val_accuracy = history.history['val_accuracy'][-1]
-        
-        # Store results
-        result = {
-            'params': params,
-            'final_loss': final_loss,
-            'final_val_loss': final_val_loss,
-            'final_accuracy': final_accuracy,
-            'final_val_accuracy': final_val_accuracy,
-            'history': history
-        }
-        results.append(result)
-        
-        # Save model
-        model_name = f"model_exp_{i+1}"
-        model_path = f"models/{model_name}.h5"
-        generator.save_model(model_path)
-        
-        print(f"Model saved as {model_name}")
-        
-        # Generate sample text
-        seed_text = "To be or not"
-        generated_text = generator.generate_text(seed_text, length=100, temperature=0.5)
-        
-        print(f"Sample generated text:\n{generated_text}\n")
+    # Train all configurations in parallel worker processes
+    results = run_experiments(
+        text, codec, hyperparams,
+        epochs=20,
+        batch_size=64,
+        validation_split=0.1,
+        n_workers=n_workers
+    )
+    
+    for result in results:
+        print(f"\n{result['name']}: {result['params']}")
+        print(f"Model saved to {result['model_path']}")
+        print(f"Sample generated text:\n{result['sample_text']}\n")
     
     return results
 
@@ -92,7 +52,7 @@ def compare_models(results):
         label = f"SeqLen={params['sequence_length']}, Emb={params['embedding_dim']}, LSTM={params['lstm_units']}"
         
         # Plot training loss
-        axes[0, 0].plot(history.history['loss'], label=label)
+        axes[0, 0].plot(history['loss'], label=label)
         axes[0, 0].set_title('Training Loss')
         axes[0, 0].set_xlabel('Epoch')
         axes[0, 0].set_ylabel('Loss')
@@ -100,7 +60,7 @@ def compare_models(results):
         axes[0, 0].grid(True)
         
         # Plot validation loss
-        axes[0, 1].plot(history.history['val_loss'], label=label)
+        axes[0, 1].plot(history['val_loss'], label=label)
         axes[0, 1].set_title('Validation Loss')
         axes[0, 1].set_xlabel('Epoch')
         axes[0, 1].set_ylabel('Loss')
@@ -108,7 +68,7 @@ def compare_models(results):
         axes[0, 1].grid(True)
         
         # Plot training accuracy
-        axes[1, 0].plot(history.history['accuracy'], label=label)
+        axes[1, 0].plot(history['accuracy'], label=label)
         axes[1, 0].set_title('Training Accuracy')
         axes[1, 0].set_xlabel('Epoch')
         axes[1, 0].set_ylabel('Accuracy')
@@ -116,7 +76,7 @@ def compare_models(results):
         axes[1, 0].grid(True)
         
         # Plot validation accuracy
-        axes[1, 1].plot(history.history['val_accuracy'], label=label)
+        axes[1, 1].plot(history['val_accuracy'], label=label)
         axes[1, 1].set_title('Validation Accuracy')
         axes[1, 1].set_xlabel('Epoch')
         axes[1, 1].set_ylabel('Accuracy')
@@ -162,11 +122,8 @@ def main():
         best_result = results[-1]
         print("\nLoading best model for temperature experiments...")
         
-        # For simplicity, we'll create a new generator and load the model
-        # In practice, you would load the specific model you want
-        text = load_sample_text()
-        generator = TextGenerator(sequence_length=best_result['params']['sequence_length'])
-        generator.preprocess_text(text)
+        generator = TextGenerator()
+        generator.load_model(best_result['model_path'], best_result['mappings_path'])
         
         # Generate text with different temperatures
         generate_with_different_temperatures(generator, "To be or not to")